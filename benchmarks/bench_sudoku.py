@@ -0,0 +1,436 @@
+import io
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import warnings
+import tracemalloc
+
+# make the solver modules in src/ importable when run from anywhere
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from sudoku_reader import SudokuReader  # noqa: E402
+from sudoku_board import SudokuBoard  # noqa: E402
+from sudoku_engines import ENGINES  # noqa: E402
+from sudoku_format import FORMATS, SudokuFormat, SudokuWriter  # noqa: E402
+
+
+# graded puzzle files, one puzzle per line
+CORPUS_DIR = os.path.join(ROOT, "benchmarks", "corpus")
+CATEGORIES = ["easy", "hard", "17_clue", "adversarial"]
+
+# puzzles of the other board sizes, one per line
+SIZE_CATEGORIES = ["4x4", "16x16", "25x25"]
+
+# unsolvable boards from the data directory in the grid format
+UNSOLVABLE_FILES = [
+    os.path.join(ROOT, "data", "fast_unsolvable_board.txt"),
+    os.path.join(ROOT, "data", "slow_unsolvable_board.txt"),
+]
+
+# engines benchmarked by default, backtrack takes minutes on hard puzzles
+DEFAULT_ENGINES = ["bitmask", "dlx"]
+
+# boards formatted per output mode and repeat
+FORMAT_BOARDS = 20000
+
+# boards held at once to measure the memory of each representation
+MEMORY_BOARDS = 10000
+
+# ways of reading a one line puzzle into the board the batch mode
+# validates, solves and formats
+REPRESENTATIONS = {
+    "lists": SudokuReader.parse_puzzle_line,
+    "grid": SudokuReader.parse_puzzle_grid,
+}
+
+
+def load_corpus():
+    """
+    Loads and validates every puzzle of the benchmark corpus
+
+    Returns
+    -------
+    dict[str, list[list[list[int]]]]:
+        The validated boards of each category
+    """
+    corpus = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for category in CATEGORIES + SIZE_CATEGORIES:
+            filename = os.path.join(CORPUS_DIR, f"{category}.txt")
+            corpus[category] = [
+                SudokuBoard(SudokuReader.parse_puzzle_line(line)).board
+                for _, line in SudokuReader.read_puzzles_from_file(filename)
+            ]
+        corpus["unsolvable"] = [
+            SudokuBoard(SudokuReader(filename).board).board
+            for filename in UNSOLVABLE_FILES
+        ]
+    return corpus
+
+
+def percentile(values, q):
+    """
+    Returns the nearest-rank percentile of a list of values
+
+    Parameters
+    ----------
+    values : list[float]
+        The measured values.
+    q : float
+        The percentile between 0 and 100.
+
+    Returns
+    -------
+    float:
+        The smallest value with at least q percent of values at or below it
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def benchmark_engine(engine, boards, repeat):
+    """
+    Solves every board repeat times with a fresh copy and
+    summarises the latency, throughput and search effort
+
+    Parameters
+    ----------
+    engine : str
+        Name of the solver engine.
+    boards : list[list[list[int]]]
+        The validated boards to solve.
+    repeat : int
+        Number of times each board is solved.
+
+    Returns
+    -------
+    dict:
+        Puzzles, puzzles per second, p50/p95/p99 latency in
+        milliseconds and the total and mean node counts
+    """
+    solver_class = ENGINES[engine]
+    latencies = []
+    nodes = []
+
+    for _ in range(repeat):
+        for board in boards:
+            solver = solver_class([row[:] for row in board])
+            start = time.perf_counter()
+            solver.solve_sudoku()
+            latencies.append(time.perf_counter() - start)
+            # search nodes visited by the engine
+            nodes.append(solver.stats.nodes)
+
+    total = sum(latencies)
+    return {
+        "puzzles": len(latencies),
+        "puzzles_per_sec": len(latencies) / total if total else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "nodes": sum(nodes),
+        "mean_nodes": sum(nodes) / len(nodes),
+    }
+
+
+def benchmark_formats(boards, repeat):
+    """
+    Formats FORMAT_BOARDS boards repeat times in every output mode
+    through a SudokuWriter, as the batch mode writes its output
+
+    Parameters
+    ----------
+    boards : list[list[list[int]]]
+        The boards to format, cycled through.
+    repeat : int
+        Number of times the boards are formatted.
+
+    Returns
+    -------
+    dict:
+        Boards, boards per second and megabytes per second of each mode
+    """
+    count = FORMAT_BOARDS * repeat
+    results = {}
+    for mode in FORMATS:
+        output = io.StringIO()
+        start = time.perf_counter()
+        with SudokuWriter(output) as writer:
+            for i in range(count):
+                board = boards[i % len(boards)]
+                writer.write(SudokuFormat(board).format(mode))
+        seconds = max(time.perf_counter() - start, 1e-9)
+
+        results[mode] = {
+            "boards": count,
+            "boards_per_sec": count / seconds,
+            "mb_per_sec": len(output.getvalue()) / seconds / 1e6,
+        }
+    return results
+
+
+def benchmark_boards(repeat):
+    """
+    Measures the memory each board representation takes and the
+    time the batch mode spends on a puzzle besides the search:
+    reading, validating, loading into the solver and formatting
+
+    Parameters
+    ----------
+    repeat : int
+        Number of times the puzzles are read.
+
+    Returns
+    -------
+    dict:
+        Bytes per board held and microseconds per puzzle of each
+        representation
+    """
+    lines = [
+        line
+        for category in CATEGORIES
+        for _, line in SudokuReader.read_puzzles_from_file(
+            os.path.join(CORPUS_DIR, f"{category}.txt")
+        )
+    ]
+
+    results = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for name, parse in REPRESENTATIONS.items():
+            # memory of MEMORY_BOARDS validated boards held at once
+            tracemalloc.start()
+            boards = [
+                SudokuBoard(parse(lines[i % len(lines)])).board
+                for i in range(MEMORY_BOARDS)
+            ]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del boards
+
+            # board and solver reused for every puzzle as in a batch
+            sudoku = SudokuBoard(parse(lines[0]))
+            solver = ENGINES["bitmask"](None)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                for line in lines:
+                    sudoku.load_board(parse(line))
+                    solver.load_board(sudoku.board)
+                    SudokuFormat.board_line(sudoku.board)
+            seconds = time.perf_counter() - start
+
+            results[name] = {
+                "bytes_per_board": size / MEMORY_BOARDS,
+                "us_per_puzzle": seconds / (len(lines) * repeat) * 1e6,
+            }
+    return results
+
+
+def run_benchmarks(engines, repeat):
+    """
+    Benchmarks every engine on every category of the corpus
+
+    Parameters
+    ----------
+    engines : list[str]
+        Names of the solver engines.
+    repeat : int
+        Number of times each board is solved.
+
+    Returns
+    -------
+    dict:
+        The run metadata and the results per engine and category
+    """
+    corpus = load_corpus()
+    results = {}
+    for engine in engines:
+        results[engine] = {
+            category: benchmark_engine(engine, boards, repeat)
+            for category, boards in corpus.items()
+        }
+
+    # output formats are measured on 9 x 9 boards only
+    boards = [
+        board
+        for category, boards in corpus.items()
+        if category not in SIZE_CATEGORIES
+        for board in boards
+    ]
+    return {
+        "boards": benchmark_boards(repeat),
+        "formats": benchmark_formats(boards, repeat),
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_runs(baseline, current, threshold):
+    """
+    Compares two benchmark runs and flags every engine and category
+    whose median latency or throughput got worse by more than threshold
+
+    Parameters
+    ----------
+    baseline : dict
+        The earlier run as written by run_benchmarks.
+    current : dict
+        The new run as written by run_benchmarks.
+    threshold : float
+        Allowed relative slowdown, 0.1 allows 10%.
+
+    Returns
+    -------
+    list[str]:
+        One message per regression
+    """
+    regressions = []
+    for engine, categories in current["results"].items():
+        for category, stats in categories.items():
+            old = baseline["results"].get(engine, {}).get(category)
+            if old is None:
+                continue
+
+            if stats["p50_ms"] > old["p50_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{engine}/{category}: p50 {old['p50_ms']:.3f}ms -> "
+                    f"{stats['p50_ms']:.3f}ms"
+                )
+            if stats["puzzles_per_sec"] < old["puzzles_per_sec"] / (
+                1 + threshold
+            ):
+                regressions.append(
+                    f"{engine}/{category}: "
+                    f"{old['puzzles_per_sec']:.1f} -> "
+                    f"{stats['puzzles_per_sec']:.1f} puzzles/s"
+                )
+
+    for mode, stats in current.get("formats", {}).items():
+        old = baseline.get("formats", {}).get(mode)
+        if old is None:
+            continue
+
+        if stats["boards_per_sec"] < old["boards_per_sec"] / (1 + threshold):
+            regressions.append(
+                f"format/{mode}: {old['boards_per_sec']:.1f} -> "
+                f"{stats['boards_per_sec']:.1f} boards/s"
+            )
+
+    for name, stats in current.get("boards", {}).items():
+        old = baseline.get("boards", {}).get(name)
+        if old is None:
+            continue
+
+        if stats["us_per_puzzle"] > old["us_per_puzzle"] * (1 + threshold):
+            regressions.append(
+                f"board/{name}: {old['us_per_puzzle']:.1f} -> "
+                f"{stats['us_per_puzzle']:.1f} us/puzzle"
+            )
+    return regressions
+
+
+def format_report(run):
+    """
+    Formats the results of a run as a table for the console
+
+    Parameters
+    ----------
+    run : dict
+        The run as written by run_benchmarks.
+
+    Returns
+    -------
+    str:
+        One line per engine and category
+    """
+    lines = [
+        f"{'engine':<10}{'category':<12}{'puzzles/s':>11}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'nodes':>10}\n"
+    ]
+    for engine, categories in run["results"].items():
+        for category, stats in categories.items():
+            lines.append(
+                f"{engine:<10}{category:<12}"
+                f"{stats['puzzles_per_sec']:>11.1f}"
+                f"{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                f"{stats['p99_ms']:>10.3f}{stats['mean_nodes']:>10.1f}\n"
+            )
+
+    lines.append(f"\n{'format':<10}{'boards/s':>12}{'MB/s':>10}\n")
+    for mode, stats in run.get("formats", {}).items():
+        lines.append(
+            f"{mode:<10}{stats['boards_per_sec']:>12.1f}"
+            f"{stats['mb_per_sec']:>10.1f}\n"
+        )
+
+    lines.append(f"\n{'board':<10}{'bytes':>12}{'us/puzzle':>12}\n")
+    for name, stats in run.get("boards", {}).items():
+        lines.append(
+            f"{name:<10}{stats['bytes_per_board']:>12.1f}"
+            f"{stats['us_per_puzzle']:>12.2f}\n"
+        )
+    return "".join(lines)
+
+
+def main():
+    """
+    Main function to run the benchmarks and compare against a baseline
+    """
+    parser = argparse.ArgumentParser(description="Sudoku solver benchmarks")
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINES,
+        help="Solver engines to benchmark",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times each puzzle is solved",
+    )
+    parser.add_argument(
+        "--output", help="Write the results as JSON to this file"
+    )
+    parser.add_argument(
+        "--compare", help="Flag regressions against this earlier JSON run"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Allowed relative slowdown before a regression is flagged",
+    )
+    args = parser.parse_args()
+
+    run = run_benchmarks(args.engines, args.repeat)
+    print(format_report(run), end="")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(run, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            baseline = json.load(file)
+        regressions = compare_runs(baseline, run, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,101 @@
-from flask import Flask, request, render_template
+import os
+import threading
+from flask import (
+    Flask,
+    Response,
+    request,
+    render_template,
+    jsonify,
+    stream_with_context,
+)
 from sudoku_reader import SudokuReader
 from sudoku_board import SudokuBoard
-from sudoku_algorithm import SudokuAlgorithm
+from sudoku_format import SudokuFormat
+from sudoku_size import SudokuSize
+from sudoku_engines import ENGINES, DEFAULT_ENGINE
+from sudoku_api import SudokuAPI
+from sudoku_cache import SudokuCache, DEFAULT_CACHE_SIZE
+from sudoku_store import SudokuStore
+from sudoku_jobs import SudokuJobs
+from sudoku_sessions import SudokuSessions
 
 
 # initialise the app
 app = Flask(__name__, template_folder="webapp/templates")
 
+# limits of a single batch request
+app.config["MAX_BATCH_BYTES"] = SudokuAPI.MAX_BATCH_BYTES
+app.config["MAX_BATCH_PUZZLES"] = SudokuAPI.MAX_BATCH_PUZZLES
+
+# largest time and node budgets of a puzzle solved within a request
+app.config["SOLVE_TIMEOUT"] = 10.0
+app.config["SOLVE_MAX_NODES"] = None
+
+# solutions shared by every request, keyed by canonical puzzle form,
+# and kept between restarts if a store directory is configured
+app.config["CACHE_SIZE"] = DEFAULT_CACHE_SIZE
+app.config["CACHE_DIR"] = os.environ.get("SUDOKU_CACHE_DIR")
+
+# asynchronous solves run by a bounded pool of worker threads,
+# each job limited to the largest time and node budgets
+app.config["JOB_WORKERS"] = 2
+app.config["MAX_PENDING_JOBS"] = 100
+app.config["JOB_TIMEOUT"] = 60.0
+app.config["JOB_MAX_NODES"] = None
+
+# interactive games, each dropped after an idle timeout in seconds
+# and new ones refused once the maximum are open
+app.config["SESSION_IDLE_TIMEOUT"] = 1800.0
+app.config["MAX_SESSIONS"] = 10000
+
+# the cache, jobs and sessions are built on first use, so the settings
+# above can be changed after the app is imported
+lock = threading.Lock()
+
+
+def get_cache():
+    """
+    Returns the solution cache, built from the settings on first use
+    """
+    with lock:
+        if "sudoku_cache" not in app.extensions:
+            directory = app.config["CACHE_DIR"]
+            app.extensions["sudoku_cache"] = SudokuCache(
+                app.config["CACHE_SIZE"],
+                SudokuStore(directory) if directory else None,
+            )
+        return app.extensions["sudoku_cache"]
+
+
+def get_jobs():
+    """
+    Returns the pool of asynchronous solves, built on first use
+    """
+    cache = get_cache()
+    with lock:
+        if "sudoku_jobs" not in app.extensions:
+            app.extensions["sudoku_jobs"] = SudokuJobs(
+                workers=app.config["JOB_WORKERS"],
+                max_pending=app.config["MAX_PENDING_JOBS"],
+                timeout=app.config["JOB_TIMEOUT"],
+                max_nodes=app.config["JOB_MAX_NODES"],
+                cache=cache,
+            )
+        return app.extensions["sudoku_jobs"]
+
+
+def get_sessions():
+    """
+    Returns the open interactive games, built on first use
+    """
+    with lock:
+        if "sudoku_sessions" not in app.extensions:
+            app.extensions["sudoku_sessions"] = SudokuSessions(
+                idle_timeout=app.config["SESSION_IDLE_TIMEOUT"],
+                max_sessions=app.config["MAX_SESSIONS"],
+            )
+        return app.extensions["sudoku_sessions"]
+
 
 # decorator for the app and defines the upload method
 @app.route("/", methods=["GET", "POST"])
@@ -26,21 +115,22 @@ def upload():
     # if the request method is POST the user has uploaded a file
     if request.method == "POST":
         file = request.files.get("file")
-        # file saved as input.txt
+        # file read in memory so concurrent uploads never share a file
         if file and file.filename != "":
-            filename = "input.txt"
-            file.save(filename)
-
             try:
                 # initialise and read the sudoku board
-                reader = SudokuReader(filename)
-                sudoku = SudokuBoard(reader.board)
+                text = file.read().decode("utf-8")
+                sudoku = SudokuBoard(SudokuReader.parse_board_text(text))
                 board = sudoku.board
-                # render the sudoku board
+                # render the sudoku board, the form sends it back to solve
                 return render_template(
                     "sudoku_board.html",
                     board=board,
+                    box=SudokuSize.of_board(board).box,
+                    puzzle=SudokuFormat.board_line(board),
                     error_message=error_message,
+                    engines=sorted(ENGINES),
+                    default_engine=DEFAULT_ENGINE,
                 )
             except ValueError as e:
                 # displays error messages from
@@ -68,30 +158,269 @@ def solve():
     # initialise solve error message
     error_message = None
 
-    try:
-        # solve sudoku board labelled as input.txt
-        filename = "input.txt"
-        reader = SudokuReader(filename)
-        sudoku = SudokuBoard(reader.board)
-        board = sudoku.board
-        solver = SudokuAlgorithm(board)
-        solver.solve_sudoku()
-        if solver.solve_sudoku():
-            board = solver.board
-            # render the solved sudoku board
-            return render_template(
-                "sudoku_board.html", board=board, error_message=error_message
-            )
-        else:
-            error_message = "Unsolvable sudoku"
-    except ValueError as e:
-        # displays error messages from src/sudoku_algorithm.py
-        error_message = str(e)
+    # solve the sudoku board sent back by the upload form
+    # with the engine chosen in the form
+    response, _ = SudokuAPI.solve(
+        {
+            "puzzle": request.form.get("puzzle", ""),
+            "engine": request.form.get("engine", DEFAULT_ENGINE),
+        },
+        cache=get_cache(),
+        timeout=app.config["SOLVE_TIMEOUT"],
+        max_nodes=app.config["SOLVE_MAX_NODES"],
+    )
+    # a cached solution was not searched, so it has no statistics to show
+    stats = None if response.get("cached") else response.get("stats")
+    if response["status"] == "solved":
+        # one character per cell of any board size
+        board = SudokuReader.parse_puzzle_grid(response["solution"])
+        # render the solved sudoku board
+        return render_template(
+            "sudoku_board.html",
+            board=board.to_rows(),
+            box=SudokuSize.of(board.side).box,
+            error_message=error_message,
+            stats=stats,
+            cache=get_cache().to_dict(),
+        )
 
+    # displays error messages from src/sudoku_board.py, src/sudoku_engines.py
+    # or the cell or unit that makes the sudoku unsolvable
+    error_message = response["error"]
     return render_template(
-        "sudoku_board.html", board=None, error_message=error_message
+        "sudoku_board.html",
+        board=None,
+        error_message=error_message,
+        stats=stats,
+        cache=get_cache().to_dict(),
+    )
+
+
+# decorator for the JSON solve method
+@app.route("/api/solve", methods=["POST"])
+def api_solve():
+    """
+    Solves a sudoku puzzle sent in the request body without using
+    the filesystem. The body is either JSON, holding the puzzle or an
+    object with a "puzzle" and an optional "engine", or the puzzle as
+    plain text. The engine may also be given as a query parameter
+
+    Returns:
+    --------
+        JSON: the puzzle, its status, the solution or error
+        message and the solver statistics
+    """
+    if request.is_json:
+        data = request.get_json(silent=True)
+    else:
+        data = request.get_data(as_text=True)
+
+    response, status = SudokuAPI.solve(
+        data,
+        request.args.get("engine"),
+        cache=get_cache(),
+        timeout=app.config["SOLVE_TIMEOUT"],
+        max_nodes=app.config["SOLVE_MAX_NODES"],
+    )
+    return jsonify(response), status
+
+
+# decorator for the streamed batch solve method
+@app.route("/api/solve/batch", methods=["POST"])
+def api_solve_batch():
+    """
+    Solves many sudoku puzzles sent in the request body, either as a
+    JSON array or as newline delimited JSON with one puzzle per line.
+    Results are streamed back as newline delimited JSON as soon as
+    each puzzle is solved, with per-puzzle errors reported inline
+
+    Returns:
+    --------
+        NDJSON: one line per puzzle with its index, status,
+        solution or error message and the solver statistics
+    """
+    # reject bodies over the size limit before reading them
+    length = request.content_length
+    if length is None:
+        return jsonify({"error": "Content-Length is required"}), 411
+    if length > app.config["MAX_BATCH_BYTES"]:
+        limit = app.config["MAX_BATCH_BYTES"]
+        return jsonify({"error": f"Batch is limited to {limit} bytes"}), 413
+
+    if request.is_json:
+        puzzles = request.get_json(silent=True)
+        if not isinstance(puzzles, list):
+            return jsonify({"error": "Body must be a JSON array"}), 400
+    else:
+        # newline delimited JSON is decoded while it is read
+        puzzles = SudokuAPI.read_ndjson(request.stream)
+
+    results = SudokuAPI.solve_batch(
+        puzzles,
+        request.args.get("engine"),
+        app.config["MAX_BATCH_PUZZLES"],
+        get_cache(),
+        app.config["SOLVE_TIMEOUT"],
+        app.config["SOLVE_MAX_NODES"],
+    )
+    return Response(
+        stream_with_context(results), mimetype="application/x-ndjson"
     )
 
 
+# decorator for the cache statistics method
+@app.route("/api/cache", methods=["GET"])
+def api_cache():
+    """
+    Reports the hits and misses of the solution cache
+
+    Returns:
+    --------
+        JSON: the hits, misses, hit rate, entries and maximum size
+    """
+    return jsonify(get_cache().to_dict())
+
+
+# decorator for the job submission method
+@app.route("/api/jobs", methods=["POST"])
+def api_submit_job():
+    """
+    Queues a sudoku puzzle to be solved in the background and returns
+    at once. The body is the same as for /api/solve and may add a
+    "timeout" in seconds and "max_nodes" to budget the search
+
+    Returns:
+    --------
+        JSON: the queued job with the id to poll
+    """
+    if request.is_json:
+        data = request.get_json(silent=True)
+    else:
+        data = request.get_data(as_text=True)
+
+    response, status = get_jobs().submit(data, request.args.get("engine"))
+    return jsonify(response), status
+
+
+# decorator for the job status method
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+def api_get_job(job_id):
+    """
+    Reports the progress of a job, its search statistics so
+    far and, once finished, the solution or error message
+
+    Returns:
+    --------
+        JSON: the job or an error if there is no such job
+    """
+    job = get_jobs().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+# decorator for the job cancellation method
+@app.route("/api/jobs/<job_id>/cancel", methods=["POST"])
+def api_cancel_job(job_id):
+    """
+    Cancels a queued or running job
+
+    Returns:
+    --------
+        JSON: the job or an error if there is no such job
+    """
+    job = get_jobs().cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+# decorator for the session creation method
+@app.route("/api/sessions", methods=["POST"])
+def api_create_session():
+    """
+    Opens an interactive game of a sudoku puzzle. The body is the
+    puzzle itself or an object with a "puzzle", as for /api/solve
+
+    Returns:
+    --------
+        JSON: the session with its id, board, the candidates
+        of every cell and the state of the game
+    """
+    if request.is_json:
+        data = request.get_json(silent=True)
+    else:
+        data = request.get_data(as_text=True)
+
+    response, status = get_sessions().create(data)
+    return jsonify(response), status
+
+
+# decorator for the session state method
+@app.route("/api/sessions/<session_id>", methods=["GET"])
+def api_get_session(session_id):
+    """
+    Reports the full state of an interactive game
+
+    Returns:
+    --------
+        JSON: the session or an error if there is no such session
+    """
+    session = get_sessions().get(session_id)
+    if session is None:
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify(session)
+
+
+# decorator for the session move method
+@app.route("/api/sessions/<session_id>/moves", methods=["POST"])
+def api_session_move(session_id):
+    """
+    Places a number in a single cell of a game, or clears it with a
+    "value" of 0. The body is an object with the "x", "y" and "value"
+
+    Returns:
+    --------
+        JSON: the candidates of the row, column and square of the
+        cell, the cells in conflict and the state of the game
+    """
+    result = get_sessions().move(session_id, request.get_json(silent=True))
+    if result is None:
+        return jsonify({"error": "Session not found"}), 404
+    response, status = result
+    return jsonify(response), status
+
+
+# decorator for the session hint method
+@app.route("/api/sessions/<session_id>/hint", methods=["GET"])
+def api_session_hint(session_id):
+    """
+    Finds the simplest logical step on the board of a game
+
+    Returns:
+    --------
+        JSON: the step and its description
+    """
+    hint = get_sessions().hint(session_id)
+    if hint is None:
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify(hint)
+
+
+# decorator for the session close method
+@app.route("/api/sessions/<session_id>", methods=["DELETE"])
+def api_close_session(session_id):
+    """
+    Closes an interactive game before it expires
+
+    Returns:
+    --------
+        JSON: an empty object or an error if there is no such session
+    """
+    if not get_sessions().close(session_id):
+        return jsonify({"error": "Session not found"}), 404
+    return jsonify({})
+
+
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=80)
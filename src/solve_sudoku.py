@@ -1,10 +1,17 @@
 import sys
+import time
 import argparse
 from sudoku_reader import SudokuReader
 from sudoku_board import SudokuBoard
-from sudoku_algorithm import SudokuAlgorithm
-from sudoku_format import SudokuFormat
-from app import app
+from sudoku_format import FORMATS, SudokuFormat, SudokuWriter
+from sudoku_result import SudokuResult
+from sudoku_engines import ENGINES, DEFAULT_ENGINE, get_engine
+from sudoku_batch import BATCH_FORMATS, SudokuBatch
+from sudoku_cache import SudokuCache
+from sudoku_store import SudokuStore
+from sudoku_binary import SudokuBinary
+from sudoku_generator import DIFFICULTIES, SudokuGenerator
+from sudoku_size import SIZES
 
 
 def main():
@@ -23,28 +30,315 @@ def main():
     parser.add_argument(
         "--web", action="store_true", help="Run the web application"
     )
+    # argument for a file with one puzzle per line
+    parser.add_argument(
+        "--batch",
+        metavar="PUZZLES_FILE",
+        help="Solve every puzzle in a file, which may be compressed, "
+        'or "-" for standard input',
+        default=None,
+    )
+    # arguments for generating new puzzles
+    parser.add_argument(
+        "--generate",
+        metavar="N",
+        type=int,
+        default=None,
+        help="Generate N puzzles with a unique solution",
+    )
+    parser.add_argument(
+        "--difficulty",
+        choices=DIFFICULTIES,
+        default="medium",
+        help="Difficulty of the generated puzzles",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        choices=SIZES,
+        default=9,
+        help="Side of the generated puzzles",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Seed that makes --generate repeatable",
+    )
+    # arguments for solving a batch across worker processes
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used with --batch or --generate",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=64,
+        help="Number of puzzles sent to a worker at a time",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="Output batch results as soon as they are solved",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Parse and validate the whole --batch file at once with numpy",
+    )
+    # arguments for converting between text and binary puzzle files
+    parser.add_argument(
+        "--write-binary",
+        metavar="BINARY_FILE",
+        help="Write the valid --batch puzzles to a binary file and exit",
+        default=None,
+    )
+    parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="Pack two cells per byte with --write-binary",
+    )
+    parser.add_argument(
+        "--write-text",
+        metavar="TEXT_FILE",
+        help="Write the puzzles of a binary --batch file as text and exit",
+        default=None,
+    )
+    # argument for caching solutions of repeated puzzles
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        help="Number of batch solutions cached by canonical puzzle form",
+    )
+    # arguments for the persistent solution store
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory of a solution store kept between runs",
+        default=None,
+    )
+    parser.add_argument(
+        "--warm-start",
+        metavar="RESULTS_FILE",
+        help="Load the solutions of a previous --batch output into the store",
+        default=None,
+    )
+    # argument for checking the solution is unique
+    parser.add_argument(
+        "--check-unique",
+        action="store_true",
+        help="Report whether the puzzle has a unique solution",
+    )
+    # argument for printing the logical steps of the solve
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Solve with the logic engine and print each technique used "
+        "and the rating of the puzzle",
+    )
+    # argument for printing the solver statistics
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print search counters and the time spent in each phase",
+    )
+    # arguments for bounding the search of each puzzle
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds the search of each puzzle may run for",
+    )
+    parser.add_argument(
+        "--max-nodes",
+        type=int,
+        default=None,
+        help="Search nodes each puzzle may visit",
+    )
+    # argument for the output format of boards and batch results
+    parser.add_argument(
+        "--format",
+        choices=sorted(set(FORMATS) | set(BATCH_FORMATS)),
+        default=None,
+        help="Output format, grid by default for a single puzzle and "
+        "line for --batch",
+    )
+    # argument for the solver engine
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help="Solver engine used to solve the puzzle",
+    )
 
     args = parser.parse_args()
+    if args.warm_start and not args.cache_dir:
+        parser.error("--warm-start requires --cache-dir")
+    if args.batch and args.format == "grid" and not args.write_text:
+        parser.error("--format grid is not available with --batch")
+    if args.timeout is not None and args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    if args.max_nodes is not None and args.max_nodes <= 0:
+        parser.error("--max-nodes must be positive")
+    if args.generate is not None and args.generate <= 0:
+        parser.error("--generate must be positive")
+
+    # solutions kept between runs and shared by every process
+    store = SudokuStore(args.cache_dir) if args.cache_dir else None
+    if args.warm_start:
+        count = SudokuCache(store=store).warm_start(args.warm_start)
+        print(f"loaded {count} solutions", file=sys.stderr)
 
     if args.web:
+        # import the web app only when it is requested
+        from app import app
+
+        if args.cache_dir:
+            app.config["CACHE_DIR"] = args.cache_dir
+
         # Run the web app on port 80
         app.run(host="0.0.0.0", port=80)
+    elif args.generate:
+        # generate the puzzles and write them out as each chunk is done
+        generator = SudokuGenerator(args.size, args.seed)
+        mode = args.format or "line"
+        start = time.perf_counter()
+        with SudokuWriter(sys.stdout) as writer:
+            generator.chunk_done = writer.flush
+            for puzzle in generator.generate_many(
+                args.generate, args.difficulty, args.workers
+            ):
+                writer.write(SudokuFormat(puzzle["board"]).format(mode))
+                if mode == "grid":
+                    writer.write("\n")
+
+        # print a summary of the run without mixing it into the puzzles
+        seconds = time.perf_counter() - start
+        print(
+            f"generated {args.generate} {args.difficulty} puzzles in "
+            f"{seconds:.2f}s ({args.generate / seconds * 60:.0f} per minute)",
+            file=sys.stderr,
+        )
+    elif args.batch and args.write_binary:
+        count, skipped = SudokuBinary.from_text(
+            args.batch, args.write_binary, args.packed
+        )
+        print(
+            f"wrote {count} puzzles, skipped {skipped} invalid",
+            file=sys.stderr,
+        )
+    elif args.batch and args.write_text:
+        with SudokuBinary(args.batch) as binary:
+            with open(args.write_text, "w") as file:
+                binary.to_text(file, args.format or "line")
+    elif args.batch:
+        # solve every puzzle, in input order unless --unordered is given
+        batch = SudokuBatch(
+            args.engine,
+            args.check_unique,
+            args.cache_size,
+            args.cache_dir,
+            args.timeout,
+            args.max_nodes,
+        )
+        counts = {
+            "solved": 0,
+            "unsolvable": 0,
+            "budget_exceeded": 0,
+            "invalid": 0,
+        }
+        hits = 0
+        results = batch.solve_file(
+            args.batch,
+            bulk=args.bulk,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            ordered=not args.unordered,
+        )
+        mode = args.format or "line"
+        with SudokuWriter(sys.stdout) as writer:
+            # write out the results of each chunk as soon as it is solved
+            batch.chunk_done = writer.flush
+            writer.write(SudokuBatch.format_header(mode, args.check_unique))
+            for result in results:
+                counts[result["status"]] += 1
+                hits += result.get("cached", False)
+                writer.write(SudokuBatch.format_result(result, mode))
+
+        # print a summary of the run without mixing it into the results
+        print(
+            f"{sum(counts.values())} puzzles: {counts['solved']} solved, "
+            f"{counts['unsolvable']} unsolvable, "
+            f"{counts['budget_exceeded']} over budget, "
+            f"{counts['invalid']} invalid",
+            file=sys.stderr,
+        )
+        if batch.cache is not None:
+            # every valid puzzle was looked up in its worker's cache
+            misses = sum(counts.values()) - counts["invalid"] - hits
+            print(f"cache: {hits} hits, {misses} misses", file=sys.stderr)
+        sys.stderr.write(batch.format_worker_stats())
     elif args.input_file:
         # Run the Sudoku solver
         reader = SudokuReader(args.input_file)
         sudoku = SudokuBoard(reader.board)
-        solver = SudokuAlgorithm(sudoku.board)
+        engine = "logic" if args.trace else args.engine
+        solver = get_engine(engine)(sudoku.board, profile=args.stats)
+
+        # look up the solution of an earlier run before solving
+        # a traced puzzle is always solved so its steps can be printed
+        if store is not None and not args.trace:
+            cache = SudokuCache(store=store)
+        else:
+            cache = None
+        solution = cache.get(sudoku.board) if cache is not None else None
+        if solution is not None:
+            print("solution found in the store", file=sys.stderr)
+            result = SudokuResult(SudokuResult.SOLVED)
+            if args.check_unique:
+                # a stored solution does not tell if there are others,
+                # so only the count is searched, within the solve budget
+                count = solver.count_solutions(2, args.timeout, args.max_nodes)
+                if count is None:
+                    raise ValueError(solver.result.message)
+                unique = count == 1
+        else:
+            clues = [row[:] for row in sudoku.board]
+            if args.check_unique:
+                # the search goes on past the solution for a second one
+                unique = solver.solve_unique(args.timeout, args.max_nodes)
+                result = solver.result
+            else:
+                result = solver.solve(args.timeout, args.max_nodes)
+            solution = solver.board
+            if args.stats:
+                print(solver.stats.format_stats(), end="", file=sys.stderr)
+            if args.trace:
+                print(solver.format_trace(), end="", file=sys.stderr)
+            if result.solved and cache is not None:
+                cache.put(clues, solution)
 
         # print the solved sudoku board
-        if solver.solve_sudoku():
-            formatter = SudokuFormat(solver.board)
-            print(formatter.format_sudoku_board())
-        # print error message if the sudoku is unsolvable
+        if result.solved:
+            mode = args.format or "grid"
+            formatter = SudokuFormat(solution)
+            # the grid is followed by a blank line
+            print(formatter.format(mode), end="\n" if mode == "grid" else "")
+            if args.check_unique:
+                if unique:
+                    print("Solution is unique")
+                else:
+                    print("Puzzle has multiple solutions")
+        # print error message naming why the sudoku is unsolved
         else:
-            raise ValueError("Unsolvable sudoku")
+            raise ValueError(result.message)
     else:
         # print error message if the input file is not specified
         print("Usage: python src/solve_sudoku.py input.txt")
+        print("       python src/solve_sudoku.py --batch puzzles.txt")
+        print("       python src/solve_sudoku.py --generate N")
         sys.exit(1)
 
 
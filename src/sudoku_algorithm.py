@@ -1,20 +1,68 @@
+import time
+from sudoku_grid import SudokuGrid
+from sudoku_result import SudokuResult
+from sudoku_stats import SudokuStats
+from sudoku_size import SudokuSize
+
+
 class SudokuAlgorithm:
     """
     Handles the solving process of the sudoku board via a backtracking
     algorithm. This class converts an unsovled 2D list to a solved 2D list
     """
 
-    def __init__(self, board):
+    # methods timed when the solver is profiled
+    PHASES = ("find_mrv_cell", "check_possible_indicies")
+
+    def __init__(self, board, profile=False):
         """
         Initialises the SudokuAlgorithm with a given sudoku board
 
         Parameters
         ----------
-        board : list[list[int]]
-            The current state of the sudoku board.
+        board : list[list[int]] or SudokuGrid
+            The current state of the sudoku board, a grid is
+            filled in once it is solved.
+        profile : bool
+            If True the time spent in each phase of
+            the search is recorded in self.stats.
 
         """
-        self.board = board
+        # a grid is searched as a list of its rows
+        self.grid, self.board = SudokuGrid.unpack(board)
+        self.result = None
+        self.stats = SudokuStats()
+
+        # geometry of the board, 9 x 9 until a board is given
+        self.size = SudokuSize.of(9)
+        if board is not None:
+            self.size = SudokuSize.of_board(board)
+
+        # frames of the search in progress, None if there is none
+        self.stack = None
+        self.descending = True
+
+        # first solution found by the last count of solutions
+        self.first_solution = None
+
+        if profile:
+            SudokuStats.profile(self, self.PHASES)
+
+    def load_board(self, board):
+        """
+        Replaces the board being solved so a single
+        solver can be reused across many puzzles
+
+        Parameters
+        ----------
+        board : list[list[int]] or SudokuGrid
+            The current state of the sudoku board, a grid is
+            filled in once it is solved.
+
+        """
+        self.grid, self.board = SudokuGrid.unpack(board)
+        self.size = SudokuSize.of_board(board)
+        self.stack = None
 
     def check_possible_indicies(self, x, y, n):
         """
@@ -38,18 +86,21 @@ class SudokuAlgorithm:
         if self.board is None:
             return False
 
+        side = self.size.side
+        box = self.size.box
+
         # checks if n is in column x or row y
-        for i in range(0, 9):
+        for i in range(0, side):
             if self.board[i][x] == n or self.board[y][i] == n:
                 return False
 
-        # top left corner of 3x3 square
-        x0 = (x // 3) * 3
-        y0 = (y // 3) * 3
+        # top left corner of the square
+        x0 = (x // box) * box
+        y0 = (y // box) * box
 
-        # checks if n is in 3x3 square
-        for i in range(0, 3):
-            for j in range(0, 3):
+        # checks if n is in the square
+        for i in range(0, box):
+            for j in range(0, box):
                 if self.board[y0 + i][x0 + j] == n:
                     return False
 
@@ -67,18 +118,20 @@ class SudokuAlgorithm:
             The x and y coordinate of the cell with the least amount of
             possible values or None if no cell exists
         """
+        side = self.size.side
+
         # initial mrv score greater than any possible score
-        mrv = 10
+        mrv = side + 1
         mrv_cell = None
 
         # iterate through each cell
-        for y in range(9):
-            for x in range(9):
+        for y in range(side):
+            for x in range(side):
                 if self.board[y][x] == 0:
                     # find number of possible values for cell
                     possible_values = sum(
                         self.check_possible_indicies(x, y, n)
-                        for n in range(1, 10)
+                        for n in range(1, side + 1)
                     )
                     if possible_values < mrv:
                         mrv = possible_values
@@ -86,33 +139,358 @@ class SudokuAlgorithm:
 
         return mrv_cell
 
-    def solve_sudoku(self):
+    def start(self):
+        """
+        Starts a new search of the board. Any search in progress is
+        abandoned first. The search is run by resume, which can be
+        given a node or time budget and called again until it finishes
+
+        Returns
+        -------
+        SudokuResult or None:
+            The result if the board was decided before the
+            first node of the search, None otherwise
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to solve
+        """
+        if self.board is None:
+            raise ValueError("No board found")
+
+        if self.stack is not None:
+            self.abandon()
+
+        self.stats = SudokuStats()
+        self.result = None
+        self.stack = []
+        self.descending = True
+        return None
+
+    def resume(self, max_nodes=None, timeout=None):
+        """
+        Continues the search started by start until the board is
+        solved, proven unsolvable or the budget runs out. A search
+        that ran out of budget is paused and continues from the same
+        node on the next call. The result is stored in self.result
+
+        Parameters
+        ----------
+        max_nodes : int, optional
+            The number of search nodes this call may visit.
+        timeout : float, optional
+            The number of seconds this call may run for.
+
+        Returns
+        -------
+        SudokuResult or None:
+            The solved or unsolvable result, or None
+            if the search was paused
+
+        Raises
+        ------
+        ValueError:
+            If no search was started
+        """
+        if self.stack is None:
+            raise ValueError("No search in progress")
+
+        start = time.perf_counter()
+        deadline = None if timeout is None else start + timeout
+        solved = self.search(max_nodes, deadline)
+        self.stats.solve_time += time.perf_counter() - start
+        if solved is None:
+            return None
+
+        self.stack = None
+        if solved:
+            if self.grid is not None:
+                self.grid.load_rows(self.board)
+            self.result = SudokuResult(SudokuResult.SOLVED)
+        else:
+            self.result = self.unsolvable_result()
+        return self.result
+
+    @property
+    def paused(self):
+        """
+        bool: True if a search was started and has not finished
+        """
+        return self.stack is not None
+
+    def abandon(self):
+        """
+        Stops the search in progress and removes its guesses,
+        leaving the board as it was given
+        """
+        for x, y, _ in reversed(self.stack or ()):
+            self.board[y][x] = 0
+        self.stack = None
+
+    def solve(self, timeout=None, max_nodes=None):
+        """
+        Solves the sudoku and describes the outcome. If the board is
+        unsolvable the reason names the first cell searched, which
+        either has no candidates or has no candidate that leads to
+        a solution. A search out of budget is stopped, the board is
+        restored and the result holds the statistics so far. The
+        result is stored in self.result and the statistics of the
+        solve in self.stats
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search may run for.
+        max_nodes : int, optional
+            The number of search nodes the search may visit.
+
+        Returns
+        -------
+        SudokuResult:
+            The solved, unsolvable or budget exceeded result
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to solve
+        """
+        self.result = self.start() or self.resume(max_nodes, timeout)
+        if self.result is None:
+            self.result = self.budget_result(timeout, max_nodes)
+        return self.result
+
+    def budget_result(self, timeout, max_nodes):
+        """
+        Stops a search that ran out of budget and names the budget
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search was allowed.
+        max_nodes : int, optional
+            The number of search nodes the search was allowed.
+
+        Returns
+        -------
+        SudokuResult:
+            The budget exceeded result with the statistics so far
+        """
+        self.abandon()
+        stats = self.stats.to_dict()
+        if max_nodes is not None and self.stats.nodes >= max_nodes:
+            return SudokuResult.budget_exceeded("nodes", max_nodes, stats)
+        return SudokuResult.budget_exceeded("time", timeout, stats)
+
+    def unsolvable_result(self):
         """
-        Solves the sudoku by recurssion of possbile indicies
-        this function utlises the backtracking algorithm
+        Names the first cell searched once every guess has been undone
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the cell
+        """
+        x, y = self.find_mrv_cell()
+        numbers = range(1, self.size.side + 1)
+        if any(self.check_possible_indicies(x, y, n) for n in numbers):
+            return SudokuResult.exhausted(x, y)
+        return SudokuResult.empty_cell(x, y)
+
+    def solve_sudoku(self, timeout=None, max_nodes=None):
+        """
+        Solves the sudoku, see solve for the details of the outcome
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search may run for.
+        max_nodes : int, optional
+            The number of search nodes the search may visit.
 
         Returns
         -------
         bool:
             True if the board is solved, False otherwise
         """
+        return self.solve(timeout, max_nodes).solved
+
+    def search(self, max_nodes=None, deadline=None):
+        """
+        Searches the board with the backtracking algorithm. The
+        recursion is replaced by an explicit stack of [x, y, n]
+        frames, the guess n made in each cell, so the search can stop
+        at any node and continue from it on the next call. After a
+        solution the next call backtracks to look for another one
+
+        Parameters
+        ----------
+        max_nodes : int, optional
+            The number of nodes after which the search pauses.
+        deadline : float, optional
+            The time.perf_counter value after which the search pauses.
+
+        Returns
+        -------
+        bool or None:
+            True if the board is solved, False if every guess
+            failed and None if the search was paused
+        """
+        board = self.board
+        stats = self.stats
+        stack = self.stack
+        descending = self.descending
+        last = self.size.side + 1
+        node_limit = None if max_nodes is None else stats.nodes + max_nodes
+
+        while True:
+            if descending:
+                # pause before visiting a node beyond the budget
+                if node_limit is not None and stats.nodes >= node_limit:
+                    self.descending = True
+                    return None
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self.descending = True
+                    return None
+
+                stats.nodes += 1
+                if len(stack) > stats.max_depth:
+                    stats.max_depth = len(stack)
+
+                # find the cell with the least amount of possible values
+                mrv_cell = self.find_mrv_cell()
+                if mrv_cell is None:
+                    self.descending = False
+                    return True
+
+                x, y = mrv_cell
+                frame = [x, y, 0]
+                stack.append(frame)
+            else:
+                # check if board is unsovleable
+                if not stack:
+                    return False
+
+                # undo the guess of the deepest cell
+                frame = stack[-1]
+                x, y = frame[0], frame[1]
+                board[y][x] = 0
+                stats.backtracks += 1
+
+            # guess the next possible value of the deepest cell
+            descending = False
+            for n in range(frame[2] + 1, last):
+                if self.check_possible_indicies(x, y, n):
+                    board[y][x] = n
+                    frame[2] = n
+                    stats.guesses += 1
+                    descending = True
+                    break
+
+            if not descending:
+                stack.pop()
+
+    def count_solutions(self, limit=2, timeout=None, max_nodes=None):
+        """
+        Counts the solutions of the board by resuming the search after
+        every solution instead of stopping at the first one. Counting
+        stops as soon as limit solutions are found and the board is
+        left unchanged. A count out of budget is stopped and its
+        budget exceeded result is stored in self.result
+
+        Parameters
+        ----------
+        limit : int
+            The number of solutions after which counting stops,
+            2 is enough to tell if the solution is unique.
+        timeout : float, optional
+            The number of seconds the count may run for.
+        max_nodes : int, optional
+            The number of search nodes the count may visit.
+
+        Returns
+        -------
+        int or None:
+            The number of solutions found, at most limit, or None
+            if the count ran out of budget. The result of a board
+            with no solution is stored in self.result
+
+        Raises
+        ------
+        ValueError:
+            If there is no board or the limit is below one
+        """
         if self.board is None:
             raise ValueError("No board found")
+        if limit < 1:
+            raise ValueError("Solution limit must be at least 1")
 
-        # find the cell with the least amount of possible values
-        mrv_cell = self.find_mrv_cell()
-        if mrv_cell is None:
-            return True
+        if self.start() is not None:
+            return 0
 
-        # unpack the tuple
-        x, y = mrv_cell
+        start = time.perf_counter()
+        deadline = None if timeout is None else start + timeout
+        count = 0
+        while count < limit:
+            # the node budget is shared by every solution counted
+            remaining = None
+            if max_nodes is not None:
+                remaining = max_nodes - self.stats.nodes
+            found = self.search(remaining, deadline)
+            if found is None:
+                self.stats.solve_time += time.perf_counter() - start
+                self.result = self.budget_result(timeout, max_nodes)
+                return None
+            if not found:
+                break
+            if count == 0:
+                # kept so solve_unique needs no second search
+                self.first_solution = [row[:] for row in self.board]
+            count += 1
 
-        # recurse through each possible value
-        for n in range(1, 10):
-            if self.check_possible_indicies(x, y, n):
-                self.board[y][x] = n
-                if self.solve_sudoku():
-                    return True
-                self.board[y][x] = 0
-        # check if board is unsovleable
-        return False
+        self.stats.solve_time += time.perf_counter() - start
+        if count == 0:
+            self.result = self.unsolvable_result()
+        self.abandon()
+        return count
+
+    def solve_unique(self, timeout=None, max_nodes=None):
+        """
+        Solves the sudoku and resumes the same search for a second
+        solution, so telling if the solution is unique costs no
+        second solve. The budgets cover both searches, and the board
+        and self.result are left as by solve
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search may run for.
+        max_nodes : int, optional
+            The number of search nodes the search may visit.
+
+        Returns
+        -------
+        bool or None:
+            True if the solution is unique, False if the board has
+            several solutions and None if it was not solved
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to solve
+        """
+        count = self.count_solutions(2, timeout, max_nodes)
+        if not count:
+            return None
+
+        board = self.board
+        for row, solved in zip(board, self.first_solution):
+            row[:] = solved
+        if self.grid is not None:
+            self.grid.load_rows(board)
+            board = self.grid
+
+        # rebuild the state of the engine from the solved board
+        self.load_board(board)
+        self.result = SudokuResult(SudokuResult.SOLVED)
+        return count == 1
@@ -0,0 +1,326 @@
+import json
+import warnings
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_engines import get_engine
+from sudoku_format import SudokuFormat
+from sudoku_size import SudokuSize
+from sudoku_stats import SudokuStats
+
+
+class SudokuAPI:
+    """
+    Handles the JSON requests of the web application. Puzzles are
+    taken from the request body and solved in memory, so concurrent
+    requests never share a file and the app can run with many workers
+    """
+
+    # largest batch request body in bytes and puzzles
+    MAX_BATCH_BYTES = 8 * 1024 * 1024
+    MAX_BATCH_PUZZLES = 10000
+
+    @staticmethod
+    def parse_puzzle(puzzle):
+        """
+        Converts a puzzle from a request body into the list of lists
+        produced by SudokuReader. The puzzle may be a single line of
+        81 characters, a grid of text lines or a list of nine rows
+        holding strings or integers, or the same for the 4 x 4,
+        16 x 16 and 25 x 25 sizes
+
+        Parameters
+        ----------
+        puzzle : str or list
+            The puzzle as given in the request body.
+
+        Returns
+        -------
+        list[list[str]]
+            A 2D list representing each row of the initial sudoku board.
+
+        Raises
+        ------
+        ValueError
+            If the puzzle is missing or of an unsupported type.
+        """
+        if isinstance(puzzle, str):
+            if "\n" in puzzle.strip():
+                return SudokuReader.parse_board_text(puzzle)
+            return SudokuReader.parse_puzzle_line(puzzle)
+
+        if isinstance(puzzle, list) and all(
+            isinstance(row, (str, list)) for row in puzzle
+        ):
+            return [
+                SudokuSize.split_cells(row.strip())
+                if isinstance(row, str)
+                else [str(value) for value in row]
+                for row in puzzle
+            ]
+
+        raise ValueError(
+            "Puzzle must be a string of 81 characters or a list of rows"
+        )
+
+    @staticmethod
+    def budget(requested, limit):
+        """
+        Returns the smaller of a requested budget and the server limit
+
+        Parameters
+        ----------
+        requested : float or int, optional
+            The budget asked for by the request.
+        limit : float or int, optional
+            The largest budget allowed, no limit if None.
+
+        Returns
+        -------
+        float or int or None:
+            The budget of the solve, no budget if None
+
+        Raises
+        ------
+        ValueError
+            If the requested budget is not a positive number.
+        """
+        if requested is not None:
+            if isinstance(requested, bool) or not isinstance(
+                requested, (int, float)
+            ):
+                raise ValueError("Budgets must be numbers")
+            if requested <= 0:
+                raise ValueError("Budgets must be positive")
+
+        if limit is None:
+            return requested
+        if requested is None:
+            return limit
+        return min(requested, limit)
+
+    @staticmethod
+    def load_request(data, engine=None):
+        """
+        Reads the solver engine and validated board of a request body
+
+        Parameters
+        ----------
+        data : str, list or dict
+            The request body: the puzzle itself or an object with a
+            "puzzle" and an optional "engine".
+        engine : str, optional
+            Name of the solver engine if the body does not name one,
+            the default engine is used if None.
+
+        Returns
+        -------
+        tuple[type, list[list[int]]]:
+            The solver class and the validated board
+
+        Raises
+        ------
+        ValueError
+            If the puzzle or engine is not valid.
+        """
+        if isinstance(data, dict):
+            engine = data.get("engine", engine)
+            data = data.get("puzzle")
+        solver_class = get_engine(engine)
+        return solver_class, SudokuAPI.load_board(data)
+
+    @staticmethod
+    def load_board(puzzle):
+        """
+        Parses and validates the puzzle of a request body
+
+        Parameters
+        ----------
+        puzzle : str or list
+            The puzzle as given in the request body.
+
+        Returns
+        -------
+        list[list[int]]:
+            The validated board
+
+        Raises
+        ------
+        ValueError
+            If the puzzle is not valid.
+        """
+        with warnings.catch_warnings():
+            # boards with few clues are still solved
+            warnings.simplefilter("ignore")
+            return SudokuBoard(SudokuAPI.parse_puzzle(puzzle)).board
+
+    @staticmethod
+    def solve(
+        data,
+        engine=None,
+        solvers=None,
+        cache=None,
+        timeout=None,
+        max_nodes=None,
+    ):
+        """
+        Validates and solves the puzzle of a request body
+
+        Parameters
+        ----------
+        data : str, list or dict
+            The request body: the puzzle itself or an object with a
+            "puzzle" and an optional "engine", "timeout" in seconds
+            and "max_nodes".
+        engine : str, optional
+            Name of the solver engine if the body does not name one,
+            the default engine is used if None.
+        solvers : dict, optional
+            Solvers by engine class, reused with load_board across
+            the puzzles of a batch so the DLX matrix is built once.
+        cache : SudokuCache, optional
+            Cache of solutions looked up before solving and
+            filled in with every solved puzzle.
+        timeout : float, optional
+            The largest time budget in seconds of the search.
+        max_nodes : int, optional
+            The largest node budget of the search.
+
+        Returns
+        -------
+        tuple[dict, int]:
+            The response and its HTTP status code. The response holds
+            the normalised puzzle, its status ("solved", "unsolvable",
+            "budget_exceeded" or "invalid"), the solution or error
+            message, the reason of an unsolved puzzle, whether the
+            solution was "cached" and the solver statistics, zeroed
+            for a cached solution
+        """
+        options = data if isinstance(data, dict) else {}
+        try:
+            solver_class, board = SudokuAPI.load_request(data, engine)
+            timeout = SudokuAPI.budget(options.get("timeout"), timeout)
+            max_nodes = SudokuAPI.budget(options.get("max_nodes"), max_nodes)
+        except ValueError as error:
+            return {"status": "invalid", "error": str(error)}, 400
+
+        # normalised one character per cell form of the puzzle
+        puzzle = SudokuFormat.board_line(board)
+
+        if cache is not None:
+            solution = cache.get(board)
+            if solution is not None:
+                return {
+                    "puzzle": puzzle,
+                    "status": "solved",
+                    "solution": SudokuFormat.board_line(solution),
+                    "cached": True,
+                    # nothing was searched
+                    "stats": SudokuStats().to_dict(),
+                }, 200
+            clues = [row[:] for row in board]
+
+        if solvers is None:
+            solver = solver_class(board)
+        elif solver_class in solvers:
+            solver = solvers[solver_class]
+            solver.load_board(board)
+        else:
+            solver = solvers[solver_class] = solver_class(board)
+
+        result = solver.solve(timeout, max_nodes)
+        response = {"puzzle": puzzle, "status": result.status}
+        if result.solved:
+            response["solution"] = SudokuFormat.board_line(solver.board)
+            if cache is not None:
+                cache.put(clues, solver.board)
+        else:
+            response["error"] = result.message
+            response["reason"] = result.reason
+        if cache is not None:
+            response["cached"] = False
+        response["stats"] = solver.stats.to_dict()
+        return response, 200
+
+    @staticmethod
+    def read_ndjson(lines):
+        """
+        Decodes newline delimited JSON one line at a time so a large
+        request body is never held in memory. Blank lines are skipped
+
+        Parameters
+        ----------
+        lines : iterable[bytes or str]
+            The lines of the request body.
+
+        Yields
+        ------
+        object or ValueError:
+            The value of each line, or the error of a line that
+            is not valid JSON so it can be reported inline
+        """
+        for line in lines:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8", "replace")
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                yield ValueError(f"Invalid JSON: {error}")
+
+    @staticmethod
+    def solve_batch(
+        puzzles,
+        engine=None,
+        max_puzzles=None,
+        cache=None,
+        timeout=None,
+        max_nodes=None,
+    ):
+        """
+        Solves an iterable of puzzles and yields each response as a
+        line of JSON as soon as its puzzle is solved. Errors are
+        reported inline so one bad puzzle does not stop the batch
+
+        Parameters
+        ----------
+        puzzles : iterable
+            The request body of each puzzle as accepted by solve,
+            or a ValueError for a puzzle that could not be decoded.
+        engine : str, optional
+            Name of the solver engine if a puzzle does not name one.
+        max_puzzles : int, optional
+            The number of puzzles after which the batch is cut off
+            with a final error line.
+        cache : SudokuCache, optional
+            Cache of solutions shared by the puzzles of the batch.
+        timeout : float, optional
+            The largest time budget in seconds of each puzzle.
+        max_nodes : int, optional
+            The largest node budget of each puzzle.
+
+        Yields
+        ------
+        str:
+            The response of each puzzle with its "index" in the
+            batch, as JSON followed by a newline
+        """
+        solvers = {}
+        for index, data in enumerate(puzzles):
+            if max_puzzles is not None and index >= max_puzzles:
+                response = {
+                    "status": "invalid",
+                    "error": f"Batch is limited to {max_puzzles} puzzles",
+                }
+                yield json.dumps({"index": index, **response}) + "\n"
+                return
+
+            if isinstance(data, ValueError):
+                response = {"status": "invalid", "error": str(data)}
+            else:
+                response, _ = SudokuAPI.solve(
+                    data, engine, solvers, cache, timeout, max_nodes
+                )
+            yield json.dumps({"index": index, **response}) + "\n"
@@ -0,0 +1,592 @@
+import os
+import json
+import time
+import queue
+import warnings
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_engines import get_engine
+from sudoku_format import SudokuFormat
+from sudoku_cache import SudokuCache, DEFAULT_CACHE_SIZE
+from sudoku_store import SudokuStore
+from sudoku_binary import SudokuBinary
+
+
+# output modes of a batch result
+BATCH_FORMATS = ("line", "csv", "json")
+
+
+class SudokuBatch:
+    """
+    Handles the solving of many sudoku puzzles in a single run.
+    Puzzles are read one per line, solved in input order and each
+    result reports its own status instead of stopping the whole run.
+    Puzzles can be sent in chunks to a pool of worker processes
+    """
+
+    # chunks sent to each worker process ahead of the results read
+    CHUNKS_PER_WORKER = 2
+
+    def __init__(
+        self,
+        engine=None,
+        check_unique=False,
+        cache_size=0,
+        cache_dir=None,
+        timeout=None,
+        max_nodes=None,
+    ):
+        """
+        Initialises the SudokuBatch with the solver engine to use
+
+        Parameters
+        ----------
+        engine : str, optional
+            Name of the solver engine, the default engine is used if None.
+        check_unique : bool
+            If True every solved puzzle also reports whether
+            its solution is unique.
+        cache_size : int
+            Number of solutions kept in a cache keyed by the canonical
+            form of each puzzle, no cache is used if 0 and
+            there is no cache_dir.
+        cache_dir : str, optional
+            Directory of a persistent solution store shared by every
+            worker process and kept between runs.
+        timeout : float, optional
+            Seconds the search of each puzzle may run for.
+        max_nodes : int, optional
+            Search nodes each puzzle may visit.
+        """
+        self.engine = engine
+        self.check_unique = check_unique
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.solver_class = get_engine(engine)
+
+        # solutions of puzzles already seen, shared by relabelings,
+        # rotations and permutations of the same puzzle
+        self.cache = None
+        if cache_size or cache_dir:
+            store = SudokuStore(cache_dir) if cache_dir else None
+            self.cache = SudokuCache(cache_size or DEFAULT_CACHE_SIZE, store)
+
+        # board and solver reused for every puzzle of the run
+        self.sudoku = None
+        self.solver = None
+
+        # puzzles solved and seconds spent per worker process id
+        self.worker_stats = {}
+
+        # called once the results of each solved chunk are yielded,
+        # so output can be flushed before waiting for the next chunk
+        self.chunk_done = None
+
+    def solve_puzzle(self, puzzle):
+        """
+        Validates and solves a single puzzle line
+
+        Parameters
+        ----------
+        puzzle : str or SudokuGrid or list[list[int]]
+            The puzzle as a single line of 81 characters, or a board
+            already validated by SudokuBulk.
+
+        Returns
+        -------
+        dict:
+            The normalised puzzle, its status ("solved", "unsolvable",
+            "budget_exceeded" or "invalid"), the solution or error
+            message, the reason of an unsolved puzzle, whether a solved
+            puzzle was "cached" and, if check_unique is set, whether
+            its solution is unique
+        """
+        if isinstance(puzzle, str):
+            # the line is read and validated as a grid, without
+            # a string and an int per cell
+            try:
+                board = SudokuReader.parse_puzzle_grid(puzzle)
+                if self.sudoku is None:
+                    self.sudoku = SudokuBoard(board)
+                else:
+                    self.sudoku.load_board(board)
+            except ValueError as error:
+                return {
+                    "puzzle": puzzle,
+                    "status": "invalid",
+                    "error": str(error),
+                }
+        else:
+            board = puzzle
+
+        # normalised one character per cell form of the puzzle
+        puzzle = SudokuFormat.board_line(board)
+
+        if self.solver is None:
+            self.solver = self.solver_class(board)
+        else:
+            self.solver.load_board(board)
+
+        # rows of the board searched by the solver
+        solver = self.solver
+        board = solver.board
+
+        solution = None
+        if self.cache is not None:
+            solution = self.cache.get(board)
+            cached = solution is not None
+
+        if solution is None:
+            # the solver fills in the board, keep the clues for the cache
+            if self.cache is not None:
+                clues = [row[:] for row in board]
+            if self.check_unique:
+                # the search goes on past the solution for a second one
+                unique = solver.solve_unique(self.timeout, self.max_nodes)
+                result = solver.result
+            else:
+                result = solver.solve(self.timeout, self.max_nodes)
+            if not result.solved:
+                return self.unsolved(puzzle, result)
+            solution = solver.board
+            if self.cache is not None:
+                self.cache.put(clues, solution)
+        elif self.check_unique:
+            # a cached solution does not tell if there are others, so
+            # only the count is searched, within the budget of a solve
+            count = solver.count_solutions(2, self.timeout, self.max_nodes)
+            if count is None:
+                return self.unsolved(puzzle, solver.result)
+            unique = count == 1
+
+        result = {
+            "puzzle": puzzle,
+            "status": "solved",
+            "solution": SudokuFormat.board_line(solution),
+        }
+        if self.cache is not None:
+            result["cached"] = cached
+        if self.check_unique:
+            result["unique"] = unique
+        return result
+
+    @staticmethod
+    def unsolved(puzzle, result):
+        """
+        Converts the result of a puzzle that was not solved
+
+        Parameters
+        ----------
+        puzzle : str
+            The normalised puzzle.
+        result : SudokuResult
+            The unsolvable or budget exceeded result.
+
+        Returns
+        -------
+        dict:
+            The puzzle, its status, the error message and its reason
+        """
+        return {
+            "puzzle": puzzle,
+            "status": result.status,
+            "error": result.message,
+            "reason": result.reason,
+        }
+
+    def solve_chunk(self, chunk):
+        """
+        Solves a chunk of puzzle lines and times the work
+
+        Parameters
+        ----------
+        chunk : iterable[str or SudokuGrid or list[list[int]]]
+            Puzzles as accepted by solve_puzzle.
+
+        Returns
+        -------
+        tuple[int, float, list[dict]]:
+            The process id, seconds spent and the result of each puzzle
+        """
+        start = time.perf_counter()
+        with warnings.catch_warnings():
+            # boards with few clues are expected in bulk input
+            warnings.simplefilter("ignore")
+            results = [self.solve_puzzle(puzzle) for puzzle in chunk]
+
+        return os.getpid(), time.perf_counter() - start, results
+
+    def solve_puzzles(self, puzzles, workers=1, chunk_size=64, ordered=True):
+        """
+        Solves an iterable of puzzle lines and yields each
+        result as soon as its chunk has been solved
+
+        Parameters
+        ----------
+        puzzles : iterable[str]
+            Puzzles as single lines of 81 characters.
+        workers : int
+            Number of worker processes, puzzles are solved in
+            this process if 1.
+        chunk_size : int
+            Number of puzzles sent to a worker at a time.
+        ordered : bool
+            If False results are yielded as soon as any chunk is
+            solved rather than in input order.
+
+        Yields
+        ------
+        dict:
+            The result of each puzzle as returned by solve_puzzle
+        """
+        self.check_options(workers, chunk_size)
+
+        # split the puzzles into lists of chunk_size without reading ahead
+        puzzles = iter(puzzles)
+        chunks = iter(lambda: list(islice(puzzles, chunk_size)), [])
+
+        yield from self._solve_chunks(
+            chunks, self.solve_chunk, _solve_chunk, workers, ordered
+        )
+
+    def solve_binary(self, filename, workers=1, chunk_size=64, ordered=True):
+        """
+        Solves every puzzle of a binary puzzle file. Chunks are sent to
+        the workers as ranges of records, which each worker decodes
+        from its own memory map of the file
+
+        Parameters
+        ----------
+        filename : str
+            Path to a file written by SudokuBinary.write.
+        workers : int
+            Number of worker processes, puzzles are solved in
+            this process if 1.
+        chunk_size : int
+            Number of puzzles sent to a worker at a time.
+        ordered : bool
+            If False results are yielded as soon as any chunk is
+            solved rather than in input order.
+
+        Yields
+        ------
+        dict:
+            The result of each puzzle as returned by solve_puzzle
+        """
+        self.check_options(workers, chunk_size)
+
+        with SudokuBinary(filename) as binary:
+            count = len(binary)
+            chunks = (
+                (filename, start, min(start + chunk_size, count))
+                for start in range(0, count, chunk_size)
+            )
+
+            def solve_range(chunk):
+                _, start, stop = chunk
+                return self.solve_chunk(binary.boards(start, stop))
+
+            yield from self._solve_chunks(
+                chunks, solve_range, _solve_range, workers, ordered
+            )
+
+    @staticmethod
+    def check_options(workers, chunk_size):
+        """
+        Checks the worker options of a run
+
+        Raises
+        ------
+        ValueError
+            If the number of workers or the chunk size is below one.
+        """
+        if workers < 1:
+            raise ValueError("Number of workers must be at least 1")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+    def _solve_chunks(self, chunks, solve, worker_solve, workers, ordered):
+        """
+        Solves chunks with solve in this process, or with worker_solve
+        in a pool of worker processes, and yields every result
+        """
+        self.worker_stats = {}
+
+        if workers == 1:
+            yield from self._collect(map(solve, chunks))
+            return
+
+        options = (
+            self.engine,
+            self.check_unique,
+            self.cache_size,
+            self.cache_dir,
+            self.timeout,
+            self.max_nodes,
+        )
+        with Pool(workers, _init_worker, options) as pool:
+            solved_chunks = self._dispatch(
+                pool, worker_solve, chunks, workers, ordered
+            )
+            yield from self._collect(solved_chunks)
+
+    def _dispatch(self, pool, solve, chunks, workers, ordered):
+        """
+        Sends chunks to the pool and yields each solved chunk, keeping
+        at most CHUNKS_PER_WORKER chunks per worker in flight so the
+        input is never read further ahead than the workers can solve.
+        Pool.imap would queue every chunk of the input at once
+        """
+        limit = workers * self.CHUNKS_PER_WORKER
+        pending = deque()
+        finished = queue.Queue()
+
+        def next_chunk():
+            if ordered:
+                return pending.popleft().get()
+
+            # any solved chunk frees the slot of the oldest
+            pending.popleft()
+            solved = finished.get()
+            if isinstance(solved, BaseException):
+                raise solved
+            return solved
+
+        for chunk in chunks:
+            if ordered:
+                pending.append(pool.apply_async(solve, (chunk,)))
+            else:
+                pending.append(
+                    pool.apply_async(
+                        solve,
+                        (chunk,),
+                        callback=finished.put,
+                        error_callback=finished.put,
+                    )
+                )
+            if len(pending) >= limit:
+                yield next_chunk()
+
+        while pending:
+            yield next_chunk()
+
+    def _collect(self, solved_chunks):
+        """
+        Records the throughput of each worker and
+        yields the results of every solved chunk
+        """
+        for pid, seconds, results in solved_chunks:
+            stats = self.worker_stats.setdefault(
+                pid, {"puzzles": 0, "seconds": 0.0}
+            )
+            stats["puzzles"] += len(results)
+            stats["seconds"] += seconds
+            yield from results
+            if self.chunk_done is not None:
+                self.chunk_done()
+
+    def solve_file(self, filename, bulk=False, **options):
+        """
+        Solves every puzzle in a file holding one puzzle per line
+
+        Parameters
+        ----------
+        filename : str
+            Path to a binary puzzle file, a text puzzle file read by
+            SudokuReader.read_puzzles_from_file, or "-" for
+            standard input.
+        bulk : bool
+            If True the whole file is parsed and validated at once
+            with SudokuBulk before solving starts, which needs numpy.
+        **options
+            Worker options passed on to solve_puzzles.
+
+        Yields
+        ------
+        dict:
+            The result of each puzzle as returned by solve_puzzle
+        """
+        if SudokuBinary.is_binary(filename):
+            # binary files only hold validated puzzles
+            yield from self.solve_binary(filename, **options)
+            return
+
+        if bulk:
+            # import numpy only when bulk ingest is requested
+            from sudoku_bulk import SudokuBulk
+
+            bulk = SudokuBulk.read_file(filename)
+            yield from self.solve_bulk(bulk, **options)
+            return
+
+        puzzles = (
+            line for _, line in SudokuReader.read_puzzles_from_file(filename)
+        )
+        yield from self.solve_puzzles(puzzles, **options)
+
+    def solve_bulk(self, bulk, ordered=True, **options):
+        """
+        Solves the valid puzzles of a SudokuBulk and reports the
+        rejected ones with the error found during validation
+
+        Parameters
+        ----------
+        bulk : SudokuBulk
+            The parsed and validated puzzles.
+        ordered : bool
+            If False the rejected puzzles are reported first and the
+            others as soon as any chunk is solved.
+        **options
+            Worker options passed on to solve_puzzles.
+
+        Yields
+        ------
+        dict:
+            The result of each puzzle as returned by solve_puzzle
+        """
+        results = self.solve_puzzles(
+            bulk.valid_boards(), ordered=ordered, **options
+        )
+        for index in range(len(bulk)):
+            if index in bulk.errors:
+                puzzle, error = bulk.errors[index]
+                yield {"puzzle": puzzle, "status": "invalid", "error": error}
+            elif ordered:
+                yield next(results)
+        yield from results
+
+    def format_worker_stats(self):
+        """
+        Formats the puzzles solved and throughput of each worker
+
+        Returns
+        -------
+        str:
+            One line per worker process
+        """
+        lines = []
+        for pid, stats in sorted(self.worker_stats.items()):
+            seconds = stats["seconds"]
+            rate = stats["puzzles"] / seconds if seconds else 0.0
+            lines.append(
+                f"worker {pid}: {stats['puzzles']} puzzles in "
+                f"{seconds:.3f}s ({rate:.1f} puzzles/s)\n"
+            )
+        return "".join(lines)
+
+    @staticmethod
+    def format_result(result, mode="line"):
+        """
+        Formats a result as an output line. In the default "line" mode
+        the puzzle, its status and the solution or error message are
+        separated by tabs, followed by "unique" or "multiple" if
+        uniqueness was checked. The "csv" mode writes the same fields
+        as CSV and the "json" mode the whole result as JSON
+
+        Parameters
+        ----------
+        result : dict
+            The result of a puzzle as returned by solve_puzzle.
+        mode : str
+            One of BATCH_FORMATS: "line", "csv" or "json".
+
+        Returns
+        -------
+        str:
+            The formatted output line
+
+        Raises
+        ------
+        ValueError
+            If the mode is unknown.
+        """
+        if mode == "json":
+            return json.dumps(result) + "\n"
+
+        fields = [
+            result["puzzle"],
+            result["status"],
+            str(result.get("solution", result.get("error"))),
+        ]
+        if "unique" in result:
+            fields.append("unique" if result["unique"] else "multiple")
+
+        if mode == "line":
+            return "\t".join(fields) + "\n"
+        if mode == "csv":
+            return ",".join(SudokuBatch.csv_field(f) for f in fields) + "\n"
+        raise ValueError(
+            f"Unknown batch format '{mode}', "
+            f"expected one of {', '.join(BATCH_FORMATS)}"
+        )
+
+    @staticmethod
+    def format_header(mode="line", check_unique=False):
+        """
+        Formats the header line of a batch output, only
+        the "csv" mode has one
+
+        Parameters
+        ----------
+        mode : str
+            One of BATCH_FORMATS.
+        check_unique : bool
+            True if results report whether their solution is unique.
+
+        Returns
+        -------
+        str:
+            The header line, empty if the mode has none
+        """
+        if mode != "csv":
+            return ""
+        return "puzzle,status,detail" + (",unique" * check_unique) + "\n"
+
+    @staticmethod
+    def csv_field(field):
+        """
+        Quotes a CSV field holding a comma, quote or newline
+        """
+        if any(char in field for char in ',"\n'):
+            return '"' + field.replace('"', '""') + '"'
+        return field
+
+
+# batch solver owned by each worker process of the pool
+_worker_batch = None
+
+
+def _init_worker(*options):
+    """
+    Creates the batch solver and cache reused by a worker process
+    """
+    global _worker_batch
+    _worker_batch = SudokuBatch(*options)
+
+
+def _solve_chunk(chunk):
+    """
+    Solves a chunk of puzzles with the batch solver of the worker process
+    """
+    return _worker_batch.solve_chunk(chunk)
+
+
+# binary puzzle files mapped by each worker process, by file name
+_worker_binaries = {}
+
+
+def _solve_range(chunk):
+    """
+    Solves a range of the records of a binary puzzle file, mapping
+    the file in the worker process on first use
+    """
+    filename, start, stop = chunk
+    binary = _worker_binaries.get(filename)
+    if binary is None:
+        binary = _worker_binaries[filename] = SudokuBinary(filename)
+    return _worker_batch.solve_chunk(binary.boards(start, stop))
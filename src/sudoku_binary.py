@@ -0,0 +1,295 @@
+import os
+import mmap
+import struct
+import warnings
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_format import SudokuFormat, SudokuWriter
+from sudoku_grid import SudokuGrid
+
+
+# magic, version, record encoding, reserved and puzzle count
+HEADER = struct.Struct("<4sBBHQ")
+MAGIC = b"SDKB"
+VERSION = 1
+
+# record encodings, one byte per cell or two cells per byte
+RAW = 0
+PACKED = 1
+RECORD_SIZES = {RAW: 81, PACKED: 41}
+
+# the first and second cell held by each byte of a packed record,
+# so a record is unpacked with two translates instead of a loop
+HIGH_NIBBLES = bytes(byte >> 4 for byte in range(256))
+LOW_NIBBLES = bytes(byte & 15 for byte in range(256))
+
+# the numbers a cell may hold
+DIGITS = bytes(range(10))
+
+
+class SudokuBinary:
+    """
+    Handles a compact binary file of validated sudoku puzzles. A 16
+    byte header is followed by fixed width records of 81 bytes, one
+    digit per cell, or of 41 bytes packing two cells per byte. The file
+    is memory mapped, so records are decoded straight from the page
+    cache and worker processes can each map the same file and take
+    slices of it by index instead of receiving pickled puzzles
+    """
+
+    def __init__(self, filename):
+        """
+        Initialises the SudokuBinary by mapping the file and
+        checking its header
+
+        Parameters
+        ----------
+        filename : str
+            Path to a file written by SudokuBinary.write.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a binary puzzle file or is truncated.
+        """
+        self.filename = filename
+        self.records = None
+        with open(filename, "rb") as file:
+            if os.fstat(file.fileno()).st_size < HEADER.size:
+                raise ValueError("File is not a binary puzzle file")
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, encoding, _, count = HEADER.unpack_from(self.map)
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or encoding not in RECORD_SIZES
+        ):
+            self.close()
+            raise ValueError("File is not a binary puzzle file")
+
+        self.packed = encoding == PACKED
+        self.record_size = RECORD_SIZES[encoding]
+        self.count = count
+        if len(self.map) != HEADER.size + count * self.record_size:
+            self.close()
+            raise ValueError(
+                f"Binary puzzle file does not hold {count} puzzles"
+            )
+
+        self.records = memoryview(self.map)[HEADER.size :]
+
+    @staticmethod
+    def is_binary(filename):
+        """
+        Checks whether a file starts with the binary puzzle header
+
+        Parameters
+        ----------
+        filename : str
+            Path to the file, "-" for standard input is never binary.
+
+        Returns
+        -------
+        bool:
+            True if the file is a binary puzzle file
+        """
+        if filename == "-":
+            return False
+        with open(filename, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+
+    @staticmethod
+    def encode(board, packed=False):
+        """
+        Encodes a validated board as a record
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The validated sudoku board.
+        packed : bool
+            If True two cells are packed into each byte.
+
+        Returns
+        -------
+        bytes:
+            The record of the board
+        """
+        cells = [n for row in board for n in row]
+        if not packed:
+            return bytes(cells)
+        cells.append(0)
+        return bytes((cells[i] << 4) | cells[i + 1] for i in range(0, 82, 2))
+
+    def board(self, index):
+        """
+        Decodes the board of a record
+
+        Parameters
+        ----------
+        index : int
+            The index of the puzzle in the file.
+
+        Returns
+        -------
+        SudokuGrid:
+            The board as a grid over a copy of the record
+
+        Raises
+        ------
+        ValueError
+            If the record holds a number above 9.
+        """
+        offset = index * self.record_size
+        with self.records[offset : offset + self.record_size] as record:
+            if self.packed:
+                # the low half of the last byte is padding
+                packed = record.tobytes()
+                grid = SudokuGrid(bytes(81), 9)
+                grid.cells[0::2] = packed.translate(HIGH_NIBBLES)
+                grid.cells[1::2] = packed.translate(LOW_NIBBLES)[:40]
+            else:
+                grid = SudokuGrid(record, 9)
+
+        if grid.cells.translate(None, DIGITS):
+            raise ValueError(f"Record {index} is corrupt")
+        return grid
+
+    def boards(self, start=0, stop=None):
+        """
+        Yields the boards of a slice of the file
+
+        Parameters
+        ----------
+        start : int
+            The index of the first puzzle.
+        stop : int, optional
+            The index after the last puzzle, the end of the file if None.
+
+        Yields
+        ------
+        SudokuGrid:
+            The board of each puzzle
+        """
+        stop = self.count if stop is None else min(stop, self.count)
+        for index in range(start, stop):
+            yield self.board(index)
+
+    def close(self):
+        """
+        Releases the memory map of the file
+        """
+        if self.records is not None:
+            self.records.release()
+        self.map.close()
+
+    def __len__(self):
+        """
+        Returns the number of puzzles in the file
+        """
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def write(filename, boards, packed=False):
+        """
+        Writes validated boards to a binary puzzle file
+
+        Parameters
+        ----------
+        filename : str
+            Path to the binary file to write.
+        boards : iterable[list[list[int]]]
+            The validated sudoku boards.
+        packed : bool
+            If True records pack two cells per byte.
+
+        Returns
+        -------
+        int:
+            The number of puzzles written
+        """
+        encoding = PACKED if packed else RAW
+        count = 0
+        with open(filename, "wb") as file:
+            # the count is filled in once every record is written
+            file.write(HEADER.pack(MAGIC, VERSION, encoding, 0, 0))
+            for board in boards:
+                file.write(SudokuBinary.encode(board, packed))
+                count += 1
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, encoding, 0, count))
+        return count
+
+    @staticmethod
+    def from_text(text_filename, filename, packed=False):
+        """
+        Converts a text puzzle file read by SudokuReader into a binary
+        puzzle file. Only valid 9 x 9 puzzles can be stored, the others
+        are skipped
+
+        Parameters
+        ----------
+        text_filename : str
+            Path to the text puzzle file, or "-" for standard input.
+        filename : str
+            Path to the binary file to write.
+        packed : bool
+            If True records pack two cells per byte.
+
+        Returns
+        -------
+        tuple[int, int]:
+            The number of puzzles written and skipped
+        """
+        skipped = 0
+
+        def boards():
+            nonlocal skipped
+            sudoku = None
+            for _, line in SudokuReader.read_puzzles_from_file(text_filename):
+                rows = SudokuReader.parse_puzzle_line(line)
+                try:
+                    if sudoku is None:
+                        sudoku = SudokuBoard(rows)
+                    else:
+                        sudoku.load_board(rows)
+                except ValueError:
+                    skipped += 1
+                    continue
+                # records only hold 9 x 9 boards
+                if len(sudoku.board) != 9:
+                    skipped += 1
+                    continue
+                yield sudoku.board
+
+        with warnings.catch_warnings():
+            # boards with few clues are still stored
+            warnings.simplefilter("ignore")
+            count = SudokuBinary.write(filename, boards(), packed)
+        return count, skipped
+
+    def to_text(self, file, mode="line"):
+        """
+        Writes every puzzle of the file as text. The "line" and
+        "grid" modes are read back by SudokuReader
+
+        Parameters
+        ----------
+        file : file object
+            The text file to write to.
+        mode : str
+            The SudokuFormat output mode, grids are separated
+            by blank lines.
+        """
+        with SudokuWriter(file) as writer:
+            for board in self.boards():
+                writer.write(SudokuFormat(board).format(mode))
+                if mode == "grid":
+                    writer.write("\n")
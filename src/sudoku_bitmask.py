@@ -0,0 +1,539 @@
+import time
+from sudoku_algorithm import SudokuAlgorithm
+from sudoku_grid import SudokuGrid
+from sudoku_result import SudokuResult
+from sudoku_size import SudokuSize
+
+
+class SudokuBitmaskAlgorithm(SudokuAlgorithm):
+    """
+    Handles the solving process of the sudoku board via a backtracking
+    algorithm backed by row, column and square bitmasks. The masks
+    are updated incrementally on every placement and undo so the
+    minimum remaining values search never rescans a row, column or square.
+    Naked singles are placed before the search and after every guess,
+    and hidden singles are checked on top of them so failing branches
+    are pruned early. Hidden singles are only kept when they complete
+    the board, which leaves the branch order, and so the answer to a
+    board with several solutions, that of the plain MRV search. A mask
+    holds one bit per number, so the same state serves every board size
+    up to 25 x 25
+    """
+
+    # methods timed when the solver is profiled
+    PHASES = ("find_mrv_cell", "propagate")
+
+    def __init__(
+        self, board, propagate=True, profile=False, place_hidden=False
+    ):
+        """
+        Initialises the SudokuBitmaskAlgorithm with a given sudoku board
+        and builds the constraint masks from its starting values
+
+        Parameters
+        ----------
+        board : list[list[int]] or SudokuGrid
+            The current state of the sudoku board, a grid is
+            filled in once it is solved.
+        propagate : bool
+            If True singles are propagated before branching,
+            otherwise the plain MRV search is used.
+        profile : bool
+            If True the time spent finding MRV cells and
+            propagating is recorded in self.stats.
+        place_hidden : bool
+            If True hidden singles are placed like naked singles,
+            which visits fewer nodes but may answer a board with
+            several solutions with another of them.
+
+        """
+        super().__init__(board, profile)
+        self.propagate_singles = propagate
+        self.place_hidden = place_hidden
+
+        # cell or unit of the last contradiction found by propagation
+        self.contradiction = None
+
+        # forced moves of the starting values in the search in progress
+        self.trail = []
+
+        # bit n - 1 is set when digit n is used in the row, column or square
+        self.box = self.size.box
+        self.rows = [0] * self.size.side
+        self.cols = [0] * self.size.side
+        self.squares = [0] * self.size.side
+
+        if self.board is not None:
+            self.build_masks()
+
+    def load_board(self, board):
+        """
+        Replaces the board being solved and rebuilds the masks
+        so a single solver can be reused across many puzzles
+
+        Parameters
+        ----------
+        board : list[list[int]] or SudokuGrid
+            The current state of the sudoku board, a grid is
+            filled in once it is solved.
+
+        """
+        self.grid, self.board = SudokuGrid.unpack(board)
+        self.size = SudokuSize.of_board(board)
+        self.stack = None
+        self.trail = []
+        self.build_masks()
+
+    def build_masks(self):
+        """
+        Builds the row, column and square masks
+        from the current state of the sudoku board
+        """
+        side = self.size.side
+        self.box = self.size.box
+        self.rows = [0] * side
+        self.cols = [0] * side
+        self.squares = [0] * side
+
+        for x, y, square in self.size.cells:
+            n = self.board[y][x]
+            if n:
+                bit = 1 << (n - 1)
+                self.rows[y] |= bit
+                self.cols[x] |= bit
+                self.squares[square] |= bit
+
+    def place(self, x, y, n):
+        """
+        Places a number on the board and marks it as used
+        in the row, column and square masks
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+        n : int
+            Number to place in the grid square.
+        """
+        bit = 1 << (n - 1)
+        box = self.box
+        self.board[y][x] = n
+        self.rows[y] |= bit
+        self.cols[x] |= bit
+        self.squares[(y // box) * box + x // box] |= bit
+
+    def remove(self, x, y, n):
+        """
+        Removes a number from the board and releases it
+        in the row, column and square masks
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+        n : int
+            Number to remove from the grid square.
+        """
+        bit = ~(1 << (n - 1))
+        box = self.box
+        self.board[y][x] = 0
+        self.rows[y] &= bit
+        self.cols[x] &= bit
+        self.squares[(y // box) * box + x // box] &= bit
+
+    def candidates(self, x, y):
+        """
+        Returns the candidate mask of a grid square
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+
+        Returns
+        -------
+        int:
+            Bitmask where bit n - 1 is set if number n is allowed
+        """
+        square = (y // self.box) * self.box + x // self.box
+        used = self.rows[y] | self.cols[x] | self.squares[square]
+        return self.size.full_mask & ~used
+
+    def check_possible_indicies(self, x, y, n):
+        """
+        Checks if a certain indicies is possible
+        on a certain grid of the sudoku board
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+        n : int
+            Number to check in the grid square.
+
+        Returns
+        -------
+        bool:
+            True if number is allowed, False otherwise
+        """
+        if self.board is None:
+            return False
+
+        return bool(self.candidates(x, y) >> (n - 1) & 1)
+
+    def find_mrv_cell(self):
+        """
+        Finds the cells with the minimum remaining values (MRV)
+        and returns the cell with the least amount of possible values
+
+        Returns
+        -------
+        tuple:
+            The x and y coordinate of the cell with the least amount of
+            possible values or None if no cell exists
+        """
+        board = self.board
+        rows, cols, squares = self.rows, self.cols, self.squares
+        size = self.size
+        full_mask, popcount = size.full_mask, size.popcount
+
+        # initial mrv score greater than any possible score
+        mrv = size.side + 1
+        mrv_cell = None
+
+        # iterate through each empty cell in row-major order
+        for x, y, square in size.cells:
+            if board[y][x] == 0:
+                used = rows[y] | cols[x] | squares[square]
+                possible_values = popcount[full_mask & ~used]
+                if possible_values < mrv:
+                    mrv = possible_values
+                    mrv_cell = (x, y)
+                    # no cell can have fewer than zero candidates
+                    if mrv == 0:
+                        break
+
+        return mrv_cell
+
+    def propagate(self):
+        """
+        Places the moves forced by the board. Naked singles are placed
+        until none is left and hidden singles are then placed on top of
+        them to look for a contradiction. Unless place_hidden is set,
+        the hidden singles are undone again if they do not complete
+        the board, so the next branch is chosen as by the plain MRV
+        search
+
+        Returns
+        -------
+        tuple[bool, list[tuple[int, int, int]]]:
+            False if a contradiction was found, True otherwise, and the
+            (x, y, n) placements made so they can be undone. The cell
+            or unit of a contradiction is kept in self.contradiction
+        """
+        stats = self.stats
+        stats.propagations += 1
+        if self.place_hidden:
+            solvable, trail = self.place_forced(True)
+            stats.forced_moves += len(trail)
+            return solvable, trail
+
+        solvable, trail = self.place_forced(False)
+        if solvable:
+            # moves of the check are only counted if they are kept
+            counts = stats.naked_singles, stats.hidden_singles
+            solvable, check = self.place_forced(True)
+            if solvable and all(map(all, self.board)):
+                trail += check
+            else:
+                self.undo(check)
+                stats.naked_singles, stats.hidden_singles = counts
+        stats.forced_moves += len(trail)
+        return solvable, trail
+
+    def place_forced(self, hidden):
+        """
+        Repeatedly places naked singles (cells with one candidate) and,
+        if hidden is set, hidden singles (digits with one possible cell
+        in a row, column or square) until no forced move is left. A
+        digit with no possible cell in a unit is always a contradiction
+
+        Parameters
+        ----------
+        hidden : bool
+            If True hidden singles are placed as well.
+
+        Returns
+        -------
+        tuple[bool, list[tuple[int, int, int]]]:
+            False if a contradiction was found, True otherwise, and the
+            (x, y, n) placements made so they can be undone
+        """
+        board = self.board
+        rows, cols, squares = self.rows, self.cols, self.squares
+        full_mask = self.size.full_mask
+        stats = self.stats
+        trail = []
+        rounds = 0
+        changed = True
+
+        while changed:
+            changed = False
+            rounds += 1
+
+            # naked singles: empty cells with exactly one candidate
+            for x, y, square in self.size.cells:
+                if board[y][x] == 0:
+                    mask = full_mask & ~(rows[y] | cols[x] | squares[square])
+                    if mask == 0:
+                        stats.contradictions += 1
+                        self.contradiction = ("cell", x, y)
+                        return False, trail
+                    if mask & (mask - 1) == 0:
+                        n = mask.bit_length()
+                        self.place(x, y, n)
+                        trail.append((x, y, n))
+                        stats.naked_singles += 1
+                        changed = True
+
+            # hidden singles: digits with one possible cell in a unit
+            for kind, index, unit in self.size.units:
+                used = once = twice = 0
+                for x, y, square in unit:
+                    n = board[y][x]
+                    if n:
+                        used |= 1 << (n - 1)
+                    else:
+                        mask = full_mask & ~(
+                            rows[y] | cols[x] | squares[square]
+                        )
+                        twice |= once & mask
+                        once |= mask
+
+                # a missing digit with no possible cell is a contradiction
+                missing = full_mask & ~(used | once)
+                if missing:
+                    stats.contradictions += 1
+                    n = (missing & -missing).bit_length()
+                    self.contradiction = (kind, index, n)
+                    return False, trail
+
+                singles = once & ~twice if hidden else 0
+                while singles:
+                    bit = singles & -singles
+                    singles ^= bit
+                    n = bit.bit_length()
+                    for x, y, square in unit:
+                        # the cell may have been filled earlier this round
+                        if board[y][x] == 0 and not (
+                            (rows[y] | cols[x] | squares[square]) & bit
+                        ):
+                            self.place(x, y, n)
+                            trail.append((x, y, n))
+                            stats.hidden_singles += 1
+                            changed = True
+                            break
+
+        if rounds > stats.max_propagation_depth:
+            stats.max_propagation_depth = rounds
+        return True, trail
+
+    def undo(self, trail):
+        """
+        Removes the placements of a trail in reverse order
+
+        Parameters
+        ----------
+        trail : list[tuple[int, int, int]]
+            The (x, y, n) placements to undo.
+        """
+        for x, y, n in reversed(trail):
+            self.remove(x, y, n)
+
+    def start(self):
+        """
+        Starts a new search of the board by propagating the forced
+        moves of the starting values. A contradiction found before
+        the first branch names the cell or unit that makes the board
+        unsolvable and finishes the search at once
+
+        Returns
+        -------
+        SudokuResult or None:
+            The unsolvable result if propagation found a
+            contradiction, None otherwise
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to solve
+        """
+        super().start()
+        self.contradiction = None
+        self.trail = []
+
+        if not self.propagate_singles:
+            return None
+
+        # place every forced move before the first branch
+        start = time.perf_counter()
+        solvable, self.trail = self.propagate()
+        self.stats.solve_time = time.perf_counter() - start
+        if solvable:
+            return None
+
+        self.abandon()
+        self.result = self.contradiction_result()
+        return self.result
+
+    def abandon(self):
+        """
+        Stops the search in progress and removes its guesses and
+        forced moves, leaving the board as it was given
+        """
+        for x, y, _, n, trail in reversed(self.stack or ()):
+            self.undo(trail)
+            self.remove(x, y, n)
+        self.undo(self.trail)
+        self.trail = []
+        self.stack = None
+
+    def unsolvable_result(self):
+        """
+        Names the first branching cell once every guess has been
+        undone and then removes the forced moves of the starting values
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the cell
+        """
+        x, y = self.find_mrv_cell()
+        if self.candidates(x, y):
+            result = SudokuResult.exhausted(x, y)
+        else:
+            result = SudokuResult.empty_cell(x, y)
+
+        # leave an unsolvable board as it was given
+        self.undo(self.trail)
+        self.trail = []
+        return result
+
+    def contradiction_result(self):
+        """
+        Converts the last contradiction found by propagation
+        into an unsolvable result
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the cell or unit
+        """
+        if self.contradiction[0] == "cell":
+            _, x, y = self.contradiction
+            return SudokuResult.empty_cell(x, y)
+
+        kind, index, n = self.contradiction
+        return SudokuResult.missing_digit(kind, index, n)
+
+    def search(self, max_nodes=None, deadline=None):
+        """
+        Searches the board with the backtracking algorithm, trying the
+        candidates of the MRV cell in ascending order. The recursion is
+        replaced by an explicit stack of [x, y, mask, n, trail] frames:
+        the candidates left, the guess and the forced moves it led to,
+        so the search can stop at any node and continue from it on the
+        next call. After a solution the next call backtracks to look
+        for another one
+
+        Parameters
+        ----------
+        max_nodes : int, optional
+            The number of nodes after which the search pauses.
+        deadline : float, optional
+            The time.perf_counter value after which the search pauses.
+
+        Returns
+        -------
+        bool or None:
+            True if the board is solved, False if every guess
+            failed and None if the search was paused
+        """
+        stats = self.stats
+        stack = self.stack
+        propagate = self.propagate_singles
+        descending = self.descending
+        node_limit = None if max_nodes is None else stats.nodes + max_nodes
+        trail = ()
+
+        while True:
+            if descending:
+                # pause before visiting a node beyond the budget
+                if node_limit is not None and stats.nodes >= node_limit:
+                    self.descending = True
+                    return None
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self.descending = True
+                    return None
+
+                stats.nodes += 1
+                if len(stack) > stats.max_depth:
+                    stats.max_depth = len(stack)
+
+                # find the cell with the least amount of possible values
+                mrv_cell = self.find_mrv_cell()
+                if mrv_cell is None:
+                    self.descending = False
+                    return True
+
+                x, y = mrv_cell
+                frame = [x, y, self.candidates(x, y), 0, ()]
+                stack.append(frame)
+            else:
+                # check if board is unsovleable
+                if not stack:
+                    return False
+
+                # undo the guess of the deepest cell and its forced moves
+                frame = stack[-1]
+                x, y = frame[0], frame[1]
+                self.undo(frame[4])
+                self.remove(x, y, frame[3])
+                stats.backtracks += 1
+
+            # guess the remaining candidates from the lowest bit upwards
+            mask = frame[2]
+            descending = False
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                n = bit.bit_length()
+                self.place(x, y, n)
+                stats.guesses += 1
+
+                # place the moves forced by the guess before going deeper
+                if not propagate:
+                    descending = True
+                    break
+                solvable, trail = self.propagate()
+                if solvable:
+                    descending = True
+                    break
+                self.undo(trail)
+                self.remove(x, y, n)
+                stats.backtracks += 1
+
+            if descending:
+                frame[2] = mask
+                frame[3] = n
+                frame[4] = trail
+            else:
+                stack.pop()
@@ -1,10 +1,14 @@
 import warnings
+from sudoku_grid import SudokuGrid
+from sudoku_size import SIZES, SudokuSize
 
 
 class SudokuBoard:
     """
     Handles the validation process of the sudoku board
-    from a 2D list and converts the board to integers
+    from a 2D list and converts the board to integers.
+    Boards of 4 x 4, 9 x 9, 16 x 16 and 25 x 25 are accepted,
+    as well as a SudokuGrid whose cells are already numbers
     """
 
     def __init__(self, board):
@@ -15,7 +19,25 @@ class SudokuBoard:
 
         Parameters
         ----------
-        board : list[list[str]]
+        board : list[list[str]] or SudokuGrid
+            The current state of the sudoku board as a list of string lists.
+
+        Raises
+        ------
+        ValueError
+            If the conversion to integers fails or the board is not valid.
+
+        """
+        self.load_board(board)
+
+    def load_board(self, board):
+        """
+        Converts and validates a new board so a single
+        SudokuBoard can be reused across many puzzles
+
+        Parameters
+        ----------
+        board : list[list[str]] or SudokuGrid
             The current state of the sudoku board as a list of string lists.
 
         Raises
@@ -26,6 +48,12 @@ class SudokuBoard:
         """
         self.board = board
 
+        # the cells of a grid are numbers already
+        if isinstance(board, SudokuGrid):
+            if not self.validate_grid():
+                raise ValueError("Failed to validate board")
+            return
+
         if not self.convert_board_to_int():
             raise ValueError("Failed to convert board to integers")
 
@@ -52,6 +80,7 @@ class SudokuBoard:
 
         # initialise empty board
         converted_board = []
+        side = len(self.board)
 
         # iterate through each row with row_id
         for row_id, row in enumerate(self.board):
@@ -66,11 +95,14 @@ class SudokuBoard:
                     # convert value to int
                     int_value = int(value)
                 except ValueError:
+                    # boards above 9 x 9 may write 10 upwards as letters
+                    int_value = SudokuSize.symbol_value(value, side)
                     # if value is not int raise error
-                    raise ValueError(
-                        "Invalid character found at"
-                        f"({row_id}, {col_id}): {value}"
-                    )
+                    if int_value is None:
+                        raise ValueError(
+                            "Invalid character found at"
+                            f"({row_id}, {col_id}): {value}"
+                        )
 
                 converted_row.append(int_value)
             converted_board.append(converted_row)
@@ -83,13 +115,13 @@ class SudokuBoard:
         """
         Validates the sudoku board by:
             - Ensuring the board is initialised
-            - Checks the board size is 9x9
-            - Checks for invalid numbers outside of 0-9
-            - Detects duplicates in rows, columns and 3x3 squares
-            - Confirms each row and column is of 9
+            - Checks the board size is 4x4, 9x9, 16x16 or 25x25
+            - Checks for invalid numbers outside of 0 to the board side
+            - Detects duplicates in rows, columns and squares
+            - Confirms each row and column is of the board side
 
         Issues warnings:
-            - For boards with has less than 17 starting values
+            - For 9x9 boards with has less than 17 starting values
             - For empty boards
 
         Returns
@@ -101,29 +133,33 @@ class SudokuBoard:
         ------
         ValueError:
             If the board is not initialised
-            If the board size is not 9x9
-            If the board contains invalid numbers outside of 0-9
-            If the board contains duplicates in rows, columns or 3x3 squares
-            If the row or column length is not 9
+            If the board size is not 4x4, 9x9, 16x16 or 25x25
+            If the board contains invalid numbers outside of 0 to the side
+            If the board contains duplicates in rows, columns or squares
+            If the row or column length is not the board side
 
         Warnings
         --------
         UserWarning:
-            If the board has less than 17 starting values or is empty
+            If a 9x9 board has less than 17 starting values or is empty
 
         """
         # check for empty board
         if self.board is None:
             raise ValueError("Board is not initialised")
 
-        # validate board size
-        if len(self.board) != 9 or any(len(row) != 9 for row in self.board):
-            raise ValueError("Board size is not 9 x 9")
+        # validate board size, a board of any other height is not 9 x 9
+        side = len(self.board) if len(self.board) in SIZES else 9
+        if len(self.board) != side or any(
+            len(row) != side for row in self.board
+        ):
+            raise ValueError(f"Board size is not {side} x {side}")
+        box = SudokuSize.of(side).box
 
-        # Dictionaries to check for duplicates in rows, columns and 3x3 squares
-        rows = [set() for _ in range(9)]
-        cols = [set() for _ in range(9)]
-        squares = [set() for _ in range(9)]
+        # Dictionaries to check for duplicates in rows, columns and squares
+        rows = [set() for _ in range(side)]
+        cols = [set() for _ in range(side)]
+        squares = [set() for _ in range(side)]
 
         # iterate through each row with row_id
         for row_id, row in enumerate(self.board):
@@ -133,8 +169,8 @@ class SudokuBoard:
                 if value == 0:
                     continue
 
-                # validate numbers are between 0 and 9
-                if value < 0 or value > 9:
+                # validate numbers are between 0 and the board side
+                if value < 0 or value > side:
                     raise ValueError("Invalid number found in row")
 
                 # stores and checks for duplicates in rows
@@ -151,39 +187,103 @@ class SudokuBoard:
                     )
                 cols[col_id].add(value)
 
-                # stores and checks for duplicates in 3x3 square
-                square_id = (row_id // 3) * 3 + col_id // 3
+                # stores and checks for duplicates in square
+                square_id = (row_id // box) * box + col_id // box
                 if value in squares[square_id]:
                     raise ValueError(
-                        f"Duplicate number found in 3x3 square: {square_id}"
+                        f"Duplicate number found in {box}x{box} square: "
+                        f"{square_id}"
                     )
                 squares[square_id].add(value)
 
         # check row and col length
         for row in self.board:
-            if len(row) != 9:
+            if len(row) != side:
                 raise ValueError(
                     f"Row length error row {row} has {len(row)} columns"
                 )
 
-        for col_id in range(9):
-            if len([self.board[row_id][col_id] for row_id in range(9)]) != 9:
-                col_len = len(
-                    [self.board[row_id][col_id] for row_id in range(9)]
-                )
+        for col_id in range(side):
+            column = [self.board[row_id][col_id] for row_id in range(side)]
+            if len(column) != side:
+                col_len = len(column)
                 raise ValueError(
                     f"Column length error column {col_id} has {col_len} rows"
                 )
 
-        # warning if board has less than 17 starting values
+        # warning if a 9 x 9 board has less than 17 starting values
         non_zero_count = sum(len(row_len) for row_len in rows)
-        if non_zero_count < 17:
+        self.warn_clues(side, non_zero_count)
+
+        # return True if board is valid
+        return True
+
+    def validate_grid(self):
+        """
+        Validates a SudokuGrid board. Every number is seen once in
+        its row, column and square unless one repeats, so the count
+        of distinct numbers of all units against three times the
+        clues finds duplicates without a loop over the cells. A grid
+        that fails is checked again as rows by validate_board for
+        the same message
+
+        Returns
+        -------
+        bool:
+            True if the board is valid
+
+        Raises
+        ------
+        ValueError:
+            If the board contains numbers outside of 0 to the side
+            or duplicates in rows, columns or squares
+
+        Warnings
+        --------
+        UserWarning:
+            If a 9x9 board has less than 17 starting values or is empty
+        """
+        grid = self.board
+        cells = grid.cells
+        clues = grid.clues()
+        units = [unit(cells) for unit in SudokuSize.of(grid.side).unit_getters]
+
+        # the blank square of a unit counts once among its numbers
+        distinct = sum(map(len, map(set, units)))
+        distinct -= sum([0 in unit for unit in units])
+
+        if max(cells) > grid.side or distinct != 3 * clues:
+            # the row by row check names the first problem found
+            self.board = grid.to_rows()
+            try:
+                self.validate_board()
+            finally:
+                self.board = grid
+
+        self.warn_clues(grid.side, clues)
+        return True
+
+    @staticmethod
+    def warn_clues(side, count):
+        """
+        Warns about boards with too few starting values
+
+        Parameters
+        ----------
+        side : int
+            The side of the board.
+        count : int
+            The number of starting values.
+
+        Warnings
+        --------
+        UserWarning:
+            If a 9x9 board has less than 17 starting values or is empty
+        """
+        if side == 9 and count < 17:
             warnings.warn(
                 "Warning: Board has less than 17 starting values. "
                 "May have multiple solutions."
             )
-        if non_zero_count == 0:
+        if count == 0:
             warnings.warn("Warning: Board is empty")
-
-        # return True if board is valid
-        return True
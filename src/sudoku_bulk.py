@@ -0,0 +1,266 @@
+import re
+import warnings
+import numpy as np
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_grid import SudokuGrid
+
+
+# bytes of the digits and of "." written for a blank square
+ZERO = ord("0")
+NINE = ord("9")
+DOT = ord(".")
+
+# spaces or commas that split a line into cells wider than a character
+SEPARATOR = re.compile(rb"[\s,]")
+
+
+class SudokuBulk:
+    """
+    Handles the parsing and validation of a whole file of one line
+    puzzles at once. The puzzles are held in an (N, 9, 9) uint8 array
+    and invalid characters, bad sizes and duplicates in rows, columns
+    and 3x3 squares are found with array operations over chunks of
+    puzzles. Each rejected puzzle reports the same error message as
+    SudokuBoard would for it
+    """
+
+    # puzzles validated at a time, bounding the temporary arrays
+    CHUNK_SIZE = 65536
+
+    def __init__(self, lines, chunk_size=CHUNK_SIZE):
+        """
+        Initialises the SudokuBulk by parsing and validating the
+        puzzles of the given lines. Blank lines and lines starting
+        with "#" are skipped as in SudokuReader.read_puzzles_from_file
+
+        Parameters
+        ----------
+        lines : iterable[bytes]
+            The lines of a file holding one puzzle per line.
+        chunk_size : int
+            The number of puzzles validated at a time.
+
+        Raises
+        ------
+        ValueError
+            If the chunk size is below one.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+        self.line_numbers = []
+        puzzles = []
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+
+            # skip blank lines and comments
+            if not line or line.startswith(b"#"):
+                continue
+
+            self.line_numbers.append(line_number)
+            puzzles.append(line)
+
+        self.boards = np.zeros((len(puzzles), 9, 9), dtype=np.uint8)
+
+        # puzzle text and error message by index of each rejected puzzle
+        self.errors = {}
+
+        for start in range(0, len(puzzles), chunk_size):
+            self.validate_chunk(puzzles[start : start + chunk_size], start)
+
+    @classmethod
+    def read_file(cls, filename, chunk_size=CHUNK_SIZE):
+        """
+        Reads and validates every puzzle of a file in a single pass
+
+        Parameters
+        ----------
+        filename : str
+            Path to the text file containing one puzzle per line,
+            which may be compressed, or "-" for standard input.
+        chunk_size : int
+            The number of puzzles validated at a time.
+
+        Returns
+        -------
+        SudokuBulk:
+            The parsed puzzles of the file
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file is not found.
+        """
+        with SudokuReader.open_puzzle_file(filename) as file:
+            data = file.read()
+        return cls(data.splitlines(), chunk_size)
+
+    def validate_chunk(self, puzzles, start):
+        """
+        Validates a chunk of puzzle lines and stores the boards of
+        the valid puzzles and the errors of the rejected ones
+
+        Parameters
+        ----------
+        puzzles : list[bytes]
+            The stripped puzzle lines of the chunk.
+        start : int
+            The index of the first puzzle of the chunk.
+        """
+        # lines of 81 ascii characters are validated as one array,
+        # any other line is already rejected by its size
+        full = []
+        for i, puzzle in enumerate(puzzles):
+            if (
+                len(puzzle) == 81
+                and puzzle.isascii()
+                and not SEPARATOR.search(puzzle)
+            ):
+                full.append(i)
+            else:
+                self.reject_line(puzzle, start + i)
+        if not full:
+            return
+
+        cells = np.frombuffer(
+            b"".join(puzzles[i] for i in full), dtype=np.uint8
+        ).reshape(-1, 81)
+        cells = np.where(cells == DOT, ZERO, cells)
+
+        # characters that int() does not accept
+        invalid = (cells < ZERO) | (cells > NINE)
+        bad_cells = invalid.any(axis=1)
+        first_invalid = invalid.argmax(axis=1)
+
+        values = np.where(invalid, ZERO, cells) - ZERO
+        boards = values.astype(np.uint8).reshape(-1, 9, 9)
+        duplicates = self.duplicates(boards)
+        bad_duplicates = duplicates.any(axis=(1, 2, 3))
+        first_duplicate = duplicates.any(axis=1).reshape(-1, 81).argmax(1)
+
+        index = np.asarray(full) + start
+        self.boards[index] = boards
+
+        for i in np.flatnonzero(bad_cells | bad_duplicates):
+            puzzle = puzzles[full[i]].decode("ascii")
+            if bad_cells[i]:
+                cell = int(first_invalid[i])
+                message = (
+                    "Invalid character found at"
+                    f"({cell // 9}, {cell % 9}): {puzzle[cell]}"
+                )
+            else:
+                y, x = divmod(int(first_duplicate[i]), 9)
+                if duplicates[i, 0, y, x]:
+                    message = f"Duplicate number found in row: {y}"
+                elif duplicates[i, 1, y, x]:
+                    message = f"Duplicate number found in column: {x}"
+                else:
+                    square = (y // 3) * 3 + x // 3
+                    message = f"Duplicate number found in 3x3 square: {square}"
+
+            self.boards[index[i]] = 0
+            self.errors[int(index[i])] = (puzzle, message)
+
+    @staticmethod
+    def duplicates(boards):
+        """
+        Finds the cells holding a digit already seen earlier in their
+        row, column or 3x3 square, in the row by row order in which
+        SudokuBoard.validate_board checks the cells
+
+        Parameters
+        ----------
+        boards : numpy.ndarray
+            The (N, 9, 9) digits of the boards, 0 for a blank square.
+
+        Returns
+        -------
+        numpy.ndarray:
+            The (N, 3, 9, 9) flags of repeated digits
+            by row, by column and by 3x3 square
+        """
+        digits = boards.astype(np.uint16)
+        bits = np.where(digits > 0, np.left_shift(np.uint16(1), digits), 0)
+        bits = bits.astype(np.uint16)
+
+        def seen(grid, axis):
+            # digits of the earlier cells along the axis
+            before = np.bitwise_or.accumulate(grid, axis=axis)
+            before = np.roll(before, 1, axis=axis)
+            index = [slice(None)] * grid.ndim
+            index[axis] = 0
+            before[tuple(index)] = 0
+            return (before & grid) != 0
+
+        # cells of each square in row by row order
+        squares = bits.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4)
+        squares = squares.reshape(-1, 9, 9)
+        in_square = seen(squares, 2).reshape(-1, 3, 3, 3, 3)
+        in_square = in_square.transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9)
+
+        return np.stack([seen(bits, 2), seen(bits, 1), in_square], axis=1)
+
+    def reject_line(self, puzzle, index):
+        """
+        Records the error SudokuBoard reports for a line that is not
+        81 ascii characters long or is split into cells by spaces or
+        commas. Lines of other characters are decoded and checked by
+        SudokuBoard itself. Valid boards of another size than 9 x 9
+        are rejected as the array only holds 9 x 9 boards
+
+        Parameters
+        ----------
+        puzzle : bytes
+            The stripped puzzle line.
+        index : int
+            The index of the puzzle.
+        """
+        text = puzzle.decode("utf-8", "replace")
+        rows = SudokuReader.parse_puzzle_line(text)
+        try:
+            with warnings.catch_warnings():
+                # boards with few clues are expected in bulk input
+                warnings.simplefilter("ignore")
+                board = SudokuBoard(rows).board
+        except ValueError as error:
+            self.errors[index] = (text, str(error))
+        else:
+            if len(board) != 9:
+                self.errors[index] = (
+                    text,
+                    f"Board size {len(board)} x {len(board)} "
+                    "is not supported by bulk validation",
+                )
+            else:
+                # digits int() accepts outside of ascii
+                self.boards[index] = board
+
+    @property
+    def valid(self):
+        """
+        numpy.ndarray: The flag of each puzzle that passed validation
+        """
+        valid = np.ones(len(self.boards), dtype=bool)
+        valid[list(self.errors)] = False
+        return valid
+
+    def valid_boards(self):
+        """
+        Yields the board of every valid puzzle in input order
+
+        Yields
+        ------
+        SudokuGrid:
+            The validated board as a new grid, sent to the worker
+            processes as 81 bytes rather than a list of lists
+        """
+        for index in np.flatnonzero(self.valid):
+            yield SudokuGrid(self.boards[index].tobytes(), 9)
+
+    def __len__(self):
+        """
+        Returns the number of puzzles read
+        """
+        return len(self.boards)
@@ -0,0 +1,491 @@
+import threading
+from collections import OrderedDict
+from itertools import islice, permutations, product
+
+
+# number of solutions held in memory unless configured otherwise
+DEFAULT_CACHE_SIZE = 1024
+
+# start of each row in a board written as a single line of 81 digits
+ROWS = range(0, 81, 9)
+
+
+class SudokuCache:
+    """
+    Handles a bounded cache of solved sudoku boards. Boards are keyed
+    by a canonical form that is the same for every relabeling of the
+    digits, permutation of rows within bands, of bands, of columns
+    within stacks and of stacks, and transposition, which together
+    cover rotations and reflections. A cached solution is mapped back
+    to the orientation and digits of each caller. The least recently
+    used entry is evicted once the cache is full. Only 9 x 9 boards
+    are cached, boards of the other sizes are always a miss
+    """
+
+    # orders of the rows or columns tried when their invariants tie
+    MAX_ORDERS = 6
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, store=None):
+        """
+        Initialises an empty SudokuCache
+
+        Parameters
+        ----------
+        maxsize : int
+            The number of solutions kept before the least
+            recently used one is evicted.
+        store : SudokuStore, optional
+            Persistent store looked up when a board is not held in
+            memory and written to with every new solution.
+
+        Raises
+        ------
+        ValueError
+            If maxsize is below one.
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+
+        self.maxsize = maxsize
+        self.store = store
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+        # the web app shares one cache between request threads
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def line_keys(grid):
+        """
+        Computes an invariant of every row of a grid that does not
+        change when digits are relabeled or rows and columns are
+        permuted within the sudoku structure
+
+        Parameters
+        ----------
+        grid : list[list[int]]
+            The sudoku board.
+
+        Returns
+        -------
+        list[tuple]:
+            The clue count of each row, its clue counts per stack and
+            the clue counts of the columns its clues are in
+        """
+        column_counts = [sum(1 for row in grid if row[x]) for x in range(9)]
+        keys = []
+        for row in grid:
+            stacks = sorted(
+                sum(1 for n in row[x : x + 3] if n) for x in (0, 3, 6)
+            )
+            columns = sorted(column_counts[x] for x in range(9) if row[x])
+            keys.append((len(columns), tuple(stacks), tuple(columns)))
+        return keys
+
+    @staticmethod
+    def tied_orders(items, key):
+        """
+        Sorts items by key and returns every order of the items that
+        only differs within runs of equal keys. Runs of empty rows or
+        bands are kept in one order as swapping them changes nothing
+
+        Parameters
+        ----------
+        items : list
+            The row or band indices to order.
+        key : callable
+            Returns the sort key of an item and whether it is empty.
+
+        Returns
+        -------
+        list[tuple]:
+            The candidate orders of the items
+        """
+        ordered = sorted(items, key=lambda item: key(item)[0])
+        runs = []
+        for item in ordered:
+            if runs and key(runs[-1][0]) == key(item):
+                runs[-1].append(item)
+            else:
+                runs.append([item])
+
+        choices = [
+            [tuple(run)] if key(run[0])[1] else list(permutations(run))
+            for run in runs
+        ]
+        return [
+            tuple(item for run in choice for item in run)
+            for choice in product(*choices)
+        ]
+
+    @staticmethod
+    def line_orders(grid):
+        """
+        Yields the candidate orders of the rows of a grid, with bands
+        and the rows within each band sorted by their invariants
+
+        Parameters
+        ----------
+        grid : list[list[int]]
+            The sudoku board.
+
+        Yields
+        ------
+        tuple[int]:
+            The row indices in canonical order
+        """
+        keys = SudokuCache.line_keys(grid)
+
+        def row_key(y):
+            return keys[y], keys[y][0] == 0
+
+        def band_key(band):
+            rows = sorted(keys[band * 3 : band * 3 + 3])
+            return rows, all(row[0] == 0 for row in rows)
+
+        band_orders = SudokuCache.tied_orders(range(3), band_key)
+        row_orders = [
+            SudokuCache.tied_orders(range(band * 3, band * 3 + 3), row_key)
+            for band in range(3)
+        ]
+        for bands in band_orders:
+            for rows in product(*(row_orders[band] for band in bands)):
+                yield tuple(y for band in rows for y in band)
+
+    @staticmethod
+    def canonical_form(board):
+        """
+        Finds the canonical form of a board, the smallest relabeled
+        grid over both orientations and the candidate row and column
+        orders. Equivalent boards share a canonical form unless their
+        invariants tie more often than MAX_ORDERS allows
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The sudoku board.
+
+        Returns
+        -------
+        tuple[str, tuple]:
+            The canonical form as 81 digits and the transform
+            (transposed, rows, columns, labels) that produced it
+        """
+        best = None
+        transposed_board = [list(column) for column in zip(*board)]
+        for transposed, grid in ((False, board), (True, transposed_board)):
+            columns_grid = board if transposed else transposed_board
+            row_orders = list(
+                islice(SudokuCache.line_orders(grid), SudokuCache.MAX_ORDERS)
+            )
+            column_orders = list(
+                islice(
+                    SudokuCache.line_orders(columns_grid),
+                    SudokuCache.MAX_ORDERS,
+                )
+            )
+
+            for rows in row_orders:
+                for columns in column_orders:
+                    # relabel digits in order of first appearance
+                    labels = {0: 0}
+                    cells = []
+                    for y in rows:
+                        row = grid[y]
+                        for x in columns:
+                            n = row[x]
+                            label = labels.get(n)
+                            if label is None:
+                                label = labels[n] = len(labels)
+                            cells.append(label)
+
+                    form = bytes(cells)
+                    if best is None or form < best[0]:
+                        best = (form, (transposed, rows, columns, labels))
+
+        form, (transposed, rows, columns, labels) = best
+
+        # digits missing from the board take the remaining labels
+        for n in range(1, 10):
+            if n not in labels:
+                labels[n] = len(labels)
+
+        key = "".join(str(label) for label in form)
+        return key, (transposed, rows, columns, labels)
+
+    @staticmethod
+    def apply(board, transform):
+        """
+        Converts a board to the canonical orientation and digits
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The board in the orientation of the caller.
+        transform : tuple
+            The transform returned by canonical_form.
+
+        Returns
+        -------
+        list[list[int]]:
+            The board in canonical orientation and digits
+        """
+        transposed, rows, columns, labels = transform
+        if transposed:
+            board = [list(column) for column in zip(*board)]
+        return [[labels[board[y][x]] for x in columns] for y in rows]
+
+    @staticmethod
+    def invert(board, transform):
+        """
+        Converts a canonical board back to the orientation
+        and digits of the caller
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The board in canonical orientation and digits.
+        transform : tuple
+            The transform returned by canonical_form.
+
+        Returns
+        -------
+        list[list[int]]:
+            The board in the orientation of the caller
+        """
+        transposed, rows, columns, labels = transform
+        digits = {label: n for n, label in labels.items()}
+        grid = [[0] * 9 for _ in range(9)]
+        for i, y in enumerate(rows):
+            for j, x in enumerate(columns):
+                grid[y][x] = digits[board[i][j]]
+        if transposed:
+            grid = [list(column) for column in zip(*grid)]
+        return grid
+
+    def get(self, board):
+        """
+        Looks up the solution of a board, first in memory and then in
+        the persistent store, and counts the hit or miss
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The unsolved sudoku board.
+
+        Returns
+        -------
+        list[list[int]] or None:
+            The solution in the orientation of the board,
+            None if it is not cached
+        """
+        # only 9 x 9 boards have a canonical form
+        if len(board) != 9:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        key, transform = self.canonical_form(board)
+        with self.lock:
+            solution = self.entries.get(key)
+            if solution is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+
+        if solution is None and self.store is not None:
+            solution = self.store.get(key)
+            if solution is not None:
+                with self.lock:
+                    self.store_hits += 1
+                    self.hits += 1
+                    self.remember(key, solution)
+
+        if solution is None:
+            with self.lock:
+                self.misses += 1
+            return None
+
+        grid = [[int(n) for n in solution[i : i + 9]] for i in ROWS]
+        return self.invert(grid, transform)
+
+    def entry(self, board, solution):
+        """
+        Converts a board and its solution into a cache entry
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The unsolved sudoku board.
+        solution : list[list[int]]
+            The solved sudoku board.
+
+        Returns
+        -------
+        tuple[str, str]:
+            The canonical form of the board and the
+            solution in canonical orientation and digits
+        """
+        key, transform = self.canonical_form(board)
+        canonical = self.apply(solution, transform)
+        return key, "".join(str(n) for row in canonical for n in row)
+
+    def remember(self, key, solution):
+        """
+        Adds an entry in memory, evicting the least recently used
+        entry if the cache is full. The caller holds the lock
+        """
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def put(self, board, solution):
+        """
+        Stores the solution of a board in memory
+        and in the persistent store if there is one
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The unsolved sudoku board.
+        solution : list[list[int]]
+            The solved sudoku board.
+        """
+        if len(board) != 9:
+            return
+
+        key, value = self.entry(board, solution)
+        with self.lock:
+            self.remember(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def warm_start(self, filename):
+        """
+        Loads the solved puzzles of the output of a previous batch run,
+        one tab separated puzzle, status and solution per line. The
+        solutions go to the persistent store if there is one, otherwise
+        the most recent ones are kept in memory. Lines that do not
+        parse and solutions that are not a valid board keeping the
+        clues of their puzzle are skipped
+
+        Parameters
+        ----------
+        filename : str
+            Path to the output of a batch run.
+
+        Returns
+        -------
+        int:
+            The number of solutions loaded
+        """
+
+        count = 0
+
+        def entries():
+            nonlocal count
+            with open(filename, "r") as file:
+                for line in file:
+                    fields = line.rstrip("\n").split("\t")
+                    if len(fields) < 3 or fields[1] != "solved":
+                        continue
+
+                    puzzle, solution = fields[0], fields[2]
+                    if len(puzzle) != 81 or len(solution) != 81:
+                        continue
+
+                    try:
+                        board = [
+                            [int(n) for n in puzzle[i : i + 9]] for i in ROWS
+                        ]
+                        solved = [
+                            [int(n) for n in solution[i : i + 9]] for i in ROWS
+                        ]
+                    except ValueError:
+                        continue
+                    if not self.is_solution(board, solved):
+                        continue
+
+                    count += 1
+                    yield self.entry(board, solved)
+
+        if self.store is not None:
+            # a single transaction streamed into the store
+            self.store.put_many(entries())
+            return count
+
+        for key, value in entries():
+            with self.lock:
+                self.remember(key, value)
+        return count
+
+    @staticmethod
+    def is_solution(board, solution):
+        """
+        Checks that a solution is a complete board with every number
+        once in each row, column and square that keeps the clues of
+        the board
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The unsolved sudoku board.
+        solution : list[list[int]]
+            The solved sudoku board.
+
+        Returns
+        -------
+        bool:
+            True if the solution solves the board
+        """
+        numbers = set(range(1, 10))
+        squares = [
+            [
+                solution[y][x]
+                for y in range(y0, y0 + 3)
+                for x in range(x0, x0 + 3)
+            ]
+            for y0 in (0, 3, 6)
+            for x0 in (0, 3, 6)
+        ]
+        for unit in solution + list(zip(*solution)) + squares:
+            if set(unit) != numbers:
+                return False
+
+        return all(
+            n == 0 or n == solved
+            for row, solved_row in zip(board, solution)
+            for n, solved in zip(row, solved_row)
+        )
+
+    def clear(self):
+        """
+        Removes every entry held in memory and resets the counters
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.store_hits = 0
+            self.misses = 0
+
+    def to_dict(self):
+        """
+        Converts the counters to a dictionary for JSON output
+
+        Returns
+        -------
+        dict:
+            The hits, of which store hits, misses, hit rate,
+            entries in memory and maximum size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "maxsize": self.maxsize,
+        }
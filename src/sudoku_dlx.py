@@ -0,0 +1,636 @@
+import time
+from sudoku_grid import SudokuGrid
+from sudoku_result import SudokuResult
+from sudoku_stats import SudokuStats
+from sudoku_size import SudokuSize
+
+
+# unit name of each block of constraint columns after the cells
+UNIT_KINDS = ("row", "column", "square")
+
+
+class SudokuDLX:
+    """
+    Handles the solving process of the sudoku board as an exact cover
+    problem with Knuth's Algorithm X on a dancing links matrix. Each
+    of the 729 matrix rows places one digit in one cell and covers four
+    of the 324 constraint columns: the cell, and the digit in its row,
+    column and 3x3 square. Other board sizes have a row per number of
+    every cell and four columns per cell in the same way. The matrix
+    is built once and restored after every solve so a single instance
+    can be reused across many puzzles of the same size
+    """
+
+    # methods timed when the solver is profiled
+    PHASES = ("choose_column", "cover", "uncover")
+
+    def __init__(self, board, profile=False):
+        """
+        Initialises the SudokuDLX with a given sudoku board
+        and builds the dancing links matrix
+
+        Parameters
+        ----------
+        board : list[list[int]] or SudokuGrid
+            The current state of the sudoku board, a grid is
+            filled in once it is solved.
+        profile : bool
+            If True the time spent choosing, covering and
+            uncovering columns is recorded in self.stats.
+
+        """
+        # a grid is searched as a list of its rows
+        self.grid, self.board = SudokuGrid.unpack(board)
+        self.result = None
+        self.stats = SudokuStats()
+        self.size = SudokuSize.of(9)
+        if board is not None:
+            self.size = SudokuSize.of_board(board)
+        self.build_matrix()
+
+        # frames of the search in progress, None if there is none
+        self.stack = None
+        self.descending = True
+        self.covered = []
+
+        # first solution found by the last count of solutions
+        self.first_solution = None
+
+        if profile:
+            SudokuStats.profile(self, self.PHASES)
+
+    def load_board(self, board):
+        """
+        Replaces the board being solved so a single
+        solver can be reused across many puzzles
+
+        Parameters
+        ----------
+        board : list[list[int]] or SudokuGrid
+            The current state of the sudoku board, a grid is
+            filled in once it is solved.
+
+        """
+        if self.stack is not None:
+            self.abandon()
+        self.grid, self.board = SudokuGrid.unpack(board)
+
+        # a board of another size needs a matrix of its own
+        size = SudokuSize.of_board(board)
+        if size is not self.size:
+            self.size = size
+            self.build_matrix()
+
+    def build_matrix(self):
+        """
+        Builds the dancing links matrix as flat lists of left, right,
+        up and down links. Node 0 is the root, nodes 1 to 324 are the
+        column headers of a 9 x 9 board and each matrix row adds four
+        linked nodes
+        """
+        side = self.size.side
+        box = self.size.box
+        cells = side * side
+        columns_count = 4 * cells
+        headers = columns_count + 1
+        self.L = [i - 1 for i in range(headers)]
+        self.R = [i + 1 for i in range(headers)]
+        self.L[0] = columns_count
+        self.R[columns_count] = 0
+        self.U = list(range(headers))
+        self.D = list(range(headers))
+        self.C = list(range(headers))
+        self.S = [0] * headers
+        self.ROW = [-1] * headers
+
+        # first node of each matrix row, indexed by
+        # (y * side + x) * side + n - 1
+        self.row_nodes = []
+
+        for y in range(side):
+            for x in range(side):
+                square = (y // box) * box + x // box
+                for n in range(side):
+                    columns = (
+                        1 + y * side + x,
+                        1 + cells + y * side + n,
+                        1 + 2 * cells + x * side + n,
+                        1 + 3 * cells + square * side + n,
+                    )
+                    self.add_row(len(self.row_nodes), columns)
+
+    def add_row(self, row, columns):
+        """
+        Appends a matrix row with one node in each of the given columns
+
+        Parameters
+        ----------
+        row : int
+            The matrix row index.
+        columns : tuple[int]
+            The header node of each column covered by the row.
+        """
+        L, R, U, D, C = self.L, self.R, self.U, self.D, self.C
+        first = len(L)
+        self.row_nodes.append(first)
+
+        for k, column in enumerate(columns):
+            node = first + k
+            # link the node horizontally into a circular list
+            L.append(first + (k - 1) % len(columns))
+            R.append(first + (k + 1) % len(columns))
+            # link the node to the bottom of its column
+            U.append(U[column])
+            D.append(column)
+            D[U[column]] = node
+            U[column] = node
+            C.append(column)
+            self.ROW.append(row)
+            self.S[column] += 1
+
+    def cover(self, column):
+        """
+        Removes a column header and every row that
+        intersects the column from the matrix
+
+        Parameters
+        ----------
+        column : int
+            The header node of the column.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[column]] = R[column]
+        L[R[column]] = L[column]
+        i = D[column]
+        while i != column:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def uncover(self, column):
+        """
+        Restores a column removed by cover, in the reverse order
+
+        Parameters
+        ----------
+        column : int
+            The header node of the column.
+        """
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[column]
+        while i != column:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[column]] = column
+        L[R[column]] = column
+
+    def choose_column(self):
+        """
+        Chooses the column with the fewest remaining rows,
+        the exact cover equivalent of the MRV cell
+
+        Returns
+        -------
+        int:
+            The header node of the column or 0 if every column is covered
+        """
+        R, S = self.R, self.S
+        best = 0
+        best_size = self.size.side + 1
+        column = R[0]
+        while column != 0:
+            if S[column] < best_size:
+                best = column
+                best_size = S[column]
+                if best_size <= 1:
+                    break
+            column = R[column]
+        return best
+
+    def search(self, max_nodes=None, deadline=None):
+        """
+        Searches for an exact cover. The recursion is replaced by an
+        explicit stack of [column, row] frames, the column covered and
+        the matrix row chosen for it, so the search can stop at any node
+        and continue from it on the next call. After a solution, kept
+        in self.solution, the next call backtracks to look for another
+
+        Parameters
+        ----------
+        max_nodes : int, optional
+            The number of nodes after which the search pauses.
+        deadline : float, optional
+            The time.perf_counter value after which the search pauses.
+
+        Returns
+        -------
+        bool or None:
+            True if an exact cover was found, False if every row
+            failed and None if the search was paused
+        """
+        R, L, D, C, S = self.R, self.L, self.D, self.C, self.S
+        stats = self.stats
+        stack = self.stack
+        partial = self.partial
+        descending = self.descending
+        node_limit = None if max_nodes is None else stats.nodes + max_nodes
+
+        while True:
+            if descending:
+                # pause before visiting a node beyond the budget
+                if node_limit is not None and stats.nodes >= node_limit:
+                    self.descending = True
+                    return None
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self.descending = True
+                    return None
+
+                stats.nodes += 1
+                if len(stack) > stats.max_depth:
+                    stats.max_depth = len(stack)
+
+                if R[0] == 0:
+                    self.solution = list(partial)
+                    self.descending = False
+                    return True
+
+                column = self.choose_column()
+                if not stack:
+                    self.first_column = (column, S[column])
+                if S[column] == 0:
+                    descending = False
+                    continue
+
+                self.cover(column)
+                frame = [column, column]
+                stack.append(frame)
+            else:
+                if not stack:
+                    return False
+
+                # undo the row chosen for the deepest column
+                frame = stack[-1]
+                row = frame[1]
+                j = L[row]
+                while j != row:
+                    self.uncover(C[j])
+                    j = L[j]
+                partial.pop()
+                stats.backtracks += 1
+
+            # choose the next row of the deepest column
+            column = frame[0]
+            row = D[frame[1]]
+            if row == column:
+                self.uncover(column)
+                stack.pop()
+                descending = False
+                continue
+
+            stats.guesses += 1
+            partial.append(self.ROW[row])
+            j = R[row]
+            while j != row:
+                self.cover(C[j])
+                j = R[j]
+            frame[1] = row
+            descending = True
+
+    def start(self):
+        """
+        Starts a new search by covering the columns of every
+        starting value. Any search in progress is abandoned first
+
+        Returns
+        -------
+        SudokuResult or None:
+            An unsolvable result if two starting values conflict,
+            None otherwise
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to solve
+        """
+        if self.board is None:
+            raise ValueError("No board found")
+
+        if self.stack is not None:
+            self.abandon()
+
+        self.stats = SudokuStats()
+        start = time.perf_counter()
+        self.result = None
+        self.solution = None
+        self.partial = []
+        self.first_column = None
+        self.stack = []
+        self.descending = True
+
+        # cover the columns of every starting value
+        self.covered = []
+        side = self.size.side
+        active = [True] * len(self.S)
+        for y in range(side):
+            for x in range(side):
+                n = self.board[y][x]
+                if n == 0:
+                    continue
+                node = self.row_nodes[(y * side + x) * side + n - 1]
+                columns = [node + k for k in range(4)]
+                if not all(active[self.C[j]] for j in columns):
+                    self.abandon()
+                    self.result = SudokuResult.conflicting_clue(x, y, n)
+                    return self.result
+                for j in columns:
+                    active[self.C[j]] = False
+                    self.cover(self.C[j])
+                    self.covered.append(self.C[j])
+
+        self.stats.solve_time = time.perf_counter() - start
+        return None
+
+    def resume(self, max_nodes=None, timeout=None):
+        """
+        Continues the search started by start until the board is
+        solved, proven unsolvable or the budget runs out. A search
+        that ran out of budget is paused and continues from the same
+        node on the next call. Once the search finishes the matrix is
+        restored and the result is stored in self.result
+
+        Parameters
+        ----------
+        max_nodes : int, optional
+            The number of search nodes this call may visit.
+        timeout : float, optional
+            The number of seconds this call may run for.
+
+        Returns
+        -------
+        SudokuResult or None:
+            The solved or unsolvable result, or None
+            if the search was paused
+
+        Raises
+        ------
+        ValueError:
+            If no search was started
+        """
+        if self.stack is None:
+            raise ValueError("No search in progress")
+
+        start = time.perf_counter()
+        deadline = None if timeout is None else start + timeout
+        solved = self.search(max_nodes, deadline)
+        if solved is None:
+            self.stats.solve_time += time.perf_counter() - start
+            return None
+
+        # restore the matrix for the next puzzle
+        self.abandon()
+        self.stats.solve_time += time.perf_counter() - start
+
+        if not solved:
+            self.result = self.unsolvable_result(*self.first_column)
+            return self.result
+
+        # write the digit of each chosen matrix row into the board
+        side = self.size.side
+        for row in self.solution:
+            cell, n = divmod(row, side)
+            self.board[cell // side][cell % side] = n + 1
+        if self.grid is not None:
+            self.grid.load_rows(self.board)
+        self.result = SudokuResult(SudokuResult.SOLVED)
+        return self.result
+
+    @property
+    def paused(self):
+        """
+        bool: True if a search was started and has not finished
+        """
+        return self.stack is not None
+
+    def abandon(self):
+        """
+        Stops the search in progress and uncovers every
+        column so the matrix is left as it was built
+        """
+        L, C = self.L, self.C
+        for column, row in reversed(self.stack or ()):
+            if row != column:
+                j = L[row]
+                while j != row:
+                    self.uncover(C[j])
+                    j = L[j]
+            self.uncover(column)
+
+        for column in reversed(self.covered):
+            self.uncover(column)
+        self.covered = []
+        self.stack = None
+
+    def solve(self, timeout=None, max_nodes=None):
+        """
+        Solves the sudoku and describes the outcome. If the board is
+        unsolvable the reason names the first constraint chosen by the
+        search. A search out of budget is stopped and the result holds
+        the statistics so far. The result is stored in self.result
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search may run for.
+        max_nodes : int, optional
+            The number of search nodes the search may visit.
+
+        Returns
+        -------
+        SudokuResult:
+            The solved, unsolvable or budget exceeded result
+        """
+        self.result = self.start() or self.resume(max_nodes, timeout)
+        if self.result is None:
+            self.result = self.budget_result(timeout, max_nodes)
+        return self.result
+
+    def budget_result(self, timeout, max_nodes):
+        """
+        Stops a search that ran out of budget and names the budget
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search was allowed.
+        max_nodes : int, optional
+            The number of search nodes the search was allowed.
+
+        Returns
+        -------
+        SudokuResult:
+            The budget exceeded result with the statistics so far
+        """
+        self.abandon()
+        stats = self.stats.to_dict()
+        if max_nodes is not None and self.stats.nodes >= max_nodes:
+            return SudokuResult.budget_exceeded("nodes", max_nodes, stats)
+        return SudokuResult.budget_exceeded("time", timeout, stats)
+
+    def unsolvable_result(self, column, size):
+        """
+        Converts the first column chosen by the search
+        into an unsolvable result
+
+        Parameters
+        ----------
+        column : int
+            The header node of the column.
+        size : int
+            The number of rows left in the column when it was chosen.
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the cell or unit
+        """
+        side = self.size.side
+        block, offset = divmod(column - 1, side * side)
+        index, n = divmod(offset, side)
+
+        if block == 0:
+            x, y = offset % side, offset // side
+            if size == 0:
+                return SudokuResult.empty_cell(x, y)
+            return SudokuResult.exhausted(x, y)
+
+        kind = UNIT_KINDS[block - 1]
+        if size == 0:
+            return SudokuResult.missing_digit(kind, index, n + 1)
+        return SudokuResult.exhausted_unit(kind, index, n + 1)
+
+    def count_solutions(self, limit=2, timeout=None, max_nodes=None):
+        """
+        Counts the exact covers of the board by resuming the search
+        after every solution, stopping as soon as limit solutions are
+        found. The board is left unchanged. A count out of budget is
+        stopped and its budget exceeded result is stored in self.result
+
+        Parameters
+        ----------
+        limit : int
+            The number of solutions after which counting stops,
+            2 is enough to tell if the solution is unique.
+        timeout : float, optional
+            The number of seconds the count may run for.
+        max_nodes : int, optional
+            The number of search nodes the count may visit.
+
+        Returns
+        -------
+        int or None:
+            The number of solutions found, at most limit, or None
+            if the count ran out of budget. The result of a board
+            with no solution is stored in self.result
+
+        Raises
+        ------
+        ValueError:
+            If there is no board or the limit is below one
+        """
+        if limit < 1:
+            raise ValueError("Solution limit must be at least 1")
+
+        if self.start() is not None:
+            return 0
+
+        start = time.perf_counter()
+        deadline = None if timeout is None else start + timeout
+        count = 0
+        while count < limit:
+            # the node budget is shared by every solution counted
+            remaining = None
+            if max_nodes is not None:
+                remaining = max_nodes - self.stats.nodes
+            found = self.search(remaining, deadline)
+            if found is None:
+                self.stats.solve_time += time.perf_counter() - start
+                self.result = self.budget_result(timeout, max_nodes)
+                return None
+            if not found:
+                break
+            if count == 0:
+                # kept so solve_unique needs no second search
+                self.first_solution = self.solution
+            count += 1
+
+        self.stats.solve_time += time.perf_counter() - start
+        self.abandon()
+        if count == 0:
+            self.result = self.unsolvable_result(*self.first_column)
+        return count
+
+    def solve_unique(self, timeout=None, max_nodes=None):
+        """
+        Solves the sudoku and resumes the same search for a second
+        solution, so telling if the solution is unique costs no
+        second solve. The budgets cover both searches, and the board
+        and self.result are left as by solve
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search may run for.
+        max_nodes : int, optional
+            The number of search nodes the search may visit.
+
+        Returns
+        -------
+        bool or None:
+            True if the solution is unique, False if the board has
+            several solutions and None if it was not solved
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to solve
+        """
+        count = self.count_solutions(2, timeout, max_nodes)
+        if not count:
+            return None
+
+        # write the digit of each matrix row of the first solution
+        side = self.size.side
+        for row in self.first_solution:
+            cell, n = divmod(row, side)
+            self.board[cell // side][cell % side] = n + 1
+        if self.grid is not None:
+            self.grid.load_rows(self.board)
+        self.result = SudokuResult(SudokuResult.SOLVED)
+        return count == 1
+
+    def solve_sudoku(self, timeout=None, max_nodes=None):
+        """
+        Solves the sudoku, see solve for the details of the outcome
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The number of seconds the search may run for.
+        max_nodes : int, optional
+            The number of search nodes the search may visit.
+
+        Returns
+        -------
+        bool:
+            True if the board is solved, False otherwise
+        """
+        return self.solve(timeout, max_nodes).solved
@@ -0,0 +1,44 @@
+from sudoku_algorithm import SudokuAlgorithm
+from sudoku_bitmask import SudokuBitmaskAlgorithm
+from sudoku_dlx import SudokuDLX
+from sudoku_logic import SudokuLogicAlgorithm
+
+
+# solver engines selectable from the command line and the web app
+ENGINES = {
+    "backtrack": SudokuAlgorithm,
+    "bitmask": SudokuBitmaskAlgorithm,
+    "dlx": SudokuDLX,
+    "logic": SudokuLogicAlgorithm,
+}
+
+# engine used when none is requested
+DEFAULT_ENGINE = "bitmask"
+
+
+def get_engine(name=None):
+    """
+    Returns the solver class registered under the given engine name
+
+    Parameters
+    ----------
+    name : str, optional
+        Name of the engine, the default engine is used if None.
+
+    Returns
+    -------
+    type:
+        Solver class that takes a board and provides solve_sudoku()
+
+    Raises
+    ------
+    ValueError:
+        If the engine name is not registered
+    """
+    if name is None:
+        name = DEFAULT_ENGINE
+
+    if name not in ENGINES:
+        raise ValueError(f"Unknown solver engine: {name}")
+
+    return ENGINES[name]
@@ -1,3 +1,16 @@
+import json
+from sudoku_grid import SudokuGrid
+from sudoku_size import SYMBOLS, SudokuSize
+
+
+# output modes of a board
+FORMATS = ("grid", "line", "json", "csv")
+
+# text of each number in the csv format, looked up instead of
+# calling str per cell
+NUMBERS = [str(n) for n in range(len(SYMBOLS))]
+
+
 class SudokuFormat:
     """
     Handles the final formatting of the sudoku board
@@ -10,7 +23,7 @@ class SudokuFormat:
 
         Parameters
         ----------
-        board: list[list[int]]
+        board: list[list[int]] or SudokuGrid
             The current state of the sudoku board
 
         """
@@ -25,18 +38,165 @@ class SudokuFormat:
         formated_board: str
             The formatted sudoku board
         """
-        # initialise empty string
-        formated_board = ""
+        box = SudokuSize.of_board(self.board).box
+        separator = "+".join(["-" * box] * box) + "\n"
+        lines = []
         # iterate through each row
         for i, row in enumerate(self.board):
-            if i % 3 == 0 and i != 0:
-                formated_board += "---+---+---\n"
-            # iterate through each number in row
-            for j, number in enumerate(row):
-                if j % 3 == 0 and j != 0:
-                    formated_board += "|"
-                formated_board += str(number)
-            formated_board += "\n"
-        # return formatted board
-
-        return formated_board
+            if i % box == 0 and i != 0:
+                lines.append(separator)
+            cells = "".join([SYMBOLS[number] for number in row])
+            lines.append(
+                "|".join(cells[j : j + box] for j in range(0, len(cells), box))
+                + "\n"
+            )
+
+        return "".join(lines)
+
+    @staticmethod
+    def board_line(board):
+        """
+        Writes a board as a single line with one character per cell,
+        the numbers from 10 upwards as the letters A to P
+
+        Parameters
+        ----------
+        board : list[list[int]] or SudokuGrid
+            The sudoku board.
+
+        Returns
+        -------
+        str:
+            The cells of the board row by row
+        """
+        if isinstance(board, SudokuGrid):
+            return board.line()
+        return "".join([SYMBOLS[n] for row in board for n in row])
+
+    def format_line(self):
+        """
+        Formats the sudoku board as a single line of 81 digits,
+        or of one character per cell for the other sizes
+
+        Returns
+        -------
+        str:
+            The cells of the board row by row and a newline
+        """
+        return self.board_line(self.board) + "\n"
+
+    def format_json(self):
+        """
+        Formats the sudoku board as a JSON list of rows on one line
+
+        Returns
+        -------
+        str:
+            The JSON board and a newline
+        """
+        board = self.board
+        if isinstance(board, SudokuGrid):
+            board = board.to_rows()
+        return json.dumps(board, separators=(",", ":")) + "\n"
+
+    def format_csv(self):
+        """
+        Formats the sudoku board as rows of comma separated numbers
+
+        Returns
+        -------
+        str:
+            The CSV rows of the board
+        """
+        return "".join(
+            ",".join([NUMBERS[n] for n in row]) + "\n" for row in self.board
+        )
+
+    def format(self, mode="grid"):
+        """
+        Formats the sudoku board in one of the output modes
+
+        Parameters
+        ----------
+        mode : str
+            One of FORMATS: "grid", "line", "json" or "csv".
+
+        Returns
+        -------
+        str:
+            The formatted board
+
+        Raises
+        ------
+        ValueError
+            If the mode is unknown.
+        """
+        if mode == "grid":
+            return self.format_sudoku_board()
+        if mode == "line":
+            return self.format_line()
+        if mode == "json":
+            return self.format_json()
+        if mode == "csv":
+            return self.format_csv()
+        raise ValueError(
+            f"Unknown format '{mode}', expected one of {', '.join(FORMATS)}"
+        )
+
+
+class SudokuWriter:
+    """
+    Handles the output of many formatted boards or results. Text is
+    collected in memory and written to the file in large chunks, so
+    millions of boards do not each pay for a separate write. Callers
+    streaming results call flush once a batch of them is complete
+    """
+
+    # characters collected before they are written to the file
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, file, buffer_size=BUFFER_SIZE):
+        """
+        Initialises the SudokuWriter with an empty buffer
+
+        Parameters
+        ----------
+        file : file object
+            The text file written to.
+        buffer_size : int
+            The number of characters collected before writing.
+        """
+        self.file = file
+        self.buffer_size = buffer_size
+        self.parts = []
+        self.size = 0
+
+    def write(self, text):
+        """
+        Adds text to the buffer and writes the buffer once it is full
+
+        Parameters
+        ----------
+        text : str
+            The formatted board or result.
+        """
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the buffered text to the file
+        """
+        if self.parts:
+            self.file.write("".join(self.parts))
+            self.parts = []
+            self.size = 0
+        self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
@@ -0,0 +1,330 @@
+import random
+from multiprocessing import Pool
+from sudoku_bitmask import SudokuBitmaskAlgorithm
+from sudoku_format import SudokuFormat
+from sudoku_size import SudokuSize
+
+
+# difficulty levels from the least to the most solver effort
+DIFFICULTIES = ("easy", "medium", "hard", "expert")
+
+
+class SudokuGenerator:
+    """
+    Handles the generation of new sudoku puzzles. A full random grid
+    is built, then clues are removed in random order, each removal
+    kept only while the puzzle still has a unique solution. Every
+    puzzle is graded by the effort the bitmask engine spends solving
+    it, and puzzles are generated until one has the difficulty asked
+    for. Puzzles can be generated in chunks by a pool of processes
+    """
+
+    # most guesses and propagation rounds of each difficulty,
+    # a puzzle takes the first difficulty whose limits it is within
+    GRADES = (
+        ("easy", 0, 3),
+        ("medium", 0, 5),
+        ("hard", 2, None),
+        ("expert", None, None),
+    )
+
+    # share of the cells of each side kept as clues when generating each
+    # difficulty, easier puzzles stop removing clues before the puzzle is
+    # minimal and the larger sides stop before sparse puzzles that are
+    # slow to check, 4 x 4 puzzles are always easy
+    CLUE_FLOORS = {
+        4: {"easy": 0.0, "medium": 0.0, "hard": 0.0, "expert": 0.0},
+        9: {"easy": 0.45, "medium": 0.37, "hard": 0.0, "expert": 0.0},
+        16: {"easy": 0.6, "medium": 0.5, "hard": 0.45, "expert": 0.42},
+        25: {"easy": 0.65, "medium": 0.6, "hard": 0.55, "expert": 0.55},
+    }
+
+    # puzzles tried before giving up on a difficulty
+    MAX_ATTEMPTS = 200
+
+    # puzzles generated by a worker process at a time
+    CHUNK_SIZE = 16
+
+    def __init__(self, size=9, seed=None):
+        """
+        Initialises the SudokuGenerator with its own random numbers
+
+        Parameters
+        ----------
+        size : int
+            The side of the generated boards, one of 4, 9, 16 or 25.
+        seed : int, optional
+            Seed of the random numbers, so the same seed
+            generates the same puzzles.
+
+        Raises
+        ------
+        ValueError
+            If the size is not supported.
+        """
+        self.size = SudokuSize.of(size)
+        self.random = random.Random(seed)
+
+        # solver reused for every uniqueness check and grading
+        self.solver = SudokuBitmaskAlgorithm(None, place_hidden=True)
+
+        # called once the puzzles of each chunk of generate_many are
+        # yielded, so output can be flushed before the next chunk
+        self.chunk_done = None
+
+    def full_grid(self):
+        """
+        Builds a random solved board. The squares on the diagonal do
+        not share a row or column, so they are filled with random
+        permutations and the bitmask engine completes the rest. A
+        filling that cannot be completed, as happens on 4 x 4 boards,
+        is drawn again
+
+        Returns
+        -------
+        list[list[int]]:
+            The solved board
+        """
+        side, box = self.size.side, self.size.box
+        while True:
+            board = [[0] * side for _ in range(side)]
+            for square in range(box):
+                numbers = self.random.sample(range(1, side + 1), side)
+                for i, n in enumerate(numbers):
+                    y, x = divmod(i, box)
+                    board[square * box + y][square * box + x] = n
+
+            self.solver.load_board(board)
+            if self.solver.solve().solved:
+                return board
+
+    def remove_clues(self, grid, floor=0.0):
+        """
+        Removes the clues of a solved board in random order, putting
+        back every clue whose removal gives a second solution
+
+        Parameters
+        ----------
+        grid : list[list[int]]
+            The solved board.
+        floor : float
+            Share of the cells at which removal stops, 0 to
+            remove clues until the puzzle is minimal.
+
+        Returns
+        -------
+        list[list[int]]:
+            The puzzle, a new board with a unique solution
+        """
+        side = self.size.side
+        board = [row[:] for row in grid]
+        clues = side * side
+        keep = int(floor * clues)
+
+        cells = list(range(clues))
+        self.random.shuffle(cells)
+        for cell in cells:
+            if clues <= keep:
+                break
+
+            y, x = divmod(cell, side)
+            n = board[y][x]
+            board[y][x] = 0
+            self.solver.load_board(board)
+            if self.solver.count_solutions(2) == 1:
+                clues -= 1
+            else:
+                board[y][x] = n
+
+        return board
+
+    def grade(self, board):
+        """
+        Solves a copy of a puzzle and grades the effort it took
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The puzzle with a unique solution.
+
+        Returns
+        -------
+        str:
+            The difficulty, the statistics of the solve
+            are left in self.solver.stats
+        """
+        self.solver.load_board([row[:] for row in board])
+        self.solver.solve()
+        stats = self.solver.stats
+        return self.grade_effort(stats.guesses, stats.max_propagation_depth)
+
+    @classmethod
+    def grade_effort(cls, guesses, depth):
+        """
+        Converts the effort of a solve into a difficulty
+
+        Parameters
+        ----------
+        guesses : int
+            The guesses made by the search.
+        depth : int
+            The most rounds of a single propagation.
+
+        Returns
+        -------
+        str:
+            The first difficulty whose limits the effort is within
+        """
+        for difficulty, max_guesses, max_depth in cls.GRADES:
+            if max_guesses is not None and guesses > max_guesses:
+                continue
+            if max_depth is not None and depth > max_depth:
+                continue
+            return difficulty
+        return DIFFICULTIES[-1]
+
+    @staticmethod
+    def check_difficulty(difficulty):
+        """
+        Checks that a difficulty can be generated
+
+        Parameters
+        ----------
+        difficulty : str
+            The requested difficulty.
+
+        Raises
+        ------
+        ValueError
+            If the difficulty is not one of DIFFICULTIES.
+        """
+        if difficulty not in DIFFICULTIES:
+            raise ValueError(
+                f"Unknown difficulty '{difficulty}', "
+                f"expected one of {', '.join(DIFFICULTIES)}"
+            )
+
+    def generate(self, difficulty="medium"):
+        """
+        Generates a puzzle of the given difficulty
+
+        Parameters
+        ----------
+        difficulty : str
+            One of DIFFICULTIES.
+
+        Returns
+        -------
+        dict:
+            The "board" and "solution" as lists of rows, the "puzzle"
+            as a single line, its "difficulty", number of "clues"
+            and the "guesses" and "propagation_depth" it was graded by
+
+        Raises
+        ------
+        ValueError
+            If the difficulty is unknown.
+        RuntimeError
+            If no puzzle of the difficulty was found in
+            MAX_ATTEMPTS attempts.
+        """
+        self.check_difficulty(difficulty)
+        for _ in range(self.MAX_ATTEMPTS):
+            grid = self.full_grid()
+            floor = self.CLUE_FLOORS[self.size.side][difficulty]
+            board = self.remove_clues(grid, floor)
+            grade = self.grade(board)
+            if grade != difficulty:
+                continue
+
+            stats = self.solver.stats
+            return {
+                "board": board,
+                "solution": grid,
+                "puzzle": SudokuFormat.board_line(board),
+                "difficulty": grade,
+                "clues": sum(1 for row in board for n in row if n),
+                "guesses": stats.guesses,
+                "propagation_depth": stats.max_propagation_depth,
+            }
+
+        raise RuntimeError(
+            f"No {difficulty} puzzle found in {self.MAX_ATTEMPTS} attempts"
+        )
+
+    def generate_many(self, count, difficulty="medium", workers=1):
+        """
+        Generates many puzzles of the given difficulty, in chunks
+        spread over a pool of worker processes. Each chunk has its
+        own seed drawn from this generator, so a seeded generator
+        gives the same puzzles whatever the number of workers
+
+        Parameters
+        ----------
+        count : int
+            The number of puzzles.
+        difficulty : str
+            One of DIFFICULTIES.
+        workers : int
+            Number of worker processes, puzzles are generated
+            in this process if 1.
+
+        Yields
+        ------
+        dict:
+            Each puzzle as returned by generate, in chunk order
+            whatever the number of workers
+
+        Raises
+        ------
+        ValueError
+            If the count, the difficulty or the number
+            of workers is invalid.
+        """
+        if count < 0:
+            raise ValueError("Puzzle count must not be negative")
+        if workers < 1:
+            raise ValueError("Number of workers must be at least 1")
+        self.check_difficulty(difficulty)
+
+        chunks = [
+            (
+                self.size.side,
+                difficulty,
+                self.random.getrandbits(64),
+                min(self.CHUNK_SIZE, count - start),
+            )
+            for start in range(0, count, self.CHUNK_SIZE)
+        ]
+
+        if workers == 1:
+            for chunk in chunks:
+                yield from _generate_chunk(chunk)
+                if self.chunk_done is not None:
+                    self.chunk_done()
+            return
+
+        with Pool(workers) as pool:
+            for puzzles in pool.imap(_generate_chunk, chunks):
+                yield from puzzles
+                if self.chunk_done is not None:
+                    self.chunk_done()
+
+
+def _generate_chunk(chunk):
+    """
+    Generates a chunk of puzzles in a worker process
+
+    Parameters
+    ----------
+    chunk : tuple[int, str, int, int]
+        The board side, difficulty, seed and number of puzzles.
+
+    Returns
+    -------
+    list[dict]:
+        The puzzles as returned by SudokuGenerator.generate
+    """
+    side, difficulty, seed, count = chunk
+    generator = SudokuGenerator(side, seed)
+    return [generator.generate(difficulty) for _ in range(count)]
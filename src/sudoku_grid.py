@@ -0,0 +1,220 @@
+from sudoku_size import SIZES, SYMBOLS, SudokuSize
+
+
+# byte of the symbol of each number, so a grid is written as
+# a line with a single translate instead of a lookup per cell
+SYMBOL_TABLE = bytes.maketrans(
+    bytes(range(len(SYMBOLS))), SYMBOLS.encode("ascii")
+)
+
+
+class SudokuGrid:
+    """
+    Handles a sudoku board held as one byte per cell in row-major
+    order. A grid takes a fraction of the memory of a list of lists,
+    is copied or restored with a single slice and is used as it is by
+    the reader, validator and formatter. The solvers search a list of
+    its rows and write their solution back into it. Cells are read and
+    written as grid[y][x] through views of the row of bytes
+    """
+
+    __slots__ = ("side", "cells")
+
+    def __init__(self, cells, side=None):
+        """
+        Initialises the SudokuGrid with the number of every cell
+
+        Parameters
+        ----------
+        cells : bytes or bytearray or iterable[int]
+            The number of every cell row by row, 0 for a blank square.
+        side : int, optional
+            The side of the board, found from the number of cells
+            if None.
+
+        Raises
+        ------
+        ValueError
+            If the number of cells is not the square of one of SIZES
+            or a number does not fit in a byte.
+        """
+        self.cells = bytearray(cells)
+        if side is None:
+            side = SudokuSize.side_of(len(self.cells))
+        if side not in SIZES or len(self.cells) != side * side:
+            raise ValueError(f"Board size is not {side} x {side}")
+        self.side = side
+
+    @classmethod
+    def from_rows(cls, board):
+        """
+        Packs a board given as a list of lists into a grid
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The sudoku board.
+
+        Returns
+        -------
+        SudokuGrid:
+            The grid of the same cells
+
+        Raises
+        ------
+        ValueError
+            If the board is not square with a side of SIZES or
+            a number does not fit in a byte.
+        """
+        side = len(board)
+        if any(len(row) != side for row in board):
+            raise ValueError(f"Board size is not {side} x {side}")
+        return cls(b"".join(map(bytes, board)), side)
+
+    @staticmethod
+    def unpack(board):
+        """
+        Splits the board given to a solver into its grid, if it is
+        one, and the list of lists the solver searches in place
+
+        Parameters
+        ----------
+        board : SudokuGrid or list[list[int]] or None
+            The board given to the solver.
+
+        Returns
+        -------
+        tuple[SudokuGrid or None, list[list[int]] or None]:
+            The grid, None for any other board, and the rows
+        """
+        if isinstance(board, SudokuGrid):
+            return board, board.to_rows()
+        return None, board
+
+    def to_rows(self):
+        """
+        Unpacks the grid into a new list of lists
+
+        Returns
+        -------
+        list[list[int]]:
+            The numbers of every row
+        """
+        numbers, side = list(self.cells), self.side
+        return [numbers[i : i + side] for i in range(0, len(numbers), side)]
+
+    def load_rows(self, board):
+        """
+        Overwrites every cell with those of a list of lists of the
+        same size, such as the board a solver filled in
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The sudoku board.
+        """
+        self.cells[:] = b"".join(map(bytes, board))
+
+    def copy(self):
+        """
+        Returns an independent grid of the same cells
+
+        Returns
+        -------
+        SudokuGrid:
+            The copy
+        """
+        return SudokuGrid(self.cells, self.side)
+
+    def snapshot(self):
+        """
+        Returns the cells as immutable bytes that restore puts back
+
+        Returns
+        -------
+        bytes:
+            The number of every cell row by row
+        """
+        return bytes(self.cells)
+
+    def restore(self, snapshot):
+        """
+        Puts back the cells of an earlier snapshot
+
+        Parameters
+        ----------
+        snapshot : bytes
+            The cells returned by snapshot.
+
+        Raises
+        ------
+        ValueError
+            If the snapshot is of another board size.
+        """
+        if len(snapshot) != len(self.cells):
+            raise ValueError("Snapshot is of another board size")
+        self.cells[:] = snapshot
+
+    def clues(self):
+        """
+        Counts the cells holding a number
+
+        Returns
+        -------
+        int:
+            The number of filled cells
+        """
+        return len(self.cells) - self.cells.count(0)
+
+    def line(self):
+        """
+        Writes the grid with one character per cell, see
+        SudokuFormat.board_line
+
+        Returns
+        -------
+        str:
+            The cells of the board row by row
+        """
+        return self.cells.translate(SYMBOL_TABLE).decode("latin-1")
+
+    def __len__(self):
+        """
+        Returns the number of rows, as for a list of lists
+        """
+        return self.side
+
+    def __getitem__(self, y):
+        """
+        Returns a view of a row whose cells are read and written
+        in place, so grid[y][x] works as for a list of lists
+        """
+        side = self.side
+        if not -side <= y < side:
+            raise IndexError("Row index out of range")
+        start = (y % side) * side
+        return memoryview(self.cells)[start : start + side]
+
+    def __iter__(self):
+        """
+        Yields a view of every row in order
+        """
+        view, side = memoryview(self.cells), self.side
+        return (view[i : i + side] for i in range(0, len(view), side))
+
+    def __eq__(self, other):
+        """
+        Compares the cells with those of another grid or of a list
+        of lists
+        """
+        if isinstance(other, SudokuGrid):
+            return self.side == other.side and self.cells == other.cells
+        if isinstance(other, list):
+            return self.to_rows() == other
+        return NotImplemented
+
+    # grids are changed in place and cannot be dictionary keys
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SudokuGrid({self.line()!r})"
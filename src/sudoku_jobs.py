@@ -0,0 +1,339 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from sudoku_api import SudokuAPI
+from sudoku_result import SudokuResult
+from sudoku_format import SudokuFormat
+
+
+class SudokuJob:
+    """
+    Handles the state of a single asynchronous solve. The job is
+    updated by the worker thread solving it and read by the requests
+    polling it, so each field is written before the status that
+    makes it visible
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    CANCELLED = "cancelled"
+
+    # statuses after which the job no longer changes
+    FINISHED = (
+        SudokuResult.SOLVED,
+        SudokuResult.UNSOLVABLE,
+        SudokuResult.BUDGET_EXCEEDED,
+        CANCELLED,
+    )
+
+    def __init__(self, solver_class, board, timeout=None, max_nodes=None):
+        """
+        Initialises a queued SudokuJob
+
+        Parameters
+        ----------
+        solver_class : type
+            The solver engine class.
+        board : list[list[int]]
+            The validated sudoku board.
+        timeout : float, optional
+            The number of seconds the search may run for.
+        max_nodes : int, optional
+            The number of search nodes the search may visit.
+        """
+        self.id = uuid.uuid4().hex
+        self.solver_class = solver_class
+        self.board = board
+        self.puzzle = SudokuFormat.board_line(board)
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+
+        self.status = self.QUEUED
+        self.solution = None
+        self.error = None
+        self.reason = None
+        self.stats = None
+        self.cached = False
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+        # set by the cancel endpoint and checked between search slices
+        self.cancel_event = threading.Event()
+
+    @property
+    def done(self):
+        """
+        bool: True if the job has finished
+        """
+        return self.status in self.FINISHED
+
+    def to_dict(self):
+        """
+        Converts the job to a dictionary for JSON output
+
+        Returns
+        -------
+        dict:
+            The id, status, puzzle, budgets, elapsed seconds, the
+            search statistics so far and, once finished, the
+            solution or error message and reason
+        """
+        job = {
+            "id": self.id,
+            "status": self.status,
+            "puzzle": self.puzzle,
+            "timeout": self.timeout,
+            "max_nodes": self.max_nodes,
+            "stats": self.stats,
+        }
+        if self.started is not None:
+            end = self.finished if self.finished is not None else time.time()
+            job["elapsed"] = end - self.started
+        if self.solution is not None:
+            job["solution"] = self.solution
+            job["cached"] = self.cached
+        if self.error is not None:
+            job["error"] = self.error
+        if self.reason is not None:
+            job["reason"] = self.reason
+        return job
+
+
+class SudokuJobs:
+    """
+    Handles asynchronous solves for the web application. Jobs are
+    queued and solved by a bounded pool of worker threads, so a
+    pathological board never blocks a request. The search runs in
+    slices of nodes with the solver's resume, which lets each slice
+    report progress and check the cancel flag and the job budgets
+    """
+
+    # search nodes between progress updates and cancel checks
+    SLICE_NODES = 1000
+
+    def __init__(
+        self,
+        workers=2,
+        max_pending=100,
+        max_jobs=1000,
+        timeout=60.0,
+        max_nodes=None,
+        cache=None,
+    ):
+        """
+        Initialises the SudokuJobs with an idle worker pool
+
+        Parameters
+        ----------
+        workers : int
+            Number of worker threads solving jobs.
+        max_pending : int
+            Number of queued or running jobs after
+            which new jobs are refused.
+        max_jobs : int
+            Number of jobs remembered, the oldest finished
+            jobs are forgotten first.
+        timeout : float, optional
+            The largest time budget in seconds of a job.
+        max_nodes : int, optional
+            The largest node budget of a job.
+        cache : SudokuCache, optional
+            Cache of solutions looked up before solving and
+            filled in with every solved job.
+        """
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self.timeout = timeout
+        self.max_nodes = max_nodes
+        self.cache = cache
+
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sudoku-job"
+        )
+
+    def submit(self, data, engine=None):
+        """
+        Validates the puzzle of a request body and queues a job
+
+        Parameters
+        ----------
+        data : str, list or dict
+            The request body: the puzzle itself or an object with a
+            "puzzle" and an optional "engine", "timeout" in seconds
+            and "max_nodes".
+        engine : str, optional
+            Name of the solver engine if the body does not name one.
+
+        Returns
+        -------
+        tuple[dict, int]:
+            The queued job, or the error if the puzzle is invalid
+            or too many jobs are pending, and the HTTP status code
+        """
+        options = data if isinstance(data, dict) else {}
+        try:
+            solver_class, board = SudokuAPI.load_request(data, engine)
+            timeout = SudokuAPI.budget(options.get("timeout"), self.timeout)
+            max_nodes = SudokuAPI.budget(
+                options.get("max_nodes"), self.max_nodes
+            )
+        except ValueError as error:
+            return {"status": "invalid", "error": str(error)}, 400
+
+        job = SudokuJob(solver_class, board, timeout, max_nodes)
+        with self.lock:
+            pending = sum(not other.done for other in self.jobs.values())
+            if pending >= self.max_pending:
+                return {"error": "Too many jobs are pending"}, 503
+            self.jobs[job.id] = job
+            self.forget()
+
+        self.pool.submit(self.run, job)
+        return job.to_dict(), 202
+
+    def forget(self):
+        """
+        Forgets the oldest finished jobs once more than max_jobs are
+        remembered. The caller holds the lock
+        """
+        excess = len(self.jobs) - self.max_jobs
+        for job_id in [j.id for j in self.jobs.values() if j.done][:excess]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        """
+        Returns a job by its id
+
+        Parameters
+        ----------
+        job_id : str
+            The id returned when the job was submitted.
+
+        Returns
+        -------
+        dict or None:
+            The job, None if there is no job with the id
+        """
+        with self.lock:
+            job = self.jobs.get(job_id)
+        return None if job is None else job.to_dict()
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued or running job. A running job stops
+        at the end of its current search slice
+
+        Parameters
+        ----------
+        job_id : str
+            The id returned when the job was submitted.
+
+        Returns
+        -------
+        dict or None:
+            The job, None if there is no job with the id
+        """
+        # a queued job is cancelled under the lock its worker takes
+        # to start it, so it is either cancelled or started, not both
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            job.cancel_event.set()
+            if job.status == SudokuJob.QUEUED:
+                job.finished = time.time()
+                job.status = SudokuJob.CANCELLED
+        return job.to_dict()
+
+    def finish(self, job, status):
+        """
+        Records the final status of a job unless it was cancelled
+        first, after the fields the status makes visible
+
+        Parameters
+        ----------
+        job : SudokuJob
+            The job being run.
+        status : str
+            The status it finished with.
+        """
+        with self.lock:
+            if job.status != SudokuJob.CANCELLED:
+                job.finished = time.time()
+                job.status = status
+
+    def run(self, job):
+        """
+        Solves a job in slices of SLICE_NODES search nodes until it
+        is solved, proven unsolvable, cancelled or out of budget
+
+        Parameters
+        ----------
+        job : SudokuJob
+            The queued job.
+        """
+        with self.lock:
+            if job.cancel_event.is_set():
+                return
+            job.started = time.time()
+            job.status = SudokuJob.RUNNING
+
+        if self.cache is not None:
+            solution = self.cache.get(job.board)
+            if solution is not None:
+                job.solution = SudokuFormat.board_line(solution)
+                job.cached = True
+                self.finish(job, SudokuResult.SOLVED)
+                return
+
+        clues = [row[:] for row in job.board]
+        solver = job.solver_class(job.board)
+        result = solver.start()
+        deadline = None
+        if job.timeout is not None:
+            deadline = time.perf_counter() + job.timeout
+
+        while result is None:
+            nodes = self.SLICE_NODES
+            if job.max_nodes is not None:
+                nodes = min(nodes, job.max_nodes - solver.stats.nodes)
+            timeout = None
+            if deadline is not None:
+                timeout = deadline - time.perf_counter()
+
+            if nodes <= 0 or (timeout is not None and timeout <= 0):
+                # stop the search and report the statistics so far
+                result = solver.budget_result(job.timeout, job.max_nodes)
+            elif job.cancel_event.is_set():
+                solver.abandon()
+                job.stats = solver.stats.to_dict()
+                self.finish(job, SudokuJob.CANCELLED)
+                return
+            else:
+                result = solver.resume(nodes, timeout)
+                job.stats = solver.stats.to_dict()
+
+        job.stats = solver.stats.to_dict()
+        if result.solved:
+            job.solution = SudokuFormat.board_line(solver.board)
+            if self.cache is not None:
+                self.cache.put(clues, solver.board)
+        else:
+            job.error = result.message
+            job.reason = result.reason
+        self.finish(job, result.status)
+
+    def shutdown(self):
+        """
+        Cancels every job and waits for the worker threads to stop
+        """
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            job.cancel_event.set()
+        self.pool.shutdown(wait=True)
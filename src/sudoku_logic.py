@@ -0,0 +1,854 @@
+from itertools import combinations
+from sudoku_bitmask import SudokuBitmaskAlgorithm
+
+
+# logical techniques from the simplest to the hardest to spot
+TECHNIQUES = (
+    "naked_single",
+    "hidden_single",
+    "locked_candidates",
+    "naked_pair",
+    "hidden_pair",
+    "naked_triple",
+    "hidden_triple",
+    "x_wing",
+    "swordfish",
+    "xy_wing",
+)
+
+# rating of a puzzle that needed a guess after every technique stalled
+SEARCH = "search"
+
+
+class SudokuLogicAlgorithm(SudokuBitmaskAlgorithm):
+    """
+    Handles the solving process of the sudoku board the way a person
+    would, with the row, column and square masks of the bitmask engine
+    as the candidate state. Cells also keep the candidates removed by
+    techniques, so locked candidates, naked and hidden pairs and
+    triples, X-Wing, Swordfish and XY-Wing narrow the candidates until
+    a single can be placed. The search only guesses once no technique
+    applies, and every step taken before the first guess is kept in
+    self.trace so a puzzle can be rated by the hardest one it needed
+    """
+
+    # methods timed when the solver is profiled
+    PHASES = ("find_mrv_cell", "propagate", "eliminate")
+
+    # unit cell indexes and peers of each side built so far
+    layouts = {}
+
+    def __init__(self, board, propagate=True, profile=False):
+        """
+        Initialises the SudokuLogicAlgorithm with a given sudoku board
+
+        Parameters
+        ----------
+        board : list[list[int]] or SudokuGrid
+            The current state of the sudoku board, a grid is
+            filled in once it is solved.
+        propagate : bool
+            If True singles and techniques are applied before
+            branching, otherwise the plain MRV search is used.
+        profile : bool
+            If True the time spent finding MRV cells, propagating
+            and eliminating is recorded in self.stats.
+
+        """
+        # steps taken before the first guess of the last solve
+        self.trace = []
+        super().__init__(board, propagate, profile)
+
+    def build_masks(self):
+        """
+        Builds the row, column and square masks and clears
+        the candidates removed by techniques
+        """
+        super().build_masks()
+
+        # bit n - 1 is set when number n was removed from the cell
+        self.eliminated = [0] * len(self.size.cells)
+
+    def layout(self):
+        """
+        Returns the cell indexes of every unit and the peers of every
+        cell for the side of the board, built once per side
+
+        Returns
+        -------
+        tuple[list, list[set[int]]]:
+            The (kind, index, cells) units with cells as row-major
+            indexes and the indexes sharing a unit with each cell
+        """
+        side = self.size.side
+        layout = self.layouts.get(side)
+        if layout is None:
+            units = [
+                (kind, index, [y * side + x for x, y, _ in cells])
+                for kind, index, cells in self.size.units
+            ]
+            peers = [set() for _ in self.size.cells]
+            for _, _, cells in units:
+                for i in cells:
+                    peers[i].update(cells)
+            for i, cell_peers in enumerate(peers):
+                cell_peers.discard(i)
+            layout = self.layouts[side] = (units, peers)
+        return layout
+
+    def candidates(self, x, y):
+        """
+        Returns the candidate mask of a grid square without
+        the numbers removed by techniques
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+
+        Returns
+        -------
+        int:
+            Bitmask where bit n - 1 is set if number n is allowed
+        """
+        mask = super().candidates(x, y)
+        return mask & ~self.eliminated[y * self.size.side + x]
+
+    def cell_candidates(self):
+        """
+        Returns the candidate mask of every cell
+
+        Returns
+        -------
+        list[int]:
+            The masks in row-major order, 0 for filled cells
+        """
+        board = self.board
+        rows, cols, squares = self.rows, self.cols, self.squares
+        full_mask, eliminated = self.size.full_mask, self.eliminated
+        return [
+            0
+            if board[y][x]
+            else full_mask
+            & ~(rows[y] | cols[x] | squares[square] | eliminated[i])
+            for i, (x, y, square) in enumerate(self.size.cells)
+        ]
+
+    def find_mrv_cell(self):
+        """
+        Finds the empty cell with the fewest candidates left
+        by the techniques
+
+        Returns
+        -------
+        tuple:
+            The x and y coordinate of the cell with the least amount of
+            possible values or None if no cell exists
+        """
+        popcount = self.size.popcount
+        mrv = self.size.side + 1
+        mrv_cell = None
+        for i, mask in enumerate(self.cell_candidates()):
+            x, y, _ = self.size.cells[i]
+            if self.board[y][x] == 0 and popcount[mask] < mrv:
+                mrv = popcount[mask]
+                mrv_cell = (x, y)
+                if mrv == 0:
+                    break
+        return mrv_cell
+
+    def undo(self, trail):
+        """
+        Removes the placements of a trail and restores the
+        candidates removed by its techniques, in reverse order
+
+        Parameters
+        ----------
+        trail : list[tuple[int, int, int]]
+            The (x, y, n) placements to undo, with -mask in
+            place of n for the candidates removed from a cell.
+        """
+        side = self.size.side
+        for x, y, n in reversed(trail):
+            if n < 0:
+                self.eliminated[y * side + x] ^= -n
+            else:
+                self.remove(x, y, n)
+
+    def start(self):
+        """
+        Starts a new search of the board with an empty trace, see
+        SudokuBitmaskAlgorithm.start
+
+        Returns
+        -------
+        SudokuResult or None:
+            The unsolvable result if propagation found a
+            contradiction, None otherwise
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to solve
+        """
+        self.trace = []
+        return super().start()
+
+    def propagate(self):
+        """
+        Places naked and hidden singles until none is left, then
+        applies the simplest technique that removes a candidate and
+        goes back to the singles, until no technique applies. Steps
+        are added to the trace unless a guess has been made
+
+        Returns
+        -------
+        tuple[bool, list[tuple[int, int, int]]]:
+            False if a contradiction was found, True otherwise, and the
+            placements and removed candidates so they can be undone.
+            The cell or unit of a contradiction is kept in
+            self.contradiction
+        """
+        stats = self.stats
+        tracing = not self.stack
+        trail = []
+        rounds = 0
+
+        stats.propagations += 1
+        while True:
+            rounds += 1
+            placed = self.place_singles(trail, tracing)
+            if placed is None:
+                return False, trail
+            if placed:
+                continue
+            # guesses only need singles, techniques are for the trace
+            if not tracing or not self.eliminate(trail, tracing):
+                break
+
+        stats.forced_moves += sum(1 for _, _, n in trail if n > 0)
+        if rounds > stats.max_propagation_depth:
+            stats.max_propagation_depth = rounds
+        return True, trail
+
+    def place_singles(self, trail, tracing):
+        """
+        Places the naked singles and then the hidden singles
+        of the board in a single pass
+
+        Parameters
+        ----------
+        trail : list[tuple[int, int, int]]
+            The trail the placements are added to.
+        tracing : bool
+            If True every placement is added to the trace.
+
+        Returns
+        -------
+        int or None:
+            The number of placements, None if a cell has no candidate
+            or a unit has no cell left for a number
+        """
+        board = self.board
+        rows, cols, squares = self.rows, self.cols, self.squares
+        full_mask, eliminated = self.size.full_mask, self.eliminated
+        side = self.size.side
+        stats = self.stats
+        placed = 0
+
+        # naked singles: empty cells with exactly one candidate
+        for i, (x, y, square) in enumerate(self.size.cells):
+            if board[y][x] == 0:
+                mask = full_mask & ~(
+                    rows[y] | cols[x] | squares[square] | eliminated[i]
+                )
+                if mask == 0:
+                    stats.contradictions += 1
+                    self.contradiction = ("cell", x, y)
+                    return None
+                if mask & (mask - 1) == 0:
+                    n = mask.bit_length()
+                    self.place(x, y, n)
+                    trail.append((x, y, n))
+                    stats.naked_singles += 1
+                    placed += 1
+                    if tracing:
+                        self.record("naked_single", [(x, y)], [n], [n])
+
+        # hidden singles: numbers with one possible cell in a unit
+        for kind, index, unit in self.size.units:
+            used = once = twice = 0
+            for x, y, square in unit:
+                n = board[y][x]
+                if n:
+                    used |= 1 << (n - 1)
+                else:
+                    mask = full_mask & ~(
+                        rows[y]
+                        | cols[x]
+                        | squares[square]
+                        | eliminated[y * side + x]
+                    )
+                    twice |= once & mask
+                    once |= mask
+
+            # a missing number with no possible cell is a contradiction
+            missing = full_mask & ~(used | once)
+            if missing:
+                stats.contradictions += 1
+                n = (missing & -missing).bit_length()
+                self.contradiction = (kind, index, n)
+                return None
+
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                n = bit.bit_length()
+                for x, y, square in unit:
+                    # the cell may have been filled earlier this pass
+                    if board[y][x] == 0 and not (
+                        (
+                            rows[y]
+                            | cols[x]
+                            | squares[square]
+                            | eliminated[y * side + x]
+                        )
+                        & bit
+                    ):
+                        self.place(x, y, n)
+                        trail.append((x, y, n))
+                        stats.hidden_singles += 1
+                        placed += 1
+                        if tracing:
+                            self.record("hidden_single", [(x, y)], [n], [n])
+                        break
+
+        return placed
+
+    def eliminate(self, trail, tracing):
+        """
+        Applies the simplest technique that removes a candidate
+
+        Parameters
+        ----------
+        trail : list[tuple[int, int, int]]
+            The trail the removed candidates are added to.
+        tracing : bool
+            If True the step is added to the trace.
+
+        Returns
+        -------
+        bool:
+            True if a technique removed a candidate
+        """
+        cands = self.cell_candidates()
+        step = (
+            self.find_locked_candidates(cands)
+            or self.find_naked_subset(cands, 2)
+            or self.find_hidden_subset(cands, 2)
+            or self.find_naked_subset(cands, 3)
+            or self.find_hidden_subset(cands, 3)
+            or self.find_fish(cands, 2)
+            or self.find_fish(cands, 3)
+            or self.find_xy_wing(cands)
+        )
+        if step is None:
+            return False
+
+        technique, pattern, digits, removals = step
+        cells = self.size.cells
+        for i, mask in removals:
+            x, y, _ = cells[i]
+            self.eliminated[i] |= mask
+            trail.append((x, y, -mask))
+
+        if tracing:
+            self.record(
+                technique,
+                [cells[i][:2] for i in pattern],
+                self.numbers(digits),
+                removals=[
+                    (cells[i][0], cells[i][1], n)
+                    for i, mask in removals
+                    for n in self.numbers(mask)
+                ],
+            )
+        return True
+
+    @staticmethod
+    def numbers(mask):
+        """
+        Returns the numbers of a candidate mask
+
+        Parameters
+        ----------
+        mask : int
+            Bitmask where bit n - 1 is set for number n.
+
+        Returns
+        -------
+        list[int]:
+            The numbers in ascending order
+        """
+        numbers = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            numbers.append(bit.bit_length())
+        return numbers
+
+    def record(self, technique, cells, digits, placed=(), removals=()):
+        """
+        Adds a step to the trace
+
+        Parameters
+        ----------
+        technique : str
+            One of TECHNIQUES.
+        cells : list[tuple[int, int]]
+            The (x, y) cells of the pattern.
+        digits : list[int]
+            The numbers of the pattern.
+        placed : list[int]
+            The number placed in the single cell of a single.
+        removals : list[tuple[int, int, int]]
+            The (x, y, n) candidates removed by the technique.
+        """
+        placements = [(x, y, n) for (x, y), n in zip(cells, placed)]
+        self.trace.append(
+            {
+                "technique": technique,
+                "cells": cells,
+                "digits": digits,
+                "placements": placements,
+                "eliminations": list(removals),
+            }
+        )
+
+    @staticmethod
+    def removals(cands, cells, mask):
+        """
+        Returns the candidates of mask left in each cell
+
+        Parameters
+        ----------
+        cands : list[int]
+            The candidate mask of every cell.
+        cells : iterable[int]
+            The indexes of the cells the candidates are removed from.
+        mask : int
+            The candidates to remove.
+
+        Returns
+        -------
+        list[tuple[int, int]]:
+            The (index, mask) of every cell that loses a candidate
+        """
+        return [(i, cands[i] & mask) for i in cells if cands[i] & mask]
+
+    def find_locked_candidates(self, cands):
+        """
+        Finds a number confined to one row or column inside a square,
+        which is removed from the rest of that row or column, or
+        confined to one square inside a row or column, which is
+        removed from the rest of that square
+
+        Parameters
+        ----------
+        cands : list[int]
+            The candidate mask of every cell.
+
+        Returns
+        -------
+        tuple or None:
+            The technique, pattern cells, number mask and removals
+        """
+        units, _ = self.layout()
+        side = self.size.side
+        cells = self.size.cells
+        for kind, index, unit in units:
+            digits = 0
+            for i in unit:
+                digits |= cands[i]
+
+            while digits:
+                bit = digits & -digits
+                digits ^= bit
+                pattern = [i for i in unit if cands[i] & bit]
+                if len(pattern) < 2:
+                    continue
+
+                # the rows, columns and square the pattern lies in
+                if kind == "square":
+                    targets = []
+                    for axis, offset in ((1, 0), (0, side)):
+                        lines = {cells[i][axis] for i in pattern}
+                        if len(lines) == 1:
+                            targets = units[offset + lines.pop()][2]
+                            break
+                else:
+                    squares = {cells[i][2] for i in pattern}
+                    if len(squares) != 1:
+                        continue
+                    targets = units[2 * side + squares.pop()][2]
+
+                removals = self.removals(
+                    cands, [i for i in targets if i not in unit], bit
+                )
+                if removals:
+                    return "locked_candidates", pattern, bit, removals
+        return None
+
+    def find_naked_subset(self, cands, count):
+        """
+        Finds count cells of a unit holding only count candidates
+        between them, which are removed from the rest of the unit
+
+        Parameters
+        ----------
+        cands : list[int]
+            The candidate mask of every cell.
+        count : int
+            2 for naked pairs, 3 for naked triples.
+
+        Returns
+        -------
+        tuple or None:
+            The technique, pattern cells, number mask and removals
+        """
+        units, _ = self.layout()
+        popcount = self.size.popcount
+        technique = "naked_pair" if count == 2 else "naked_triple"
+        for _, _, unit in units:
+            pool = [i for i in unit if 2 <= popcount[cands[i]] <= count]
+            for pattern in combinations(pool, count):
+                digits = 0
+                for i in pattern:
+                    digits |= cands[i]
+                if popcount[digits] != count:
+                    continue
+
+                removals = self.removals(
+                    cands, [i for i in unit if i not in pattern], digits
+                )
+                if removals:
+                    return technique, list(pattern), digits, removals
+        return None
+
+    def find_hidden_subset(self, cands, count):
+        """
+        Finds count numbers of a unit confined to the same count cells,
+        whose other candidates are removed
+
+        Parameters
+        ----------
+        cands : list[int]
+            The candidate mask of every cell.
+        count : int
+            2 for hidden pairs, 3 for hidden triples.
+
+        Returns
+        -------
+        tuple or None:
+            The technique, pattern cells, number mask and removals
+        """
+        units, _ = self.layout()
+        popcount = self.size.popcount
+        technique = "hidden_pair" if count == 2 else "hidden_triple"
+        for _, _, unit in units:
+            # positions of each number within the unit
+            positions = {}
+            for p, i in enumerate(unit):
+                mask = cands[i]
+                while mask:
+                    bit = mask & -mask
+                    mask ^= bit
+                    positions[bit] = positions.get(bit, 0) | 1 << p
+
+            pool = [
+                bit
+                for bit, places in positions.items()
+                if 2 <= popcount[places] <= count
+            ]
+            for bits in combinations(pool, count):
+                places = digits = 0
+                for bit in bits:
+                    places |= positions[bit]
+                    digits |= bit
+                if popcount[places] != count:
+                    continue
+
+                pattern = [i for p, i in enumerate(unit) if places >> p & 1]
+                removals = self.removals(cands, pattern, ~digits)
+                if removals:
+                    return technique, pattern, digits, removals
+        return None
+
+    def find_fish(self, cands, count):
+        """
+        Finds a number whose candidates in count rows lie in the same
+        count columns, which is removed from the rest of those columns,
+        or the same with rows and columns swapped
+
+        Parameters
+        ----------
+        cands : list[int]
+            The candidate mask of every cell.
+        count : int
+            2 for an X-Wing, 3 for a Swordfish.
+
+        Returns
+        -------
+        tuple or None:
+            The technique, pattern cells, number mask and removals
+        """
+        side = self.size.side
+        popcount = self.size.popcount
+        technique = "x_wing" if count == 2 else "swordfish"
+
+        digits = 0
+        for mask in cands:
+            digits |= mask
+
+        while digits:
+            bit = digits & -digits
+            digits ^= bit
+
+            # columns of the number in each row and rows in each column
+            in_rows = [0] * side
+            in_cols = [0] * side
+            for i, mask in enumerate(cands):
+                if mask & bit:
+                    y, x = divmod(i, side)
+                    in_rows[y] |= 1 << x
+                    in_cols[x] |= 1 << y
+
+            for lines, by_row in ((in_rows, True), (in_cols, False)):
+                pool = [
+                    line
+                    for line, cover in enumerate(lines)
+                    if 2 <= popcount[cover] <= count
+                ]
+                for base in combinations(pool, count):
+                    cover = 0
+                    for line in base:
+                        cover |= lines[line]
+                    if popcount[cover] != count:
+                        continue
+
+                    crossing = [c for c in range(side) if cover >> c & 1]
+                    if by_row:
+                        pattern = [
+                            y * side + x for y in base for x in crossing
+                        ]
+                        targets = [
+                            y * side + x
+                            for x in crossing
+                            for y in range(side)
+                            if y not in base
+                        ]
+                    else:
+                        pattern = [
+                            y * side + x for x in base for y in crossing
+                        ]
+                        targets = [
+                            y * side + x
+                            for y in crossing
+                            for x in range(side)
+                            if x not in base
+                        ]
+
+                    removals = self.removals(cands, targets, bit)
+                    if removals:
+                        pattern = [i for i in pattern if cands[i] & bit]
+                        return technique, pattern, bit, removals
+        return None
+
+    def find_xy_wing(self, cands):
+        """
+        Finds a pivot cell with candidates a and b that sees a cell
+        with a and c and a cell with b and c. Whichever number the
+        pivot takes, one of the wings is c, so c is removed from
+        every cell that sees both wings
+
+        Parameters
+        ----------
+        cands : list[int]
+            The candidate mask of every cell.
+
+        Returns
+        -------
+        tuple or None:
+            The technique, pattern cells, number mask and removals
+        """
+        _, peers = self.layout()
+        popcount = self.size.popcount
+        pairs = [i for i, mask in enumerate(cands) if popcount[mask] == 2]
+        for pivot in pairs:
+            ab = cands[pivot]
+            wings = [
+                i
+                for i in pairs
+                if i in peers[pivot] and popcount[cands[i] & ab] == 1
+            ]
+            for first, second in combinations(wings, 2):
+                c = cands[first] & ~ab
+                if c != cands[second] & ~ab or (
+                    cands[first] & cands[second] & ab
+                ):
+                    continue
+
+                removals = self.removals(
+                    cands, peers[first] & peers[second], c
+                )
+                if removals:
+                    pattern = [pivot, first, second]
+                    return "xy_wing", pattern, ab | c, sorted(removals)
+        return None
+
+    def next_steps(self):
+        """
+        Finds the simplest way to the next number that can be placed:
+        a single if there is one, otherwise the techniques whose
+        removals lead to a single. The board and the trace are left
+        unchanged, so the steps can be given as a hint
+
+        Returns
+        -------
+        list[dict]:
+            The steps as they would be recorded in the trace, ending
+            with the placement. Empty if no technique leads to a
+            placement or the board has a contradiction
+
+        Raises
+        ------
+        ValueError:
+            If there is no board
+        """
+        if self.board is None:
+            raise ValueError("No board found")
+
+        trace, self.trace = self.trace, []
+        trail = []
+        steps = []
+        while True:
+            placed = self.place_singles(trail, True)
+            if placed is None:
+                break
+            if placed:
+                # the first single of the pass follows the removals
+                removals = len(self.trace) - placed
+                steps = self.trace[: removals + 1]
+                break
+            if not self.eliminate(trail, True):
+                break
+
+        self.undo(trail)
+        self.trace = trace
+        return steps
+
+    def rate(self):
+        """
+        Rates the board by applying singles and techniques until they
+        stall, without searching, so hard puzzles are rated quickly.
+        The board is left unchanged and the steps are kept in
+        self.trace
+
+        Returns
+        -------
+        str or None:
+            SEARCH if a guess would be needed, otherwise the hardest
+            technique of the trace, None if the board is unsolvable
+            or was given full
+
+        Raises
+        ------
+        ValueError:
+            If there is no board to rate
+        """
+        if self.start() is not None:
+            return None
+
+        stuck = self.find_mrv_cell() is not None
+        self.abandon()
+        return SEARCH if stuck else self.hardest()
+
+    def hardest(self):
+        """
+        Returns the hardest technique of the trace
+
+        Returns
+        -------
+        str or None:
+            The technique latest in TECHNIQUES, None if
+            the trace is empty
+        """
+        hardest = max(
+            (TECHNIQUES.index(step["technique"]) for step in self.trace),
+            default=None,
+        )
+        return None if hardest is None else TECHNIQUES[hardest]
+
+    def rating(self):
+        """
+        Rates the last solve by the hardest step it needed
+
+        Returns
+        -------
+        str or None:
+            SEARCH if the solve had to guess, otherwise the hardest
+            technique of the trace, None if the board was given full
+        """
+        if self.stats.guesses:
+            return SEARCH
+        return self.hardest()
+
+    def format_trace(self):
+        """
+        Formats the trace for the console
+
+        Returns
+        -------
+        str:
+            One numbered line per step, the number of guesses if
+            the search was needed and the rating
+        """
+        lines = [
+            f"{index}. {self.format_step(step)}\n"
+            for index, step in enumerate(self.trace, 1)
+        ]
+        if self.stats.guesses:
+            lines.append(f"search: {self.stats.guesses} guesses\n")
+        lines.append(f"rating: {self.rating()}\n")
+        return "".join(lines)
+
+    @staticmethod
+    def format_step(step):
+        """
+        Formats a step of the trace
+
+        Parameters
+        ----------
+        step : dict
+            A step recorded in the trace.
+
+        Returns
+        -------
+        str:
+            The technique, its pattern and the placement or
+            the candidates it removed
+        """
+        technique = step["technique"].replace("_", " ")
+        if step["placements"]:
+            x, y, n = step["placements"][0]
+            return f"{technique}: r{y + 1}c{x + 1} = {n}"
+
+        cells = " ".join(f"r{y + 1}c{x + 1}" for x, y in step["cells"])
+        digits = ",".join(str(n) for n in step["digits"])
+        removed = ", ".join(
+            f"{n} from r{y + 1}c{x + 1}" for x, y, n in step["eliminations"]
+        )
+        return f"{technique} {digits} in {cells}: removes {removed}"
@@ -1,3 +1,39 @@
+import io
+import sys
+import bz2
+import gzip
+import lzma
+from contextlib import contextmanager
+from itertools import islice
+from sudoku_grid import SudokuGrid
+from sudoku_size import CELL_SEPARATORS, SIZES, SYMBOLS, SudokuSize
+
+
+# leading bytes and reader of each supported compression format
+COMPRESSIONS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+# byte written in a grid for a character that is not a number
+INVALID = 255
+
+# value of each character a number can be written with, blank squares
+# as "0" or "." and the numbers from 10 upwards as letters of any case
+DIGITS = {".": 0, **{symbol: n for n, symbol in enumerate(SYMBOLS[:10])}}
+LETTERS = {
+    **DIGITS,
+    **{symbol: n for n, symbol in enumerate(SYMBOLS) if n >= 10},
+    **{symbol.lower(): n for n, symbol in enumerate(SYMBOLS) if n >= 10},
+}
+
+# value of every byte of a one line puzzle, INVALID for those that are
+# not a number, without and with the letters of the numbers from 10
+DIGIT_VALUES = bytes(DIGITS.get(chr(c), INVALID) for c in range(256))
+LETTER_VALUES = bytes(LETTERS.get(chr(c), INVALID) for c in range(256))
+
+
 class SudokuReader:
     """
     Handles the reading of a sudoku board from a
@@ -48,27 +84,331 @@ class SudokuReader:
 
         """
 
-        # Initialise the empty board
-        board = []
-
         with open(filename, "r") as file:
-            for line_number, line in enumerate(file, 1):
-                # Ignore the grid separators
-                if line.startswith("---"):
-                    continue
+            return self.parse_board_text(file.read())
 
-                # Remove the grid dividers and newline characters
-                row = line.replace("|", "").replace("\n", "")
+    @staticmethod
+    def parse_board_text(text):
+        """
+        Converts the text of a sudoku grid into a list of lists where
+        each sublist represents a row of the sudoku, so an uploaded
+        board can be read in memory without writing it to a file.
 
-                # Create list of characters in row
-                row_values = [str(char) for char in row]
+        Parameters
+        ----------
+        text : str
+            The sudoku grid, one row per line with optional
+            "|" dividers and "---" separator lines. Cells are one
+            character each unless the grid has more than 9 rows or
+            every row is split by spaces or commas into one cell
+            per row.
 
-                # append row to board
-                board.append(row_values)
+        Returns
+        -------
+        list[list[str]]
+            A 2D list representing each row of the initial sudoku board.
+
+        Raises
+        ------
+        ValueError
+            If the text is empty.
+        """
+        # Initialise the empty board
+        board = []
+
+        for line in text.splitlines():
+            # Ignore the grid separators
+            if SudokuReader.is_separator(line):
+                continue
+
+            # Remove the grid dividers and append the row to the board
+            board.append(line.replace("|", ""))
 
         # Check if file is empty
         if not board:
             raise ValueError("File is empty")
 
+        # cells are only separated on wide boards or boards split into
+        # one cell per row, so a 9 x 9 grid is read a character per cell
+        cells = [SudokuSize.split_cells(row) for row in board]
+        if len(board) > 9 or all(len(row) == len(board) for row in cells):
+            return cells
+
         # Return the matrix of the inserted sudoku board
-        return board
+        return [list(row) for row in board]
+
+    @staticmethod
+    def is_separator(line):
+        """
+        Checks whether a line is a separator between the squares
+        of a grid, such as "---+---+---" or "--+--"
+
+        Parameters
+        ----------
+        line : str
+            A line of a grid.
+
+        Returns
+        -------
+        bool:
+            True if the line only holds "-" and "+"
+        """
+        line = line.strip()
+        return line.startswith("-") and not line.strip("-+")
+
+    @staticmethod
+    def parse_puzzle_line(line):
+        """
+        Converts a puzzle written on a single line of 81 characters
+        into the same list of lists produced by read_board_from_file.
+        Blank squares may be written as "0" or ".". Lines of 16, 256
+        or 625 cells are 4 x 4, 16 x 16 or 25 x 25 puzzles, with cells
+        separated by spaces or commas if they are wider than one
+        character.
+
+        Parameters
+        ----------
+        line : str
+            The puzzle as a single line of characters.
+
+        Returns
+        -------
+        list[list[str]]
+            A 2D list representing each row of the initial sudoku board.
+        """
+        # normalise blank squares and drop surrounding whitespace
+        cells = SudokuSize.split_cells(line.strip().replace(".", "0"))
+
+        # split the line into rows, of nine cells for a line of bad size
+        side = SudokuSize.side_of(len(cells))
+        return [cells[i : i + side] for i in range(0, len(cells), side)]
+
+    @staticmethod
+    def parse_puzzle_grid(line):
+        """
+        Converts a puzzle written on a single line, as accepted by
+        parse_puzzle_line, straight into a SudokuGrid of numbers.
+        A line of one ascii character per cell is converted with a
+        single translate instead of a string and an int per cell
+
+        Parameters
+        ----------
+        line : str
+            The puzzle as a single line of characters.
+
+        Returns
+        -------
+        SudokuGrid
+            The cells of the puzzle, numbers out of range are left
+            for SudokuBoard to report.
+
+        Raises
+        ------
+        ValueError
+            If a cell is not a number or the number of cells is not
+            that of a board size, with the message SudokuBoard gives
+            for the rows of parse_puzzle_line.
+        """
+        text = line.strip()
+        if text.isascii() and not CELL_SEPARATORS.search(text):
+            side = SudokuSize.side_of(len(text))
+
+            # letters are read as numbers, as by SudokuBoard, if
+            # parse_puzzle_line would split the line into over 9 rows
+            rows = -(-len(text) // side)
+            table = LETTER_VALUES if rows > 9 else DIGIT_VALUES
+            cells = text.encode("ascii").translate(table)
+            bad = cells.find(INVALID)
+            if bad >= 0:
+                raise ValueError(
+                    "Invalid character found at"
+                    f"({bad // side}, {bad % side}): {text[bad]}"
+                )
+            return SudokuGrid(cells, side)
+
+        # cells wider than a character or digits outside of ascii
+        cells = SudokuSize.split_cells(text.replace(".", "0"))
+        side = SudokuSize.side_of(len(cells))
+        rows = -(-len(cells) // side)
+        values = []
+        for i, cell in enumerate(cells):
+            try:
+                value = int(cell)
+            except ValueError:
+                value = SudokuSize.symbol_value(cell, rows)
+                if value is None:
+                    raise ValueError(
+                        "Invalid character found at"
+                        f"({i // side}, {i % side}): {cell}"
+                    )
+            # any number out of range is reported by SudokuBoard
+            values.append(value if 0 <= value <= side else INVALID)
+        return SudokuGrid(values, side)
+
+    @staticmethod
+    @contextmanager
+    def open_puzzle_file(filename):
+        """
+        Opens a puzzle file for reading as a binary stream. Files
+        compressed with gzip, bz2 or xz are decompressed on the fly,
+        whatever their name, and "-" reads from standard input
+
+        Parameters
+        ----------
+        filename : str
+            Path to the puzzle file, or "-" for standard input.
+
+        Yields
+        ------
+        io.BufferedIOBase
+            The decompressed contents of the file.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file is not found.
+        """
+        if filename == "-":
+            stream = sys.stdin.buffer
+        else:
+            stream = open(filename, "rb")
+
+        # peek needs a buffered stream
+        file = stream
+        if not hasattr(file, "peek"):
+            file = io.BufferedReader(stream)
+
+        try:
+            head = file.peek(6)
+            for magic, opener in COMPRESSIONS:
+                if head.startswith(magic):
+                    with opener(file) as decompressed:
+                        yield decompressed
+                    break
+            else:
+                yield file
+        finally:
+            if filename != "-":
+                file.close()
+            elif file is not stream:
+                # leave standard input open for the caller
+                file.detach()
+
+    @staticmethod
+    def parse_puzzle_lines(lines):
+        """
+        Yields the puzzles of lines in the one line format, the grid
+        format with "|" dividers and "---" separator lines, or a mix
+        of both. A line of more than nine cells without "|" is a
+        one line puzzle, other lines are grid rows collected until
+        there are as many rows as cells in the first row, or nine
+        if that is not a board side. Lines starting with "#" are
+        skipped and a blank line cuts short a grid left incomplete
+
+        Parameters
+        ----------
+        lines : iterable[str]
+            The lines of a puzzle file.
+
+        Yields
+        ------
+        tuple[int, str]
+            The number of the first line of each puzzle and the
+            puzzle as a single line with the grid rows joined.
+        """
+        rows = []
+        cells = []
+        start = None
+        side = 9
+        for line_number, line in enumerate(lines, 1):
+            line = line.strip()
+
+            # skip comments and grid separators
+            if line.startswith("#") or SudokuReader.is_separator(line):
+                continue
+
+            row = SudokuSize.split_cells(line.replace("|", ""))
+            if not line or ("|" not in line and len(row) > 9):
+                if rows:
+                    # a grid cut short is yielded so it is reported
+                    yield start, SudokuSize.join_cells(cells)
+                    rows = []
+                    cells = []
+                if line:
+                    yield line_number, line
+                continue
+
+            if not rows:
+                start = line_number
+                side = len(row) if len(row) in SIZES else 9
+            rows.append(line)
+            cells.extend(row)
+            if len(rows) == side:
+                yield start, SudokuSize.join_cells(cells)
+                rows = []
+                cells = []
+
+        if rows:
+            yield start, SudokuSize.join_cells(cells)
+
+    @staticmethod
+    def read_puzzles_from_file(filename):
+        """
+        Reads a file holding puzzles in the one line or grid format
+        and yields each puzzle as soon as its lines have been read,
+        so memory use does not grow with the size of the file.
+        Blank lines and lines starting with "#" are skipped.
+
+        Parameters
+        ----------
+        filename : str
+            Path to the puzzle file, which may be compressed with
+            gzip, bz2 or xz, or "-" for standard input.
+
+        Yields
+        ------
+        tuple[int, str]
+            The line number and the puzzle as a single line.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the file is not found.
+        """
+        with SudokuReader.open_puzzle_file(filename) as binary:
+            # undecodable bytes make their puzzle invalid, not the file
+            file = io.TextIOWrapper(binary, errors="replace")
+            try:
+                yield from SudokuReader.parse_puzzle_lines(file)
+            finally:
+                # leave the binary stream to open_puzzle_file
+                file.detach()
+
+    @staticmethod
+    def read_puzzle_chunks(filename, chunk_size):
+        """
+        Reads a puzzle file in lists of chunk_size puzzles,
+        holding no more than one chunk in memory at a time
+
+        Parameters
+        ----------
+        filename : str
+            Path to the puzzle file, or "-" for standard input.
+        chunk_size : int
+            The number of puzzles in each chunk.
+
+        Yields
+        ------
+        list[tuple[int, str]]
+            The line numbers and puzzles of each chunk.
+
+        Raises
+        ------
+        ValueError
+            If the chunk size is below one.
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+        puzzles = SudokuReader.read_puzzles_from_file(filename)
+        yield from iter(lambda: list(islice(puzzles, chunk_size)), [])
@@ -0,0 +1,264 @@
+class SudokuResult:
+    """
+    Handles the outcome of solving a sudoku board. A result is either
+    solved or unsolvable, in which case the reason names the cell or
+    unit (row, column or square) that proves there is no solution,
+    or the search ran out of its time or node budget before either
+    """
+
+    SOLVED = "solved"
+    UNSOLVABLE = "unsolvable"
+    BUDGET_EXCEEDED = "budget_exceeded"
+
+    def __init__(self, status, reason=None, stats=None):
+        """
+        Initialises the SudokuResult with the status of the solve
+
+        Parameters
+        ----------
+        status : str
+            One of SudokuResult.SOLVED, SudokuResult.UNSOLVABLE
+            or SudokuResult.BUDGET_EXCEEDED.
+        reason : dict, optional
+            The "kind" of proof ("cell", "row", "column", "square",
+            "search", "clue" or "budget"), the "row" and "column" of a
+            cell, the "index" and "digit" of a unit or the "budget" and
+            "limit" that ran out, and a readable "message".
+        stats : dict, optional
+            The search statistics so far of a search out of budget.
+
+        """
+        self.status = status
+        self.reason = reason
+        self.stats = stats
+
+    @property
+    def solved(self):
+        """
+        bool: True if the board was solved
+        """
+        return self.status == self.SOLVED
+
+    @property
+    def message(self):
+        """
+        str: Readable description of the result
+        """
+        if self.solved:
+            return "Solved sudoku"
+        if self.status == self.BUDGET_EXCEEDED:
+            return f"Search budget exceeded: {self.reason['message']}"
+        if self.reason is None:
+            return "Unsolvable sudoku"
+        return f"Unsolvable sudoku: {self.reason['message']}"
+
+    @classmethod
+    def empty_cell(cls, x, y):
+        """
+        Creates an unsolvable result for a cell with no candidates
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the cell
+        """
+        return cls(
+            cls.UNSOLVABLE,
+            {
+                "kind": "cell",
+                "row": y,
+                "column": x,
+                "message": f"no candidates left for row {y}, column {x}",
+            },
+        )
+
+    @classmethod
+    def missing_digit(cls, kind, index, n):
+        """
+        Creates an unsolvable result for a digit
+        with no possible cell in a unit
+
+        Parameters
+        ----------
+        kind : str
+            The unit type, "row", "column" or "square".
+        index : int
+            The row, column or square number.
+        n : int
+            The digit with no possible cell.
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the unit
+        """
+        return cls(
+            cls.UNSOLVABLE,
+            {
+                "kind": kind,
+                "index": index,
+                "digit": n,
+                "message": (
+                    f"digit {n} has no possible cell in {kind} {index}"
+                ),
+            },
+        )
+
+    @classmethod
+    def exhausted(cls, x, y):
+        """
+        Creates an unsolvable result for a search where every
+        candidate of the first branching cell failed
+
+        Parameters
+        ----------
+        x : int
+            Column number of the branching cell.
+        y : int
+            Row number of the branching cell.
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the branching cell
+        """
+        return cls(
+            cls.UNSOLVABLE,
+            {
+                "kind": "search",
+                "row": y,
+                "column": x,
+                "message": (
+                    f"every candidate for row {y}, column {x} "
+                    "leads to a contradiction"
+                ),
+            },
+        )
+
+    @classmethod
+    def exhausted_unit(cls, kind, index, n):
+        """
+        Creates an unsolvable result for a search where every
+        possible cell of a digit in a unit failed
+
+        Parameters
+        ----------
+        kind : str
+            The unit type, "row", "column" or "square".
+        index : int
+            The row, column or square number.
+        n : int
+            The digit searched.
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the unit
+        """
+        return cls(
+            cls.UNSOLVABLE,
+            {
+                "kind": "search",
+                "unit": kind,
+                "index": index,
+                "digit": n,
+                "message": (
+                    f"every cell for digit {n} in {kind} {index} "
+                    "leads to a contradiction"
+                ),
+            },
+        )
+
+    @classmethod
+    def conflicting_clue(cls, x, y, n):
+        """
+        Creates an unsolvable result for a starting value that
+        repeats another starting value in its row, column or square
+
+        Parameters
+        ----------
+        x : int
+            Column number of the starting value.
+        y : int
+            Row number of the starting value.
+        n : int
+            The starting value.
+
+        Returns
+        -------
+        SudokuResult:
+            The unsolvable result naming the starting value
+        """
+        return cls(
+            cls.UNSOLVABLE,
+            {
+                "kind": "clue",
+                "row": y,
+                "column": x,
+                "digit": n,
+                "message": (
+                    f"starting value {n} at row {y}, column {x} "
+                    "conflicts with another starting value"
+                ),
+            },
+        )
+
+    @classmethod
+    def budget_exceeded(cls, budget, limit, stats):
+        """
+        Creates a result for a search stopped by its budget
+        before the board was solved or proven unsolvable
+
+        Parameters
+        ----------
+        budget : str
+            The budget that ran out, "nodes" or "time".
+        limit : int or float
+            The node count or seconds the search was allowed.
+        stats : dict
+            The search statistics so far.
+
+        Returns
+        -------
+        SudokuResult:
+            The result naming the budget
+        """
+        if budget == "nodes":
+            message = f"search stopped after {limit} nodes"
+        else:
+            message = f"search stopped after {limit} seconds"
+
+        return cls(
+            cls.BUDGET_EXCEEDED,
+            {
+                "kind": "budget",
+                "budget": budget,
+                "limit": limit,
+                "message": message,
+            },
+            stats,
+        )
+
+    def to_dict(self):
+        """
+        Converts the result to a dictionary for JSON output
+
+        Returns
+        -------
+        dict:
+            The status, the reason if the board was not solved
+            and the statistics so far of a search out of budget
+        """
+        result = {"status": self.status}
+        if self.reason is not None:
+            result["reason"] = self.reason
+        if self.stats is not None:
+            result["stats"] = self.stats
+        return result
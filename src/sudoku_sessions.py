@@ -0,0 +1,505 @@
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from sudoku_api import SudokuAPI
+from sudoku_format import SudokuFormat
+from sudoku_logic import SudokuLogicAlgorithm
+from sudoku_size import SudokuSize
+
+
+class SudokuSession:
+    """
+    Handles the state of a single interactive game. Every row, column
+    and square counts how many times each number is on the board, so
+    a move only updates the three units of its cell. The candidates
+    and conflicts of the cells in those units are all that can change,
+    and only they are recomputed and reported back. The logic engine
+    giving hints shares the board and unit masks, so it always starts
+    from the current candidates
+    """
+
+    def __init__(self, board):
+        """
+        Initialises a SudokuSession with a validated board whose
+        numbers are the givens that cannot be changed
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The validated sudoku board.
+        """
+        self.id = uuid.uuid4().hex
+        self.size = SudokuSize.of_board(board)
+        self.puzzle = SudokuFormat.board_line(board)
+        self.board = [row[:] for row in board]
+        self.givens = {
+            (x, y) for x, y, _ in self.size.cells if self.board[y][x]
+        }
+        self.empty = len(self.size.cells) - len(self.givens)
+        self.moves = 0
+        self.last_used = time.monotonic()
+
+        # moves of one player never interleave with another request
+        self.lock = threading.Lock()
+
+        # the engine searches the board in place and its row, column
+        # and square masks are the masks of the numbers in each unit
+        self.logic = SudokuLogicAlgorithm(self.board)
+        self.masks = (self.logic.rows, self.logic.cols, self.logic.squares)
+
+        # count of each number in each unit
+        side = self.size.side
+        self.counts = [[0] * (side + 1) for _ in range(3 * side)]
+        for x, y, square in self.size.cells:
+            n = self.board[y][x]
+            if n:
+                for unit in (y, side + x, 2 * side + square):
+                    self.counts[unit][n] += 1
+
+        # cells holding a number also found elsewhere in one of its units
+        self.conflicts = set()
+
+    def add(self, unit, n):
+        """
+        Counts a number placed in a unit
+
+        Parameters
+        ----------
+        unit : int
+            Index of the row, column or square in self.counts.
+        n : int
+            The number placed.
+        """
+        kind, index = divmod(unit, self.size.side)
+        self.counts[unit][n] += 1
+        self.masks[kind][index] |= 1 << (n - 1)
+
+    def discard(self, unit, n):
+        """
+        Uncounts a number cleared from a unit
+
+        Parameters
+        ----------
+        unit : int
+            Index of the row, column or square in self.counts.
+        n : int
+            The number cleared.
+        """
+        kind, index = divmod(unit, self.size.side)
+        self.counts[unit][n] -= 1
+        if self.counts[unit][n] == 0:
+            self.masks[kind][index] &= ~(1 << (n - 1))
+
+    def units_of(self, x, y):
+        """
+        Returns the indexes of the row, column and square of a cell
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+
+        Returns
+        -------
+        tuple[int, int, int]:
+            The indexes of the units in self.counts
+        """
+        side, box = self.size.side, self.size.box
+        return y, side + x, 2 * side + (y // box) * box + x // box
+
+    def candidates(self, x, y):
+        """
+        Returns the numbers that can be placed in a cell
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+
+        Returns
+        -------
+        list[int]:
+            The numbers in ascending order, empty for a filled cell
+        """
+        if self.board[y][x]:
+            return []
+        return SudokuLogicAlgorithm.numbers(self.logic.candidates(x, y))
+
+    def in_conflict(self, x, y):
+        """
+        Checks if the number of a cell is repeated in one of its units
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+
+        Returns
+        -------
+        bool:
+            True if the cell holds a repeated number
+        """
+        n = self.board[y][x]
+        return bool(n) and any(
+            self.counts[unit][n] > 1 for unit in self.units_of(x, y)
+        )
+
+    def move(self, x, y, n):
+        """
+        Places a number in a cell, or clears it with 0, and updates
+        the counts, candidates and conflicts of its three units
+
+        Parameters
+        ----------
+        x : int
+            Column number of the sudoku board.
+        y : int
+            Row number of the sudoku board.
+        n : int
+            The number to place, 0 to clear the cell.
+
+        Returns
+        -------
+        dict:
+            The move, the candidates of every empty cell of its
+            row, column and square and the state of the game
+
+        Raises
+        ------
+        ValueError
+            If the cell or number is out of range or the cell is
+            one of the givens.
+        """
+        side = self.size.side
+        for name, value, limit in (("x", x, side - 1), ("y", y, side - 1)):
+            if not self.is_number(value) or not 0 <= value <= limit:
+                raise ValueError(f"{name} must be a number from 0 to {limit}")
+        if not self.is_number(n) or not 0 <= n <= side:
+            raise ValueError(f"value must be a number from 0 to {side}")
+        if (x, y) in self.givens:
+            raise ValueError(f"Cell ({x}, {y}) is given and cannot change")
+
+        old = self.board[y][x]
+        units = self.units_of(x, y)
+        for unit in units:
+            if old:
+                self.discard(unit, old)
+            if n:
+                self.add(unit, n)
+        self.board[y][x] = n
+        self.empty += (not n) - (not old)
+        self.moves += 1
+
+        # only the cells of the three units can change
+        cells = {
+            (cx, cy)
+            for unit in units
+            for cx, cy, _ in self.size.units[unit][2]
+        }
+        self.conflicts.discard((x, y))
+        for cx, cy in cells:
+            value = self.board[cy][cx]
+            if value and value in (old, n):
+                if self.in_conflict(cx, cy):
+                    self.conflicts.add((cx, cy))
+                else:
+                    self.conflicts.discard((cx, cy))
+
+        return {
+            "id": self.id,
+            "move": {"x": x, "y": y, "value": n},
+            "candidates": [
+                {"x": cx, "y": cy, "candidates": self.candidates(cx, cy)}
+                for cx, cy in sorted(cells, key=lambda cell: cell[::-1])
+                if not self.board[cy][cx]
+            ],
+            **self.state(),
+        }
+
+    @staticmethod
+    def is_number(value):
+        """
+        Checks if a request value is an integer
+
+        Parameters
+        ----------
+        value : object
+            The value from the request body.
+
+        Returns
+        -------
+        bool:
+            True for integers other than booleans
+        """
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def state(self):
+        """
+        Describes the state of the game
+
+        Returns
+        -------
+        dict:
+            The cells in conflict, the number of moves and empty
+            cells and whether the board is solved
+        """
+        return {
+            "conflicts": [
+                {"x": x, "y": y}
+                for x, y in sorted(self.conflicts, key=lambda c: c[::-1])
+            ],
+            "moves": self.moves,
+            "empty": self.empty,
+            "solved": self.empty == 0 and not self.conflicts,
+        }
+
+    def hint(self):
+        """
+        Finds the simplest way to the next number on the current board
+
+        Returns
+        -------
+        dict:
+            The placement, the steps leading to it and their
+            description, or a null hint with the reason if the
+            board has conflicts or no logical step applies
+        """
+        if self.conflicts:
+            return {"hint": None, "message": "Resolve the conflicts first"}
+        if self.empty == 0:
+            return {"hint": None, "message": "The board is solved"}
+
+        # the steps are found on the session board and undone
+        steps = self.logic.next_steps()
+        if not steps:
+            return {
+                "hint": None,
+                "message": "No logical step applies, a number is wrong "
+                "or a guess is needed",
+            }
+        return {
+            "hint": steps[-1],
+            "steps": steps,
+            "message": "; ".join(
+                SudokuLogicAlgorithm.format_step(step) for step in steps
+            ),
+        }
+
+    def to_dict(self):
+        """
+        Converts the session to a dictionary for JSON output
+
+        Returns
+        -------
+        dict:
+            The id, puzzle, current board, candidates of every
+            cell and the state of the game
+        """
+        return {
+            "id": self.id,
+            "puzzle": self.puzzle,
+            "board": SudokuFormat.board_line(self.board),
+            "candidates": [
+                [self.candidates(x, y) for x in range(self.size.side)]
+                for y in range(self.size.side)
+            ],
+            **self.state(),
+        }
+
+
+class SudokuSessions:
+    """
+    Handles the interactive games of the web application. Sessions are
+    kept in order of last use, so the ones idle for longer than the
+    timeout are always at the front and are dropped before any other
+    session is touched. New sessions are refused once max_sessions are
+    open, which bounds the memory used however many players connect
+    """
+
+    def __init__(self, idle_timeout=1800.0, max_sessions=10000):
+        """
+        Initialises the SudokuSessions with no open session
+
+        Parameters
+        ----------
+        idle_timeout : float
+            Seconds after its last use at which a session expires.
+        max_sessions : int
+            Number of open sessions after which new ones are refused.
+        """
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def expire(self):
+        """
+        Drops the sessions idle for longer than the timeout. The
+        caller holds the lock
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_used > cutoff:
+                break
+            del self.sessions[session.id]
+
+    def touch(self, session_id):
+        """
+        Returns an open session and marks it as just used
+
+        Parameters
+        ----------
+        session_id : str
+            The id returned when the session was created.
+
+        Returns
+        -------
+        SudokuSession or None:
+            The session, None if there is none or it expired
+        """
+        with self.lock:
+            self.expire()
+            session = self.sessions.get(session_id)
+            if session is not None:
+                session.last_used = time.monotonic()
+                self.sessions.move_to_end(session_id)
+        return session
+
+    def create(self, data):
+        """
+        Validates the puzzle of a request body and opens a session
+
+        Parameters
+        ----------
+        data : str, list or dict
+            The request body: the puzzle itself or an object
+            with a "puzzle".
+
+        Returns
+        -------
+        tuple[dict, int]:
+            The new session, or the error if the puzzle is invalid
+            or too many sessions are open, and the HTTP status code
+        """
+        if isinstance(data, dict):
+            data = data.get("puzzle")
+        try:
+            session = SudokuSession(SudokuAPI.load_board(data))
+        except ValueError as error:
+            return {"status": "invalid", "error": str(error)}, 400
+
+        with self.lock:
+            self.expire()
+            if len(self.sessions) >= self.max_sessions:
+                return {"error": "Too many sessions are open"}, 503
+            self.sessions[session.id] = session
+        return session.to_dict(), 201
+
+    def get(self, session_id):
+        """
+        Returns the full state of a session
+
+        Parameters
+        ----------
+        session_id : str
+            The id returned when the session was created.
+
+        Returns
+        -------
+        dict or None:
+            The session, None if there is none or it expired
+        """
+        session = self.touch(session_id)
+        if session is None:
+            return None
+        with session.lock:
+            return session.to_dict()
+
+    def move(self, session_id, data):
+        """
+        Applies a single cell move of a request body
+
+        Parameters
+        ----------
+        session_id : str
+            The id returned when the session was created.
+        data : dict
+            The request body with the "x" and "y" of the cell and
+            the "value" to place, 0 to clear the cell.
+
+        Returns
+        -------
+        tuple[dict, int] or None:
+            The changes made by the move, or the error if the move is
+            invalid, and the HTTP status code. None if there is no
+            session with the id
+        """
+        session = self.touch(session_id)
+        if session is None:
+            return None
+        if not isinstance(data, dict):
+            return {"error": "Body must be a JSON object"}, 400
+
+        with session.lock:
+            try:
+                return (
+                    session.move(
+                        data.get("x"), data.get("y"), data.get("value")
+                    ),
+                    200,
+                )
+            except ValueError as error:
+                return {"error": str(error)}, 400
+
+    def hint(self, session_id):
+        """
+        Finds the next logical step of a session
+
+        Parameters
+        ----------
+        session_id : str
+            The id returned when the session was created.
+
+        Returns
+        -------
+        dict or None:
+            The hint, None if there is no session with the id
+        """
+        session = self.touch(session_id)
+        if session is None:
+            return None
+        with session.lock:
+            return session.hint()
+
+    def close(self, session_id):
+        """
+        Closes a session before it expires
+
+        Parameters
+        ----------
+        session_id : str
+            The id returned when the session was created.
+
+        Returns
+        -------
+        bool:
+            True if the session was open
+        """
+        with self.lock:
+            return self.sessions.pop(session_id, None) is not None
+
+    def __len__(self):
+        """
+        Returns the number of open sessions, expiring idle ones first
+        """
+        with self.lock:
+            self.expire()
+            return len(self.sessions)
@@ -0,0 +1,220 @@
+import re
+from math import isqrt
+from operator import itemgetter
+
+
+# sides of the boards that can be read, validated, solved and formatted
+SIZES = (4, 9, 16, 25)
+
+# symbol of each number when a cell is written as one character, the
+# numbers from 10 upwards are letters and 0 is a blank square
+SYMBOLS = "0123456789ABCDEFGHIJKLMNOP"
+
+# separators between cells written with more than one character
+CELL_SEPARATORS = re.compile(r"[\s,]+")
+
+
+class Popcount:
+    """
+    Counts the candidates of masks too wide for a lookup table,
+    indexed like the table of the smaller sizes
+    """
+
+    def __getitem__(self, mask):
+        return bin(mask).count("1")
+
+
+class SudokuSize:
+    """
+    Handles the geometry of an N² x N² sudoku board: the side of the
+    board, the side of its squares, the cells of every row, column and
+    square and the candidate masks of its numbers. The tables of each
+    size are built once and shared by every board of that size
+    """
+
+    # geometry of each side built so far
+    sizes = {}
+
+    def __init__(self, side):
+        """
+        Initialises the SudokuSize with the tables of a board side
+
+        Parameters
+        ----------
+        side : int
+            The number of rows, columns and squares of the board.
+
+        Raises
+        ------
+        ValueError
+            If the side is not one of SIZES.
+        """
+        if side not in SIZES:
+            raise ValueError(f"Board size {side} x {side} is not supported")
+
+        self.side = side
+        self.box = isqrt(side)
+        self.full_mask = (1 << side) - 1
+
+        # number of candidates held by every possible mask
+        if side <= 16:
+            self.popcount = [
+                bin(mask).count("1") for mask in range(self.full_mask + 1)
+            ]
+        else:
+            self.popcount = Popcount()
+
+        # (x, y, square) for every cell of the board in row-major order
+        box = self.box
+        self.cells = [
+            (x, y, (y // box) * box + x // box)
+            for y in range(side)
+            for x in range(side)
+        ]
+
+        # cells of every row, column and square with the unit name
+        self.units = [
+            (name, i, [cell for cell in self.cells if cell[axis] == i])
+            for axis, name in ((1, "row"), (0, "column"), (2, "square"))
+            for i in range(side)
+        ]
+
+        # getter of the numbers of every unit from the row-major
+        # cells of a grid, in the same order as the units
+        self.unit_getters = [
+            itemgetter(*[y * side + x for x, y, _ in cells])
+            for _, _, cells in self.units
+        ]
+
+    @classmethod
+    def of(cls, side):
+        """
+        Returns the shared geometry of a board side
+
+        Parameters
+        ----------
+        side : int
+            The number of rows, columns and squares of the board.
+
+        Returns
+        -------
+        SudokuSize:
+            The geometry of the side
+
+        Raises
+        ------
+        ValueError
+            If the side is not one of SIZES.
+        """
+        size = cls.sizes.get(side)
+        if size is None:
+            size = cls.sizes[side] = cls(side)
+        return size
+
+    @classmethod
+    def of_board(cls, board):
+        """
+        Returns the shared geometry of a board from its number of rows
+
+        Parameters
+        ----------
+        board : list[list[int]]
+            The sudoku board.
+
+        Returns
+        -------
+        SudokuSize:
+            The geometry of the board
+
+        Raises
+        ------
+        ValueError
+            If the number of rows is not one of SIZES.
+        """
+        return cls.of(len(board))
+
+    @staticmethod
+    def side_of(count):
+        """
+        Returns the side of a board written with count cells
+
+        Parameters
+        ----------
+        count : int
+            The number of cells of the puzzle.
+
+        Returns
+        -------
+        int:
+            The side whose square is count, 9 if there is none
+            so a puzzle of the wrong length is reported as 9 x 9
+        """
+        side = isqrt(count)
+        if side * side == count and side in SIZES:
+            return side
+        return 9
+
+    @staticmethod
+    def split_cells(text):
+        """
+        Splits a row or a one line puzzle into its cells. Cells are
+        single characters unless the text holds spaces or commas,
+        which separate cells of one or more characters such as
+        the numbers from 10 upwards
+
+        Parameters
+        ----------
+        text : str
+            The stripped row or puzzle.
+
+        Returns
+        -------
+        list[str]:
+            The text of each cell
+        """
+        if CELL_SEPARATORS.search(text):
+            return [cell for cell in CELL_SEPARATORS.split(text) if cell]
+        return list(text)
+
+    @staticmethod
+    def join_cells(cells):
+        """
+        Joins cells into the text read back by split_cells
+
+        Parameters
+        ----------
+        cells : list[str]
+            The text of each cell.
+
+        Returns
+        -------
+        str:
+            The cells side by side, separated by spaces if
+            any cell is longer than one character
+        """
+        if all(len(cell) == 1 for cell in cells):
+            return "".join(cells)
+        return " ".join(cells)
+
+    @staticmethod
+    def symbol_value(symbol, side):
+        """
+        Converts the letter of a number from 10 upwards
+
+        Parameters
+        ----------
+        symbol : str
+            The text of a cell that int() did not accept.
+        side : int
+            The side of the board, letters are only
+            numbers on boards wider than 9.
+
+        Returns
+        -------
+        int or None:
+            The number of the letter, None if it is not one
+        """
+        if side <= 9 or len(symbol) != 1:
+            return None
+        value = SYMBOLS.find(symbol.upper())
+        return value if value >= 10 else None
@@ -0,0 +1,125 @@
+import time
+
+
+class SudokuStats:
+    """
+    Handles the statistics of a single solve. Search counters are
+    always collected, the time spent in each phase is only measured
+    when a solver is created with profile=True so an unprofiled solve
+    pays nothing for it
+    """
+
+    # counters reported in the order they are printed
+    COUNTERS = (
+        "nodes",
+        "backtracks",
+        "max_depth",
+        "guesses",
+        "forced_moves",
+        "naked_singles",
+        "hidden_singles",
+        "propagations",
+        "max_propagation_depth",
+        "contradictions",
+    )
+
+    def __init__(self):
+        """
+        Initialises every counter and timer to zero
+        """
+        # search nodes visited, guesses undone and deepest guess stack
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+
+        # guesses against moves forced by propagation
+        self.guesses = 0
+        self.forced_moves = 0
+        self.naked_singles = 0
+        self.hidden_singles = 0
+        self.propagations = 0
+        self.max_propagation_depth = 0
+        self.contradictions = 0
+
+        # seconds for the whole solve and, if profiled, for each phase
+        self.solve_time = 0.0
+        self.phase_times = {}
+
+    @staticmethod
+    def profile(solver, phases):
+        """
+        Replaces the given methods of a solver instance with wrappers
+        that add their running time to solver.stats.phase_times. Phase
+        times are inclusive, so a phase called by another phase is
+        also counted in the caller
+
+        Parameters
+        ----------
+        solver : object
+            The solver instance with a stats attribute.
+        phases : tuple[str]
+            Names of the solver methods to time.
+        """
+        for phase in phases:
+            method = getattr(solver, phase)
+            setattr(solver, phase, SudokuStats.timed(solver, phase, method))
+
+    @staticmethod
+    def timed(solver, phase, method):
+        """
+        Returns a wrapper of a method that times each call
+
+        Parameters
+        ----------
+        solver : object
+            The solver instance with a stats attribute.
+        phase : str
+            The name the time is recorded under.
+        method : callable
+            The bound method to time.
+
+        Returns
+        -------
+        callable:
+            The timing wrapper
+        """
+        perf_counter = time.perf_counter
+
+        def wrapper(*args):
+            start = perf_counter()
+            try:
+                return method(*args)
+            finally:
+                times = solver.stats.phase_times
+                times[phase] = times.get(phase, 0.0) + perf_counter() - start
+
+        return wrapper
+
+    def to_dict(self):
+        """
+        Converts the statistics to a dictionary for JSON output
+
+        Returns
+        -------
+        dict:
+            Every counter, the solve time and the phase times in seconds
+        """
+        stats = {name: getattr(self, name) for name in self.COUNTERS}
+        stats["solve_time"] = self.solve_time
+        stats["phase_times"] = dict(self.phase_times)
+        return stats
+
+    def format_stats(self):
+        """
+        Formats the statistics for the console
+
+        Returns
+        -------
+        str:
+            One line per counter followed by the times in milliseconds
+        """
+        lines = [f"{name}: {getattr(self, name)}\n" for name in self.COUNTERS]
+        lines.append(f"solve_time: {self.solve_time * 1000:.3f}ms\n")
+        for phase, seconds in self.phase_times.items():
+            lines.append(f"time_in_{phase}: {seconds * 1000:.3f}ms\n")
+        return "".join(lines)
@@ -0,0 +1,133 @@
+import os
+import time
+import sqlite3
+import threading
+
+
+class SudokuStore:
+    """
+    Handles a persistent store of solved sudoku boards in an SQLite
+    database, so solutions survive restarts and are shared between web
+    app workers and batch worker processes. The database runs in
+    write-ahead logging mode, which lets any number of readers work
+    alongside a writer. Each thread and process opens its own connection
+    """
+
+    # name of the database file in the store directory
+    FILENAME = "solutions.sqlite3"
+
+    # seconds a writer waits for another writer before failing
+    TIMEOUT = 30.0
+
+    def __init__(self, directory):
+        """
+        Initialises the SudokuStore and creates the
+        database in the given directory if needed
+
+        Parameters
+        ----------
+        directory : str
+            Path to the directory holding the database.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, self.FILENAME)
+        self.local = threading.local()
+
+        with self.connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS solutions ("
+                "puzzle TEXT PRIMARY KEY, solution TEXT NOT NULL)"
+            )
+
+    def connection(self):
+        """
+        Returns the connection of the calling thread, opening it on
+        first use. A connection inherited from a parent process is
+        never reused as SQLite connections do not survive a fork
+
+        Returns
+        -------
+        sqlite3.Connection:
+            The connection to the database
+        """
+        local = self.local
+        if getattr(local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.TIMEOUT)
+
+            # switching the journal mode fails at once rather than
+            # waiting while another process creates the database
+            deadline = time.monotonic() + self.TIMEOUT
+            while True:
+                try:
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    break
+                except sqlite3.OperationalError:
+                    if time.monotonic() >= deadline:
+                        raise
+                    time.sleep(0.01)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            local.connection = connection
+            local.pid = os.getpid()
+        return local.connection
+
+    def get(self, puzzle):
+        """
+        Looks up the solution of a puzzle
+
+        Parameters
+        ----------
+        puzzle : str
+            The puzzle as a single line of 81 digits.
+
+        Returns
+        -------
+        str or None:
+            The solution as 81 digits, None if it is not stored
+        """
+        row = (
+            self.connection()
+            .execute(
+                "SELECT solution FROM solutions WHERE puzzle = ?", (puzzle,)
+            )
+            .fetchone()
+        )
+        return None if row is None else row[0]
+
+    def put(self, puzzle, solution):
+        """
+        Stores the solution of a puzzle
+
+        Parameters
+        ----------
+        puzzle : str
+            The puzzle as a single line of 81 digits.
+        solution : str
+            The solution as a single line of 81 digits.
+        """
+        self.put_many([(puzzle, solution)])
+
+    def put_many(self, entries):
+        """
+        Stores many solutions in a single transaction. Puzzles
+        already stored keep their solution
+
+        Parameters
+        ----------
+        entries : iterable[tuple[str, str]]
+            The (puzzle, solution) pairs as lines of 81 digits.
+        """
+        with self.connection() as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO solutions VALUES (?, ?)", entries
+            )
+
+    def __len__(self):
+        """
+        Returns the number of stored solutions
+        """
+        row = (
+            self.connection()
+            .execute("SELECT COUNT(*) FROM solutions")
+            .fetchone()
+        )
+        return row[0]
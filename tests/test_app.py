@@ -0,0 +1,80 @@
+import re
+import unittest
+
+try:
+    from app import app, get_cache, get_jobs, get_sessions
+except ImportError:
+    app = None
+
+
+@unittest.skipIf(app is None, "flask is not installed")
+class TestApp(unittest.TestCase):
+    """
+    Test cases for the web application
+
+    The web application is responsible for rendering an uploaded
+    board and sending it back through the form to be solved.
+
+    These tests ensure boards of every size survive the round trip
+    through the form and are drawn with the borders of their squares.
+    """
+
+    def upload_and_solve(self, filename):
+        """
+        Uploads a board file and submits the form of the page
+        """
+        client = app.test_client()
+        with open(filename, "rb") as file:
+            page = client.post(
+                "/",
+                data={"file": (file, "board.txt")},
+                content_type="multipart/form-data",
+            ).get_data(as_text=True)
+        puzzle = re.search(r'name="puzzle" value="([^"]*)"', page).group(1)
+        solved = client.post("/solve", data={"puzzle": puzzle})
+        return puzzle, solved.get_data(as_text=True)
+
+    def test_board_sizes(self):
+        """
+        Test that 4x4, 9x9 and 16x16 uploads are solved with a
+        thick border after every square
+        """
+        for filename, side, box in (
+            ("data/input_4x4.txt", 4, 2),
+            ("data/valid_board.txt", 9, 3),
+            ("data/input_16x16.txt", 16, 4),
+        ):
+            with self.subTest(filename=filename):
+                puzzle, page = self.upload_and_solve(filename)
+                self.assertEqual(len(puzzle), side * side)
+                self.assertNotIn("Board size", page)
+                self.assertEqual(
+                    page.count('<td class="box-right">'), side * (box - 1)
+                )
+                self.assertEqual(page.count('class="box-bottom"'), box - 1)
+
+    def test_settings_after_import(self):
+        """
+        Test that the cache, jobs and sessions are built from the
+        settings in place when they are first used
+        """
+        saved = dict(app.config)
+        try:
+            for name in ("sudoku_cache", "sudoku_jobs", "sudoku_sessions"):
+                app.extensions.pop(name, None)
+            app.config["CACHE_SIZE"] = 7
+            app.config["MAX_PENDING_JOBS"] = 3
+            app.config["MAX_SESSIONS"] = 5
+            self.assertEqual(get_cache().maxsize, 7)
+            self.assertEqual(get_jobs().max_pending, 3)
+            self.assertIs(get_jobs().cache, get_cache())
+            self.assertEqual(get_sessions().max_sessions, 5)
+        finally:
+            app.config.update(saved)
+            get_jobs().shutdown()
+            for name in ("sudoku_cache", "sudoku_jobs", "sudoku_sessions"):
+                app.extensions.pop(name, None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
-from src.sudoku_reader import SudokuReader
-from src.sudoku_board import SudokuBoard
-from src.sudoku_algorithm import SudokuAlgorithm
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_algorithm import SudokuAlgorithm
 
 
 class TestSudokuAlgorithm(unittest.TestCase):
@@ -57,6 +57,94 @@ class TestSudokuAlgorithm(unittest.TestCase):
         self.assertTrue(solver.solve_sudoku())
         self.assertEqual(solver.board, expected_board)
 
+    def test_solve_unsolvable_reason(self):
+        """
+        Test that the SudokuAlgorithm class names the cell
+        with no candidates on an unsolvable board
+        """
+        reader = SudokuReader("data/fast_unsolvable_board.txt")
+        board = SudokuBoard(reader.board)
+        solver = SudokuAlgorithm(board.board)
+        result = solver.solve()
+
+        self.assertFalse(result.solved)
+        self.assertEqual(result.reason["kind"], "cell")
+        self.assertEqual(
+            (result.reason["row"], result.reason["column"]), (4, 0)
+        )
+
+    def test_count_solutions(self):
+        """
+        Test that the SudokuAlgorithm class counts one solution for
+        a unique board and stops at the limit for an empty board
+        """
+        reader = SudokuReader("data/valid_board.txt")
+        board = SudokuBoard(reader.board)
+        solver = SudokuAlgorithm(board.board)
+
+        self.assertEqual(solver.count_solutions(), 1)
+        self.assertEqual(solver.board, board.board)
+
+        solver = SudokuAlgorithm([[0] * 9 for _ in range(9)])
+        self.assertEqual(solver.count_solutions(limit=3), 3)
+
+    def test_pause_and_resume(self):
+        """
+        Test that a search paused after every node reaches the same
+        solution and visits the same nodes as an uninterrupted solve
+        """
+        reader = SudokuReader("data/valid_board.txt")
+        board = SudokuBoard(reader.board).board
+        solver = SudokuAlgorithm([row[:] for row in board])
+        solver.solve()
+
+        paused = SudokuAlgorithm([row[:] for row in board])
+        self.assertIsNone(paused.start())
+        pauses = 0
+        while paused.resume(max_nodes=1) is None:
+            self.assertTrue(paused.paused)
+            pauses += 1
+
+        self.assertTrue(paused.result.solved)
+        self.assertFalse(paused.paused)
+        self.assertEqual(paused.board, solver.board)
+        self.assertEqual(paused.stats.nodes, solver.stats.nodes)
+        self.assertEqual(pauses, solver.stats.nodes - 1)
+
+    def test_abandon_restores_board(self):
+        """
+        Test that abandoning a paused search leaves the board unchanged
+        """
+        solver = SudokuAlgorithm([[0] * 9 for _ in range(9)])
+        solver.start()
+
+        self.assertIsNone(solver.resume(max_nodes=10))
+        solver.abandon()
+        self.assertEqual(solver.board, [[0] * 9 for _ in range(9)])
+        with self.assertRaises(ValueError):
+            solver.resume()
+
+    def test_board_sizes(self):
+        """
+        Test that a 4x4 board is solved with 2x2 squares
+        and an unsolvable one names its empty cell
+        """
+        board = SudokuBoard(SudokuReader("data/input_4x4.txt").board)
+        solver = SudokuAlgorithm(board.board)
+
+        self.assertTrue(solver.solve_sudoku())
+        self.assertEqual(
+            solver.board,
+            [[2, 4, 1, 3], [1, 3, 2, 4], [4, 1, 3, 2], [3, 2, 4, 1]],
+        )
+
+        solver.load_board([[1, 2, 0, 0], [0, 0, 3, 4], [0] * 4, [0] * 4])
+        result = solver.solve()
+        self.assertFalse(result.solved)
+        self.assertEqual(result.reason["kind"], "cell")
+        self.assertEqual(result.reason["row"], 0)
+        self.assertEqual(result.reason["column"], 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,166 @@
+import json
+import unittest
+from sudoku_api import SudokuAPI
+from sudoku_cache import SudokuCache
+
+
+class TestSudokuAPI(unittest.TestCase):
+    """
+    Test cases for the SudokuAPI class
+
+    The SudokuAPI class is responsible for solving puzzles sent
+    in the body of a web request without using the filesystem.
+
+    These tests ensure every accepted puzzle format is solved and
+    bad requests are answered with an error instead of raising.
+    """
+
+    puzzle = (
+        ".....7........95.4....5.169.8....3.5.75...29.4.6....8.762.8...."
+        "1.39........6....."
+    )
+
+    def test_solve_line(self):
+        """
+        Test that a one line puzzle is solved with its statistics
+        """
+        response, status = SudokuAPI.solve(self.puzzle)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response["status"], "solved")
+        self.assertEqual(len(response["solution"]), 81)
+        self.assertNotIn("0", response["solution"])
+        self.assertEqual(response["puzzle"], self.puzzle.replace(".", "0"))
+        self.assertGreaterEqual(response["stats"]["nodes"], 1)
+
+    def test_solve_formats_agree(self):
+        """
+        Test that a JSON object, a list of rows and a grid
+        of text lines give the same solution
+        """
+        solution = SudokuAPI.solve(self.puzzle)[0]["solution"]
+        line = self.puzzle.replace(".", "0")
+        rows = [line[i : i + 9] for i in range(0, 81, 9)]
+
+        for data in (
+            {"puzzle": self.puzzle, "engine": "dlx"},
+            [[int(n) for n in row] for row in rows],
+            "\n".join(rows),
+        ):
+            with self.subTest(data=data):
+                response, status = SudokuAPI.solve(data)
+                self.assertEqual(status, 200)
+                self.assertEqual(response["solution"], solution)
+
+    def test_solve_cached(self):
+        """
+        Test that a repeated puzzle is answered from the cache
+        """
+        cache = SudokuCache()
+        first, _ = SudokuAPI.solve(self.puzzle, cache=cache)
+        second, _ = SudokuAPI.solve(self.puzzle, cache=cache)
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["solution"], second["solution"])
+        self.assertEqual(cache.to_dict()["hits"], 1)
+        self.assertEqual(second["stats"].keys(), first["stats"].keys())
+        self.assertEqual(second["stats"]["nodes"], 0)
+
+    def test_unsolvable_reason(self):
+        """
+        Test that an unsolvable puzzle reports the reason
+        """
+        puzzle = (
+            "009028700806004005003001004600000000020713450000000002300000500"
+            "900400807001250300"
+        )
+        response, status = SudokuAPI.solve({"puzzle": puzzle})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(response["status"], "unsolvable")
+        self.assertIn("reason", response)
+        self.assertIn("error", response)
+
+    def test_invalid_requests(self):
+        """
+        Test that bad puzzles and engines are answered with status 400
+        """
+        for data, engine in (
+            ("123", None),
+            ({"puzzle": None}, None),
+            (self.puzzle, "missing"),
+            ("x" * 81, None),
+        ):
+            with self.subTest(data=data, engine=engine):
+                response, status = SudokuAPI.solve(data, engine)
+                self.assertEqual(status, 400)
+                self.assertEqual(response["status"], "invalid")
+                self.assertIn("error", response)
+
+    def test_budgets(self):
+        """
+        Test that the smaller of the requested and server budgets
+        applies and bad budgets are answered with status 400
+        """
+        response, status = SudokuAPI.solve(
+            {"puzzle": self.puzzle, "max_nodes": 2, "engine": "backtrack"},
+            max_nodes=100,
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(response["status"], "budget_exceeded")
+        self.assertEqual(response["reason"]["limit"], 2)
+        self.assertEqual(response["stats"]["nodes"], 2)
+
+        response, _ = SudokuAPI.solve(
+            {"puzzle": self.puzzle, "engine": "backtrack"}, max_nodes=2
+        )
+        self.assertEqual(response["status"], "budget_exceeded")
+
+        for budget in ({"timeout": -1}, {"max_nodes": "10"}):
+            with self.subTest(budget=budget):
+                _, status = SudokuAPI.solve({"puzzle": self.puzzle, **budget})
+                self.assertEqual(status, 400)
+
+    def test_solve_batch_ndjson(self):
+        """
+        Test that NDJSON lines are answered in order with
+        bad lines reported inline
+        """
+        body = [
+            json.dumps(self.puzzle).encode() + b"\n",
+            b"\n",
+            b"not json\n",
+            json.dumps({"puzzle": "123"}).encode() + b"\n",
+            json.dumps({"puzzle": self.puzzle, "engine": "dlx"}).encode(),
+        ]
+        puzzles = SudokuAPI.read_ndjson(body)
+        lines = list(SudokuAPI.solve_batch(puzzles))
+        results = [json.loads(line) for line in lines]
+
+        self.assertTrue(all(line.endswith("\n") for line in lines))
+        self.assertEqual([result["index"] for result in results], [0, 1, 2, 3])
+        self.assertEqual(
+            [result["status"] for result in results],
+            ["solved", "invalid", "invalid", "solved"],
+        )
+        self.assertIn("Invalid JSON", results[1]["error"])
+        self.assertEqual(results[0]["solution"], results[3]["solution"])
+
+    def test_solve_batch_limit(self):
+        """
+        Test that a batch over the puzzle limit is cut off with an error
+        """
+        results = [
+            json.loads(line)
+            for line in SudokuAPI.solve_batch([self.puzzle] * 3, None, 2)
+        ]
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[1]["status"], "solved")
+        self.assertEqual(results[2]["status"], "invalid")
+        self.assertIn("limited to 2", results[2]["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
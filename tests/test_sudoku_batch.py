@@ -0,0 +1,304 @@
+import json
+import unittest
+from sudoku_batch import SudokuBatch
+
+
+class TestSudokuBatch(unittest.TestCase):
+    """
+    Test cases for the SudokuBatch class
+
+    The SudokuBatch class is responsible for solving many puzzles
+    written one per line and reporting a status for each of them.
+
+    These tests ensure results come back in input order and that
+    invalid or unsolvable puzzles do not stop the run.
+    """
+
+    def test_solve_file_statuses(self):
+        """
+        Test that every puzzle in the batch file gets
+        its own status in the order of the input
+        """
+        batch = SudokuBatch()
+        results = list(batch.solve_file("data/batch_puzzles.txt"))
+
+        self.assertEqual(
+            [result["status"] for result in results],
+            [
+                "solved",
+                "solved",
+                "solved",
+                "unsolvable",
+                "invalid",
+                "invalid",
+                "invalid",
+            ],
+        )
+
+    def test_solve_puzzle_solution(self):
+        """
+        Test that a puzzle written with "." for blanks is
+        normalised and solved to the expected solution
+        """
+        batch = SudokuBatch("backtrack")
+        puzzle = (
+            ".....7........95.4....5.169.8....3.5.75...29.4.6....8."
+            "762.8....1.39........6....."
+        )
+        result = batch.solve_puzzle(puzzle)
+
+        self.assertEqual(result["status"], "solved")
+        self.assertEqual(result["puzzle"], puzzle.replace(".", "0"))
+        self.assertEqual(
+            result["solution"],
+            "594167832618239574237458169981726345375841296"
+            "426395781762584913143972658859613427",
+        )
+
+    def test_invalid_puzzle_error(self):
+        """
+        Test that invalid puzzles report the
+        same error message as SudokuBoard
+        """
+        batch = SudokuBatch()
+        result = batch.solve_puzzle("0b0" + "0" * 78)
+
+        self.assertEqual(result["status"], "invalid")
+        self.assertEqual(
+            result["error"], "Invalid character found at(0, 1): b"
+        )
+
+    def test_board_sizes(self):
+        """
+        Test that puzzles of several sizes are solved in one run,
+        normalised to one character per cell, and the cache is
+        skipped for the sizes it cannot key
+        """
+        small = "...31...41......"
+        cells = ["0"] * 256
+        cells[0], cells[17] = "16", "10"
+        batch = SudokuBatch(cache_size=8)
+        results = list(
+            batch.solve_puzzles([small, ",".join(cells), small.upper()])
+        )
+
+        self.assertEqual(
+            [result["status"] for result in results], ["solved"] * 3
+        )
+        self.assertEqual(results[0]["puzzle"], small.replace(".", "0"))
+        self.assertEqual(results[0]["solution"], "2413132441323241")
+        self.assertEqual(results[1]["puzzle"][:18], "G" + "0" * 16 + "A")
+        self.assertEqual(len(results[1]["solution"]), 256)
+        self.assertEqual(batch.cache.hits, 0)
+
+    def test_workers_keep_input_order(self):
+        """
+        Test that a worker pool returns the same results in
+        the same order as solving in a single process
+        """
+        batch = SudokuBatch()
+        expected = list(batch.solve_file("data/batch_puzzles.txt"))
+        results = list(
+            batch.solve_file("data/batch_puzzles.txt", workers=2, chunk_size=2)
+        )
+
+        self.assertEqual(results, expected)
+        self.assertEqual(
+            sum(stats["puzzles"] for stats in batch.worker_stats.values()),
+            len(expected),
+        )
+
+    def test_workers_unordered(self):
+        """
+        Test that unordered results contain every puzzle
+        """
+        batch = SudokuBatch()
+        expected = list(batch.solve_file("data/batch_puzzles.txt"))
+        results = list(
+            batch.solve_file(
+                "data/batch_puzzles.txt",
+                workers=2,
+                chunk_size=1,
+                ordered=False,
+            )
+        )
+
+        self.assertCountEqual(
+            [result["puzzle"] for result in results],
+            [result["puzzle"] for result in expected],
+        )
+
+    def test_chunk_done(self):
+        """
+        Test that the chunk hook runs once every result of a
+        chunk has been yielded
+        """
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                batch = SudokuBatch()
+                seen = []
+                batch.chunk_done = lambda: seen.append(len(results))
+                results = []
+                for result in batch.solve_file(
+                    "data/batch_puzzles.txt", workers=workers, chunk_size=3
+                ):
+                    results.append(result)
+                self.assertEqual(seen, [3, 6, len(results)])
+
+    def test_workers_read_ahead_bounded(self):
+        """
+        Test that worker processes are sent a bounded number of
+        chunks ahead of the results read
+        """
+        puzzle = (
+            "000007000000009504000050169080000305075000290406000080762080000"
+            "103900000000600000"
+        )
+        read = []
+
+        def puzzles():
+            for _ in range(40):
+                read.append(puzzle)
+                yield puzzle
+
+        for ordered in (True, False):
+            with self.subTest(ordered=ordered):
+                read.clear()
+                results = SudokuBatch().solve_puzzles(
+                    puzzles(), workers=2, chunk_size=1, ordered=ordered
+                )
+                next(results)
+                self.assertLessEqual(
+                    len(read), 2 * SudokuBatch.CHUNKS_PER_WORKER + 1
+                )
+                self.assertEqual(len(list(results)), 39)
+
+    def test_invalid_workers(self):
+        """
+        Test that a worker count below one raises a ValueError
+        """
+        batch = SudokuBatch()
+
+        with self.assertRaises(ValueError):
+            list(batch.solve_puzzles(["0" * 81], workers=0))
+
+    def test_check_unique(self):
+        """
+        Test that solved puzzles report whether
+        their solution is unique
+        """
+        batch = SudokuBatch(check_unique=True)
+        _, _, (empty, valid) = batch.solve_chunk(
+            [
+                "0" * 81,
+                "000007000000009504000050169080000305075000290"
+                "406000080762080000103900000000600000",
+            ]
+        )
+
+        self.assertFalse(empty["unique"])
+        self.assertTrue(valid["unique"])
+        self.assertTrue(
+            SudokuBatch.format_result(empty).endswith("\tmultiple\n")
+        )
+
+    def test_check_unique_budget(self):
+        """
+        Test that the uniqueness count is bounded by the budget
+        of the solve and reported when it runs out
+        """
+        puzzle = (
+            "8..........36......7..9.2...5...7.......457.....1...3...1....68"
+            "..85...1..9....4.."
+        )
+        # the solve takes 90 nodes and the count of two solutions 161
+        solved = SudokuBatch(max_nodes=120).solve_puzzle(puzzle)
+        self.assertEqual(solved["status"], "solved")
+
+        batch = SudokuBatch(check_unique=True, max_nodes=120)
+        result = batch.solve_puzzle(puzzle)
+        self.assertEqual(result["status"], "budget_exceeded")
+        self.assertEqual(result["reason"]["budget"], "nodes")
+
+        batch = SudokuBatch(check_unique=True, timeout=0)
+        result = batch.solve_puzzle(puzzle)
+        self.assertEqual(result["status"], "budget_exceeded")
+        self.assertEqual(result["reason"]["budget"], "time")
+
+    def test_cache_repeated_puzzles(self):
+        """
+        Test that a repeated puzzle is answered from the cache
+        with the same solution
+        """
+        batch = SudokuBatch(cache_size=8)
+        puzzle = (
+            "000007000000009504000050169080000305075000290406000080762080000"
+            "103900000000600000"
+        )
+        first = batch.solve_puzzle(puzzle)
+        second = batch.solve_puzzle(puzzle)
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["solution"], second["solution"])
+
+    def test_node_budget(self):
+        """
+        Test that puzzles out of budget are reported without
+        stopping the batch, also from worker processes
+        """
+        batch = SudokuBatch("backtrack", max_nodes=2)
+        puzzle = (
+            "000007000000009504000050169080000305075000290406000080762080000"
+            "103900000000600000"
+        )
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = list(
+                    batch.solve_puzzles([puzzle] * 3, workers=workers)
+                )
+                self.assertEqual(
+                    [result["status"] for result in results],
+                    ["budget_exceeded"] * 3,
+                )
+                self.assertEqual(results[0]["reason"]["budget"], "nodes")
+
+    def test_format_result(self):
+        """
+        Test that results are formatted as tab separated lines
+        """
+        result = {"puzzle": "0" * 81, "status": "invalid", "error": "error"}
+
+        self.assertEqual(
+            SudokuBatch.format_result(result), "0" * 81 + "\tinvalid\terror\n"
+        )
+
+    def test_format_result_modes(self):
+        """
+        Test that results are formatted as CSV with quoted
+        messages and as JSON
+        """
+        result = {
+            "puzzle": "0" * 81,
+            "status": "invalid",
+            "error": 'Invalid character found at(0, 1): "',
+        }
+
+        self.assertEqual(
+            SudokuBatch.format_result(result, "csv"),
+            "0" * 81 + ',invalid,"Invalid character found at(0, 1): """\n',
+        )
+        self.assertEqual(
+            json.loads(SudokuBatch.format_result(result, "json")), result
+        )
+        self.assertEqual(
+            SudokuBatch.format_header("csv", True),
+            "puzzle,status,detail,unique\n",
+        )
+        self.assertEqual(SudokuBatch.format_header("line"), "")
+        with self.assertRaises(ValueError):
+            SudokuBatch.format_result(result, "grid")
+
+
+if __name__ == "__main__":
+    unittest.main()
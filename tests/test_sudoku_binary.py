@@ -0,0 +1,154 @@
+import io
+import os
+import tempfile
+import unittest
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_binary import SudokuBinary
+from sudoku_batch import SudokuBatch
+from sudoku_grid import SudokuGrid
+
+
+class TestSudokuBinary(unittest.TestCase):
+    """
+    Test cases for the SudokuBinary class
+
+    The SudokuBinary class is responsible for storing validated
+    puzzles in fixed width records of a memory mapped file.
+
+    These tests ensure puzzles survive the conversion to and from
+    text and batches of binary files solve like their text files.
+    """
+
+    def setUp(self):
+        """
+        Creates a temporary directory for the binary files
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def convert(self, packed):
+        """
+        Converts the batch puzzles to a binary file
+        """
+        filename = os.path.join(self.directory, f"puzzles-{packed}.sdkb")
+        counts = SudokuBinary.from_text(
+            "data/batch_puzzles.txt", filename, packed
+        )
+        return filename, counts
+
+    def test_round_trip(self):
+        """
+        Test that valid puzzles are stored in both encodings and
+        written back as the same text, invalid ones are skipped
+        """
+        for packed in (False, True):
+            with self.subTest(packed=packed):
+                filename, counts = self.convert(packed)
+                self.assertEqual(counts, (4, 3))
+                self.assertEqual(
+                    os.path.getsize(filename), 16 + 4 * (41 if packed else 81)
+                )
+
+                output = io.StringIO()
+                with SudokuBinary(filename) as binary:
+                    self.assertEqual(len(binary), 4)
+                    self.assertTrue(binary.packed == packed)
+                    binary.to_text(output)
+
+                lines = output.getvalue().splitlines()
+                expected = [
+                    line.replace(".", "0")
+                    for _, line in SudokuReader.read_puzzles_from_file(
+                        "data/batch_puzzles.txt"
+                    )
+                ][:4]
+                self.assertEqual(lines, expected)
+
+    def test_board_grid(self):
+        """
+        Test that records of both encodings are read as grids of the
+        cells written
+        """
+        board = SudokuBoard(SudokuReader("data/valid_board.txt").board).board
+        for packed in (False, True):
+            with self.subTest(packed=packed):
+                filename = os.path.join(self.directory, f"one-{packed}.sdkb")
+                SudokuBinary.write(filename, [board], packed)
+                with SudokuBinary(filename) as binary:
+                    grid = binary.board(0)
+                self.assertIsInstance(grid, SudokuGrid)
+                self.assertEqual(grid, board)
+
+    def test_grid_text(self):
+        """
+        Test that grids written by SudokuFormat are read back
+        """
+        filename, _ = self.convert(True)
+        output = io.StringIO()
+        with SudokuBinary(filename) as binary:
+            binary.to_text(output, "grid")
+            boards = list(binary.boards())
+
+        puzzles = SudokuReader.parse_puzzle_lines(
+            output.getvalue().splitlines()
+        )
+        self.assertEqual(
+            [puzzle for _, puzzle in puzzles],
+            ["".join(str(n) for row in b for n in row) for b in boards],
+        )
+
+    def test_bad_files(self):
+        """
+        Test that text, truncated and corrupt files are rejected
+        """
+        self.assertFalse(SudokuBinary.is_binary("data/batch_puzzles.txt"))
+        with self.assertRaises(ValueError):
+            SudokuBinary("data/batch_puzzles.txt")
+
+        filename, _ = self.convert(False)
+        self.assertTrue(SudokuBinary.is_binary(filename))
+        with open(filename, "rb") as file:
+            data = file.read()
+
+        truncated = os.path.join(self.directory, "truncated.sdkb")
+        with open(truncated, "wb") as file:
+            file.write(data[:-1])
+        with self.assertRaises(ValueError):
+            SudokuBinary(truncated)
+
+        corrupt = os.path.join(self.directory, "corrupt.sdkb")
+        with open(corrupt, "wb") as file:
+            file.write(data[:-1] + b"\x0a")
+        with SudokuBinary(corrupt) as binary:
+            binary.board(2)
+            with self.assertRaises(ValueError):
+                binary.board(3)
+
+    def test_batch_solves_binary(self):
+        """
+        Test that a binary file gives the results of its text file,
+        also when workers map slices of it
+        """
+        batch = SudokuBatch()
+        expected = list(batch.solve_file("data/batch_puzzles.txt"))[:4]
+
+        for packed in (False, True):
+            filename, _ = self.convert(packed)
+            for workers in (1, 2):
+                with self.subTest(packed=packed, workers=workers):
+                    results = batch.solve_file(
+                        filename, workers=workers, chunk_size=3
+                    )
+                    self.assertEqual(
+                        [(r["puzzle"], r["status"]) for r in results],
+                        [
+                            (r["puzzle"].replace(".", "0"), r["status"])
+                            for r in expected
+                        ],
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,407 @@
+import copy
+import unittest
+import warnings
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_algorithm import SudokuAlgorithm
+from sudoku_bitmask import SudokuBitmaskAlgorithm
+from sudoku_stats import SudokuStats
+
+
+class TestSudokuBitmaskAlgorithm(unittest.TestCase):
+    """
+    Test cases for the SudokuBitmaskAlgorithm class
+
+    The SudokuBitmaskAlgorithm class solves a sudoku board with the same
+    MRV backtracking search as SudokuAlgorithm but keeps row, column
+    and 3x3 square bitmasks instead of rescanning the board.
+
+    These tests ensure the bitmask engine agrees with the
+    original algorithm on every board in the data directory.
+    """
+
+    solvable_files = [
+        "data/valid_board.txt",
+        "data/input.txt",
+        "data/solved_board.txt",
+        "data/empty_board.txt",
+        "data/less_than_17_board.txt",
+        "data/fast_unsolvable_board.txt",
+        "data/slow_unsolvable_board.txt",
+    ]
+
+    # hard puzzle from Arto Inkala that needs many guesses
+    hard_puzzle = (
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68"
+        "..85...1..9....4.."
+    )
+
+    def load_board(self, filename):
+        """
+        Reads and validates a board from the data directory
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            reader = SudokuReader(filename)
+            return SudokuBoard(reader.board).board
+
+    def test_check_possible_indicies_matches(self):
+        """
+        Test that the bitmask check agrees with the
+        rescanning check for every cell and number
+        """
+        board = self.load_board("data/valid_board.txt")
+        solver = SudokuAlgorithm(copy.deepcopy(board))
+        bitmask_solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+
+        for y in range(9):
+            for x in range(9):
+                for n in range(1, 10):
+                    self.assertEqual(
+                        bitmask_solver.check_possible_indicies(x, y, n),
+                        solver.check_possible_indicies(x, y, n),
+                    )
+
+    def test_find_mrv_cell_matches(self):
+        """
+        Test that the bitmask engine selects the same MRV cell
+        """
+        board = self.load_board("data/valid_board.txt")
+        solver = SudokuAlgorithm(copy.deepcopy(board))
+        bitmask_solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+
+        self.assertEqual(
+            bitmask_solver.find_mrv_cell(), solver.find_mrv_cell()
+        )
+
+    def assert_valid_solution(self, puzzle, solution):
+        """
+        Asserts that a solution keeps the clues of the
+        puzzle and holds each digit once per unit
+        """
+        digits = set(range(1, 10))
+        for y in range(9):
+            self.assertEqual(set(solution[y]), digits)
+            self.assertEqual({solution[i][y] for i in range(9)}, digits)
+            for x in range(9):
+                if puzzle[y][x]:
+                    self.assertEqual(solution[y][x], puzzle[y][x])
+        for i in range(0, 9, 3):
+            for j in range(0, 9, 3):
+                square = {
+                    solution[i + a][j + b] for a in range(3) for b in range(3)
+                }
+                self.assertEqual(square, digits)
+
+    def test_solve_sudoku_matches(self):
+        """
+        Test that the bitmask engine without propagation returns the
+        same result and board as SudokuAlgorithm for every board in data/
+        """
+        for filename in self.solvable_files:
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuAlgorithm(copy.deepcopy(board))
+                bitmask_solver = SudokuBitmaskAlgorithm(
+                    copy.deepcopy(board), propagate=False
+                )
+
+                self.assertEqual(
+                    bitmask_solver.solve_sudoku(), solver.solve_sudoku()
+                )
+                self.assertEqual(bitmask_solver.board, solver.board)
+
+    def test_propagation_solves_data_boards(self):
+        """
+        Test that propagation gives the same answer as SudokuAlgorithm
+        for every board in data/, including the boards with several
+        solutions, and that placing hidden singles finds a valid one
+        """
+        for filename in self.solvable_files:
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuAlgorithm(copy.deepcopy(board))
+                bitmask_solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+                hidden_solver = SudokuBitmaskAlgorithm(
+                    copy.deepcopy(board), place_hidden=True
+                )
+
+                solved = solver.solve_sudoku()
+                self.assertEqual(bitmask_solver.solve_sudoku(), solved)
+                self.assertEqual(hidden_solver.solve_sudoku(), solved)
+                if not solved:
+                    self.assertEqual(bitmask_solver.board, board)
+                    self.assertEqual(hidden_solver.board, board)
+                else:
+                    self.assertEqual(bitmask_solver.board, solver.board)
+                    self.assert_valid_solution(board, hidden_solver.board)
+
+    def test_propagation_stats(self):
+        """
+        Test that forced moves and guesses are counted
+        """
+        board = self.load_board("data/valid_board.txt")
+        solver = SudokuBitmaskAlgorithm(board)
+        solver.solve_sudoku()
+        stats = solver.stats
+
+        self.assertGreater(stats.forced_moves, 0)
+        self.assertEqual(
+            stats.forced_moves,
+            stats.naked_singles + stats.hidden_singles,
+        )
+        self.assertGreaterEqual(stats.max_propagation_depth, 1)
+
+    def test_propagate_detects_contradiction(self):
+        """
+        Test that propagation reports a contradiction on
+        a board where a cell has no candidates left
+        """
+        board = self.load_board("data/fast_unsolvable_board.txt")
+        solver = SudokuBitmaskAlgorithm(board)
+        solvable, trail = solver.propagate()
+
+        self.assertFalse(solvable)
+        self.assertEqual(solver.stats.contradictions, 1)
+        solver.undo(trail)
+        self.assertEqual(
+            solver.board, self.load_board("data/fast_unsolvable_board.txt")
+        )
+
+    def test_unsolvable_boards_name_cell(self):
+        """
+        Test that both unsolvable boards in data/ are proven
+        unsolvable before any guess and name the empty cell
+        """
+        expected = {
+            "data/fast_unsolvable_board.txt": (4, 0),
+            "data/slow_unsolvable_board.txt": (3, 5),
+        }
+        for filename, cell in expected.items():
+            with self.subTest(filename=filename):
+                solver = SudokuBitmaskAlgorithm(self.load_board(filename))
+                result = solver.solve()
+
+                self.assertFalse(result.solved)
+                self.assertEqual(result.reason["kind"], "cell")
+                self.assertEqual(
+                    (result.reason["row"], result.reason["column"]), cell
+                )
+                self.assertEqual(solver.stats.guesses, 0)
+
+    def test_unsolvable_board_names_unit(self):
+        """
+        Test that a digit with no possible cell in a
+        row is reported with the row and the digit
+        """
+        rows = ["000456789", "100000000"] + ["000000000"] * 7
+        board = [[int(n) for n in row] for row in rows]
+        solver = SudokuBitmaskAlgorithm(board)
+        result = solver.solve()
+
+        self.assertFalse(solver.solve_sudoku())
+        self.assertEqual(
+            (
+                result.reason["kind"],
+                result.reason["index"],
+                result.reason["digit"],
+            ),
+            ("row", 0, 1),
+        )
+
+    def test_count_solutions(self):
+        """
+        Test that solutions are counted up to the limit
+        and the board is left unchanged
+        """
+        expected = {
+            "data/valid_board.txt": 1,
+            "data/solved_board.txt": 1,
+            "data/empty_board.txt": 2,
+            "data/less_than_17_board.txt": 2,
+            "data/fast_unsolvable_board.txt": 0,
+        }
+        for filename, count in expected.items():
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+
+                self.assertEqual(solver.count_solutions(2), count)
+                self.assertEqual(solver.board, board)
+
+        board = self.load_board("data/empty_board.txt")
+        solver = SudokuBitmaskAlgorithm(board)
+        self.assertEqual(solver.count_solutions(limit=5), 5)
+        with self.assertRaises(ValueError):
+            solver.count_solutions(0)
+
+    def test_solve_unique(self):
+        """
+        Test that a solve that also tells if the solution is unique
+        gives the board and result of solve in a single search
+        """
+        expected = {
+            "data/valid_board.txt": True,
+            "data/less_than_17_board.txt": False,
+            "data/fast_unsolvable_board.txt": None,
+        }
+        for filename, unique in expected.items():
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+                result = solver.solve()
+
+                counter = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+                nodes = counter.count_solutions(2) and counter.stats.nodes
+                checker = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+                self.assertEqual(checker.solve_unique(), unique)
+                self.assertEqual(checker.result.status, result.status)
+                self.assertEqual(checker.result.reason, result.reason)
+                self.assertEqual(checker.board, solver.board)
+                if unique is not None:
+                    self.assertEqual(checker.stats.nodes, nodes)
+                    # the masks follow the solved board
+                    self.assertIsNone(checker.find_mrv_cell())
+                    self.assertTrue(checker.solve().solved)
+
+    def test_count_budget(self):
+        """
+        Test that a count out of budget is stopped with the board
+        restored and the budget exceeded result stored
+        """
+        puzzle = SudokuReader.parse_puzzle_line(self.hard_puzzle)
+        board = SudokuBoard(puzzle).board
+        solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+
+        self.assertIsNone(solver.count_solutions(2, max_nodes=5))
+        self.assertEqual(solver.result.status, "budget_exceeded")
+        self.assertEqual(solver.result.reason["budget"], "nodes")
+        self.assertEqual(solver.result.stats["nodes"], 5)
+        self.assertEqual(solver.board, board)
+        self.assertFalse(solver.paused)
+
+        self.assertIsNone(solver.count_solutions(2, timeout=0))
+        self.assertEqual(solver.result.reason["budget"], "time")
+
+        # a large enough budget counts the solution
+        self.assertEqual(solver.count_solutions(2, max_nodes=10**6), 1)
+
+    def test_pause_and_resume(self):
+        """
+        Test that a hard puzzle searched in small node budgets gives
+        the same solution and statistics as an uninterrupted solve
+        """
+        puzzle = SudokuReader.parse_puzzle_line(self.hard_puzzle)
+        board = SudokuBoard(puzzle).board
+        for propagate in (True, False):
+            with self.subTest(propagate=propagate):
+                solver = SudokuBitmaskAlgorithm(
+                    copy.deepcopy(board), propagate
+                )
+                solver.solve()
+
+                paused = SudokuBitmaskAlgorithm(
+                    copy.deepcopy(board), propagate
+                )
+                paused.start()
+                result = None
+                while result is None:
+                    result = paused.resume(max_nodes=7)
+
+                self.assertTrue(result.solved)
+                self.assertEqual(paused.board, solver.board)
+                for name in SudokuStats.COUNTERS:
+                    self.assertEqual(
+                        getattr(paused.stats, name),
+                        getattr(solver.stats, name),
+                    )
+
+    def test_timeout_pauses_search(self):
+        """
+        Test that a search out of time pauses and can be abandoned
+        """
+        board = self.load_board("data/empty_board.txt")
+        solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+        solver.start()
+
+        self.assertIsNone(solver.resume(timeout=0))
+        self.assertTrue(solver.paused)
+        solver.abandon()
+        self.assertEqual(solver.board, board)
+
+    def test_node_budget(self):
+        """
+        Test that a search out of nodes is stopped with the board
+        restored and the statistics so far
+        """
+        puzzle = SudokuReader.parse_puzzle_line(self.hard_puzzle)
+        board = SudokuBoard(puzzle).board
+        solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+        result = solver.solve(max_nodes=5)
+
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertEqual(result.reason["budget"], "nodes")
+        self.assertEqual(result.stats["nodes"], 5)
+        self.assertEqual(solver.board, board)
+        self.assertFalse(solver.paused)
+
+        # a large enough budget solves the board
+        self.assertTrue(solver.solve(max_nodes=10**6).solved)
+
+    def test_time_budget(self):
+        """
+        Test that a search out of time is stopped with the board restored
+        """
+        board = self.load_board("data/empty_board.txt")
+        solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+        result = solver.solve(timeout=0)
+
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertEqual(result.reason["budget"], "time")
+        self.assertEqual(solver.board, board)
+
+    def test_no_board(self):
+        """
+        Test that the bitmask engine raises a
+        ValueError when no board is given
+        """
+        solver = SudokuBitmaskAlgorithm(None)
+
+        self.assertFalse(solver.check_possible_indicies(0, 0, 1))
+        with self.assertRaises(ValueError):
+            solver.solve_sudoku()
+
+    def test_board_sizes(self):
+        """
+        Test that 4x4 and 16x16 boards are solved, agreeing with the
+        original algorithm, and unsolvable ones name a unit
+        """
+        for filename in ("data/input_4x4.txt", "data/input_16x16.txt"):
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuBitmaskAlgorithm(copy.deepcopy(board))
+                self.assertTrue(solver.solve_sudoku())
+
+                # every number once in each unit and the clues kept
+                rows = [[str(n) for n in row] for row in solver.board]
+                self.assertEqual(SudokuBoard(rows).board, solver.board)
+                self.assertTrue(all(all(row) for row in solver.board))
+                for row, solved in zip(board, solver.board):
+                    for n, m in zip(row, solved):
+                        self.assertIn(n, (0, m))
+
+        original = SudokuAlgorithm(self.load_board("data/input_4x4.txt"))
+        bitmask = SudokuBitmaskAlgorithm(self.load_board("data/input_4x4.txt"))
+        self.assertTrue(original.solve_sudoku() and bitmask.solve_sudoku())
+        self.assertEqual(bitmask.board, original.board)
+
+        # 1 and 2 fill the first row, leaving no cell for 1 in row 1
+        board = [[0, 0, 1, 2], [0, 0, 0, 0], [1, 0, 0, 0], [0, 1, 0, 0]]
+        result = SudokuBitmaskAlgorithm(board).solve()
+        self.assertFalse(result.solved)
+        self.assertIn(result.reason["kind"], ("row", "column", "square"))
+        self.assertEqual(board[1], [0, 0, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
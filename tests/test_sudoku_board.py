@@ -1,7 +1,7 @@
 import unittest
 import warnings
-from src.sudoku_reader import SudokuReader
-from src.sudoku_board import SudokuBoard
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
 
 
 class TestSudokuBoard(unittest.TestCase):
@@ -116,6 +116,53 @@ class TestSudokuBoard(unittest.TestCase):
             assert "Warning: Board has less than 17 starting values. "
             "May have multiple solutions." in str(w[-1].message)
 
+    def test_load_board_reuses_instance(self):
+        """
+        Test that a SudokuBoard can load and validate
+        a second board after it has been created
+        """
+        board = SudokuBoard(SudokuReader("data/valid_board.txt").board)
+        board.load_board(SudokuReader("data/solved_board.txt").board)
+
+        self.assertEqual(board.board[0], [5, 9, 4, 1, 6, 7, 8, 3, 2])
+        with self.assertRaises(ValueError):
+            board.load_board(SudokuReader("data/invalid_row_board.txt").board)
+
+    def test_board_sizes(self):
+        """
+        Test that 4x4 and 16x16 boards are validated with their own
+        squares and letters are only numbers above 9 x 9
+        """
+        board = SudokuBoard(SudokuReader("data/input_4x4.txt").board)
+        self.assertEqual(board.board[0], [0, 0, 0, 3])
+
+        board.load_board(SudokuReader("data/input_16x16.txt").board)
+        self.assertEqual(len(board.board), 16)
+        self.assertEqual(board.board[0][:4], [0, 0, 5, 14])
+
+        # 10 written as a number and as a letter in the same row
+        rows = [["0"] * 16 for _ in range(16)]
+        rows[0][0], rows[0][1] = "10", "a"
+        with self.assertRaises(ValueError) as error:
+            SudokuBoard(rows)
+        self.assertEqual(
+            str(error.exception), "Duplicate number found in row: 0"
+        )
+
+        rows[0][1] = "H"
+        with self.assertRaises(ValueError):
+            SudokuBoard(rows)
+
+        with self.assertRaises(ValueError) as error:
+            SudokuBoard([["1", "0", "0", "0"], ["0", "1", "0", "0"]] * 2)
+        self.assertEqual(
+            str(error.exception), "Duplicate number found in 2x2 square: 0"
+        )
+
+        with self.assertRaises(ValueError) as error:
+            SudokuBoard([["0"] * 5] * 5)
+        self.assertEqual(str(error.exception), "Board size is not 9 x 9")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,148 @@
+import unittest
+import warnings
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_batch import SudokuBatch
+
+try:
+    from sudoku_bulk import SudokuBulk
+except ImportError:
+    SudokuBulk = None
+
+
+@unittest.skipIf(SudokuBulk is None, "numpy is not installed")
+class TestSudokuBulk(unittest.TestCase):
+    """
+    Test cases for the SudokuBulk class
+
+    The SudokuBulk class is responsible for parsing and validating a
+    whole file of one line puzzles at once with array operations.
+
+    These tests ensure every puzzle is accepted or rejected exactly
+    as SudokuBoard would, with the same error message.
+    """
+
+    puzzle = (
+        "000007000000009504000050169080000305075000290406000080762080000"
+        "103900000000600000"
+    )
+
+    def reference(self, line):
+        """
+        Validates a puzzle line with SudokuBoard
+        """
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                rows = SudokuReader.parse_puzzle_line(line)
+                return SudokuBoard(rows).board, None
+        except ValueError as error:
+            return None, str(error)
+
+    def test_matches_sudoku_board(self):
+        """
+        Test that each puzzle gets the board or error
+        message SudokuBoard gives it
+        """
+        lines = [
+            self.puzzle,
+            self.puzzle.replace("0", "."),
+            "0" * 81,
+            # duplicates in a row, a column and a 3x3 square
+            "11" + "0" * 79,
+            "1" + "0" * 8 + "1" + "0" * 71,
+            "1" + "0" * 9 + "1" + "0" * 70,
+            # a column duplicate found before a later row duplicate
+            "1" + "0" * 8 + "1" + "0" * 8 + "22" + "0" * 61,
+            # invalid characters
+            "0x" + "0" * 79,
+            "0 0" + "0" * 78,
+            "0" * 40 + "٣" + "0" * 40,
+            "0" * 40 + "é" + "0" * 40,
+            # bad sizes, with and without invalid characters
+            "0" * 80,
+            "0" * 82,
+            "123",
+            "0" * 9 + "x" + "0" * 5,
+            # cells separated by spaces or commas
+            "0 0" + "0" * 78,
+            ",".join("0" * 81),
+        ]
+        bulk = SudokuBulk(line.encode() for line in lines)
+
+        self.assertEqual(len(bulk), len(lines))
+        for index, line in enumerate(lines):
+            with self.subTest(line=line):
+                board, error = self.reference(line)
+                if error is None:
+                    self.assertNotIn(index, bulk.errors)
+                    self.assertEqual(bulk.boards[index].tolist(), board)
+                else:
+                    self.assertEqual(bulk.errors[index], (line, error))
+
+        self.assertEqual(
+            list(bulk.valid_boards()),
+            [
+                self.reference(line)[0]
+                for line in lines[:3] + lines[9:10] + lines[-1:]
+            ],
+        )
+
+    def test_other_sizes_rejected(self):
+        """
+        Test that valid puzzles of other sizes than 9 x 9 are
+        reported instead of stored in the array of 9 x 9 boards
+        """
+        bulk = SudokuBulk([b"...31...41......", b"0" * 81])
+
+        self.assertEqual(bulk.valid.tolist(), [False, True])
+        self.assertEqual(
+            bulk.errors[0][1],
+            "Board size 4 x 4 is not supported by bulk validation",
+        )
+
+    def test_chunks_and_line_numbers(self):
+        """
+        Test that blank lines and comments are skipped and results
+        do not depend on the chunk size
+        """
+        lines = [b"# puzzles", self.puzzle.encode(), b"", b"  11" + b"0" * 79]
+        lines = lines * 4
+
+        whole = SudokuBulk(lines)
+        chunked = SudokuBulk(lines, chunk_size=3)
+
+        self.assertEqual(whole.line_numbers, [2, 4, 6, 8, 10, 12, 14, 16])
+        self.assertEqual(chunked.line_numbers, whole.line_numbers)
+        self.assertEqual(chunked.errors, whole.errors)
+        self.assertEqual(chunked.boards.tolist(), whole.boards.tolist())
+        self.assertEqual(whole.valid.tolist(), [True, False] * 4)
+        with self.assertRaises(ValueError):
+            SudokuBulk(lines, chunk_size=0)
+
+    def test_batch_bulk_matches_file(self):
+        """
+        Test that a bulk batch gives the same results in the same
+        order as validating each puzzle on its own
+        """
+        batch = SudokuBatch()
+        expected = list(batch.solve_file("data/batch_puzzles.txt"))
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                results = batch.solve_file(
+                    "data/batch_puzzles.txt", bulk=True, workers=workers
+                )
+                self.assertEqual(list(results), expected)
+
+        unordered = batch.solve_file(
+            "data/batch_puzzles.txt", bulk=True, ordered=False
+        )
+        self.assertEqual(
+            sorted(result["puzzle"] for result in unordered),
+            sorted(result["puzzle"] for result in expected),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import random
+import unittest
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_bitmask import SudokuBitmaskAlgorithm
+from sudoku_cache import SudokuCache
+
+
+class TestSudokuCache(unittest.TestCase):
+    """
+    Test cases for the SudokuCache class
+
+    The SudokuCache class is responsible for caching solutions
+    by the canonical form of each puzzle.
+
+    These tests ensure equivalent puzzles share a cache entry,
+    cached solutions are mapped back to each caller's orientation
+    and the least recently used entry is evicted.
+    """
+
+    def load_board(self):
+        """
+        Reads and validates the valid board from the data directory
+        """
+        reader = SudokuReader("data/valid_board.txt")
+        return SudokuBoard(reader.board).board
+
+    def shuffle(self, board, rng):
+        """
+        Relabels, permutes and possibly transposes a board
+        """
+        bands = rng.sample(range(3), 3)
+        rows = [b * 3 + r for b in bands for r in rng.sample(range(3), 3)]
+        stacks = rng.sample(range(3), 3)
+        columns = [s * 3 + c for s in stacks for c in rng.sample(range(3), 3)]
+        digits = [0] + rng.sample(range(1, 10), 9)
+
+        grid = [[digits[board[y][x]] for x in columns] for y in rows]
+        if rng.random() < 0.5:
+            grid = [list(column) for column in zip(*grid)]
+        return grid
+
+    def test_canonical_form_invariant(self):
+        """
+        Test that relabelings, permutations and rotations
+        of a board share its canonical form
+        """
+        board = self.load_board()
+        key, _ = SudokuCache.canonical_form(board)
+        rng = random.Random(0)
+
+        # a quarter turn is a transposition with reversed columns
+        rotated = [list(row)[::-1] for row in zip(*board)]
+        self.assertEqual(SudokuCache.canonical_form(rotated)[0], key)
+
+        for _ in range(20):
+            grid = self.shuffle(board, rng)
+            self.assertEqual(SudokuCache.canonical_form(grid)[0], key)
+
+    def test_apply_and_invert(self):
+        """
+        Test that inverting a transformed board gives the board back
+        """
+        board = self.load_board()
+        grid = self.shuffle(board, random.Random(1))
+        _, transform = SudokuCache.canonical_form(grid)
+
+        canonical = SudokuCache.apply(grid, transform)
+        self.assertEqual(SudokuCache.invert(canonical, transform), grid)
+
+    def test_solution_mapped_to_caller(self):
+        """
+        Test that a cached solution solves an equivalent board
+        """
+        board = self.load_board()
+        solver = SudokuBitmaskAlgorithm([row[:] for row in board])
+        solver.solve_sudoku()
+
+        cache = SudokuCache()
+        self.assertIsNone(cache.get(board))
+        cache.put(board, solver.board)
+
+        grid = self.shuffle(board, random.Random(2))
+        solution = cache.get(grid)
+        expected = SudokuBitmaskAlgorithm([row[:] for row in grid])
+        expected.solve_sudoku()
+
+        self.assertEqual(solution, expected.board)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entry is evicted
+        """
+        boards = []
+        for n in range(1, 4):
+            board = [[0] * 9 for _ in range(9)]
+            for x in range(n):
+                board[0][x] = x + 1
+            boards.append(board)
+
+        cache = SudokuCache(maxsize=2)
+        cache.put(boards[0], boards[0])
+        cache.put(boards[1], boards[1])
+        cache.get(boards[0])
+        cache.put(boards[2], boards[2])
+
+        self.assertIsNotNone(cache.get(boards[0]))
+        self.assertIsNone(cache.get(boards[1]))
+        self.assertEqual(cache.to_dict()["entries"], 2)
+        with self.assertRaises(ValueError):
+            SudokuCache(maxsize=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
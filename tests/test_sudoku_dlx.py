@@ -0,0 +1,241 @@
+import copy
+import unittest
+import warnings
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_dlx import SudokuDLX
+
+
+class TestSudokuDLX(unittest.TestCase):
+    """
+    Test cases for the SudokuDLX class
+
+    The SudokuDLX class solves a sudoku board as an exact cover
+    problem with dancing links.
+
+    These tests ensure it keeps the solve_sudoku() contract of
+    SudokuAlgorithm and restores its matrix between puzzles.
+    """
+
+    expected_board = [
+        [5, 9, 4, 1, 6, 7, 8, 3, 2],
+        [6, 1, 8, 2, 3, 9, 5, 7, 4],
+        [2, 3, 7, 4, 5, 8, 1, 6, 9],
+        [9, 8, 1, 7, 2, 6, 3, 4, 5],
+        [3, 7, 5, 8, 4, 1, 2, 9, 6],
+        [4, 2, 6, 3, 9, 5, 7, 8, 1],
+        [7, 6, 2, 5, 8, 4, 9, 1, 3],
+        [1, 4, 3, 9, 7, 2, 6, 5, 8],
+        [8, 5, 9, 6, 1, 3, 4, 2, 7],
+    ]
+
+    def load_board(self, filename):
+        """
+        Reads and validates a board from the data directory
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            reader = SudokuReader(filename)
+            return SudokuBoard(reader.board).board
+
+    def test_solve_sudoku_solvable(self):
+        """
+        Test that the DLX engine solves a known board
+        """
+        solver = SudokuDLX(self.load_board("data/valid_board.txt"))
+
+        self.assertTrue(solver.solve_sudoku())
+        self.assertEqual(solver.board, self.expected_board)
+
+    def test_solve_sudoku_unsolvable(self):
+        """
+        Test that the DLX engine returns False, leaves the board
+        unchanged and names the first cell it branched on
+        """
+        for filename in (
+            "data/fast_unsolvable_board.txt",
+            "data/slow_unsolvable_board.txt",
+        ):
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuDLX(copy.deepcopy(board))
+                result = solver.solve()
+
+                self.assertFalse(result.solved)
+                self.assertIn(result.reason["kind"], ("cell", "search"))
+                self.assertIn("row", result.reason)
+                self.assertEqual(solver.board, board)
+
+    def test_matrix_reused_across_puzzles(self):
+        """
+        Test that one instance solves several puzzles in turn,
+        which requires the matrix to be fully restored
+        """
+        solver = SudokuDLX(self.load_board("data/fast_unsolvable_board.txt"))
+        self.assertFalse(solver.solve_sudoku())
+
+        for filename in ("data/empty_board.txt", "data/valid_board.txt"):
+            solver.load_board(self.load_board(filename))
+            self.assertTrue(solver.solve_sudoku())
+        self.assertEqual(solver.board, self.expected_board)
+
+    def test_conflicting_clues(self):
+        """
+        Test that starting values repeating a digit
+        in a row are reported as unsolvable
+        """
+        board = [[0] * 9 for _ in range(9)]
+        board[0][0] = board[0][5] = 3
+        result = SudokuDLX(board).solve()
+
+        self.assertFalse(result.solved)
+        self.assertEqual(result.reason["kind"], "clue")
+        self.assertEqual(result.reason["column"], 5)
+
+    def test_count_solutions(self):
+        """
+        Test that solutions are counted up to the limit
+        and the board is left unchanged
+        """
+        expected = {
+            "data/valid_board.txt": 1,
+            "data/solved_board.txt": 1,
+            "data/empty_board.txt": 2,
+            "data/less_than_17_board.txt": 2,
+            "data/fast_unsolvable_board.txt": 0,
+        }
+        for filename, count in expected.items():
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuDLX(copy.deepcopy(board))
+
+                self.assertEqual(solver.count_solutions(2), count)
+                self.assertEqual(solver.board, board)
+
+        board = self.load_board("data/empty_board.txt")
+        solver = SudokuDLX(board)
+        self.assertEqual(solver.count_solutions(limit=5), 5)
+        with self.assertRaises(ValueError):
+            solver.count_solutions(0)
+
+    def test_solve_unique(self):
+        """
+        Test that a solve that also tells if the solution is unique
+        gives the board and result of solve in a single search
+        """
+        expected = {
+            "data/valid_board.txt": True,
+            "data/less_than_17_board.txt": False,
+            "data/fast_unsolvable_board.txt": None,
+        }
+        for filename, unique in expected.items():
+            with self.subTest(filename=filename):
+                board = self.load_board(filename)
+                solver = SudokuDLX(copy.deepcopy(board))
+                result = solver.solve()
+
+                checker = SudokuDLX(copy.deepcopy(board))
+                self.assertEqual(checker.solve_unique(), unique)
+                self.assertEqual(checker.result.status, result.status)
+                self.assertEqual(checker.result.reason, result.reason)
+                self.assertEqual(checker.board, solver.board)
+
+    def test_count_budget(self):
+        """
+        Test that a count out of budget is stopped with the
+        matrix restored and the budget exceeded result stored
+        """
+        board = self.load_board("data/input.txt")
+        solver = SudokuDLX(copy.deepcopy(board))
+
+        self.assertIsNone(solver.count_solutions(2, max_nodes=3))
+        self.assertEqual(solver.result.status, "budget_exceeded")
+        self.assertEqual(solver.result.reason["budget"], "nodes")
+        self.assertEqual(solver.result.stats["nodes"], 3)
+        self.assertEqual(solver.board, board)
+
+        self.assertIsNone(solver.count_solutions(2, timeout=0))
+        self.assertEqual(solver.result.reason["budget"], "time")
+        self.assertEqual(solver.count_solutions(2), 1)
+
+    def test_pause_and_resume(self):
+        """
+        Test that a search paused after every node gives the same
+        solution and statistics and leaves the matrix reusable
+        """
+        board = self.load_board("data/input.txt")
+        solver = SudokuDLX(copy.deepcopy(board))
+        solver.solve()
+
+        paused = SudokuDLX(copy.deepcopy(board))
+        paused.start()
+        result = None
+        while result is None:
+            result = paused.resume(max_nodes=1)
+
+        self.assertTrue(result.solved)
+        self.assertEqual(paused.board, solver.board)
+        self.assertEqual(paused.stats.nodes, solver.stats.nodes)
+        self.assertEqual(paused.stats.guesses, solver.stats.guesses)
+
+        # abandoning a paused search restores the matrix
+        paused.load_board(copy.deepcopy(board))
+        paused.start()
+        self.assertIsNone(paused.resume(max_nodes=3))
+        paused.abandon()
+        self.assertTrue(paused.solve_sudoku())
+        self.assertEqual(paused.board, solver.board)
+
+    def test_node_budget(self):
+        """
+        Test that a search out of nodes is stopped with the
+        matrix restored and the statistics so far
+        """
+        board = self.load_board("data/input.txt")
+        solver = SudokuDLX(copy.deepcopy(board))
+        result = solver.solve(max_nodes=3)
+
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertEqual(result.stats["nodes"], 3)
+        self.assertEqual(solver.board, board)
+        self.assertTrue(solver.solve_sudoku())
+
+    def test_no_board(self):
+        """
+        Test that the DLX engine raises a
+        ValueError when no board is given
+        """
+        with self.assertRaises(ValueError):
+            SudokuDLX(None).solve_sudoku()
+
+    def test_board_sizes(self):
+        """
+        Test that one instance rebuilds its matrix for each board size
+        and names the cells of other sizes in unsolvable results
+        """
+        solver = SudokuDLX(self.load_board("data/input_4x4.txt"))
+        self.assertTrue(solver.solve_sudoku())
+        self.assertEqual(solver.board[0], [2, 4, 1, 3])
+
+        board = self.load_board("data/input_16x16.txt")
+        solver.load_board(copy.deepcopy(board))
+        self.assertTrue(solver.solve_sudoku())
+        rows = [[str(n) for n in row] for row in solver.board]
+        self.assertEqual(SudokuBoard(rows).board, solver.board)
+        self.assertTrue(all(all(row) for row in solver.board))
+
+        solver.load_board(self.load_board("data/valid_board.txt"))
+        self.assertTrue(solver.solve_sudoku())
+        self.assertEqual(solver.board, self.expected_board)
+
+        board = [[1, 2, 0, 0], [0, 0, 3, 4], [0] * 4, [0] * 4]
+        solver.load_board(board)
+        result = solver.solve()
+        self.assertFalse(result.solved)
+        self.assertEqual(result.reason["kind"], "cell")
+        self.assertEqual(result.reason["row"], 0)
+        self.assertEqual(result.reason["column"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
+import io
+import json
 import unittest
-from src.sudoku_format import SudokuFormat
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_format import SudokuFormat, SudokuWriter
 
 
 class TestSudokuFormat(unittest.TestCase):
@@ -46,6 +50,75 @@ class TestSudokuFormat(unittest.TestCase):
             formatter.format_sudoku_board(), expected_formatted_board
         )
 
+    # solved board shared by the output mode tests
+    solved_board = [
+        [5, 9, 4, 1, 6, 7, 8, 3, 2],
+        [6, 1, 8, 2, 3, 9, 5, 7, 4],
+        [2, 3, 7, 4, 5, 8, 1, 6, 9],
+        [9, 8, 1, 7, 2, 6, 3, 4, 5],
+        [3, 7, 5, 8, 4, 1, 2, 9, 6],
+        [4, 2, 6, 3, 9, 5, 7, 8, 1],
+        [7, 6, 2, 5, 8, 4, 9, 1, 3],
+        [1, 4, 3, 9, 7, 2, 6, 5, 8],
+        [8, 5, 9, 6, 1, 3, 4, 2, 7],
+    ]
+
+    def test_output_modes(self):
+        """
+        Test that the line, JSON and CSV modes hold the same digits
+        """
+        formatter = SudokuFormat(self.solved_board)
+        line = "".join(str(n) for row in self.solved_board for n in row)
+
+        self.assertEqual(formatter.format("line"), line + "\n")
+        self.assertEqual(
+            json.loads(formatter.format("json")), self.solved_board
+        )
+        rows = formatter.format("csv").splitlines()
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(rows[0], "5,9,4,1,6,7,8,3,2")
+        self.assertEqual(
+            formatter.format("grid"), formatter.format_sudoku_board()
+        )
+        with self.assertRaises(ValueError):
+            formatter.format("xml")
+
+    def test_writer_buffers(self):
+        """
+        Test that the writer holds text until its buffer is full
+        or it is flushed
+        """
+        output = io.StringIO()
+        with SudokuWriter(output, buffer_size=100) as writer:
+            writer.write("a" * 60)
+            self.assertEqual(output.getvalue(), "")
+            writer.write("b" * 60)
+            self.assertEqual(output.getvalue(), "a" * 60 + "b" * 60)
+            writer.write("c")
+
+        self.assertEqual(output.getvalue(), "a" * 60 + "b" * 60 + "c")
+
+    def test_board_sizes(self):
+        """
+        Test that grids of other sizes are written as they are read
+        and numbers above 9 are letters in one character formats
+        """
+        for filename in ("data/input_4x4.txt", "data/input_16x16.txt"):
+            with self.subTest(filename=filename):
+                board = SudokuBoard(SudokuReader(filename).board).board
+                with open(filename, "r") as file:
+                    self.assertEqual(
+                        SudokuFormat(board).format_sudoku_board(), file.read()
+                    )
+
+        board = [[n % 25 + 1 for n in range(y, y + 25)] for y in range(25)]
+        formatter = SudokuFormat(board)
+        self.assertEqual(
+            formatter.format("line")[:26], "123456789ABCDEFGHIJKLMNOP2"
+        )
+        self.assertEqual(formatter.format("csv").split(",")[9], "10")
+        self.assertEqual(formatter.format_sudoku_board().count("|"), 100)
+
 
 if __name__ == "__main__":
     unittest.main()
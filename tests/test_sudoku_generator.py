@@ -0,0 +1,115 @@
+import unittest
+from sudoku_generator import DIFFICULTIES, SudokuGenerator
+from sudoku_bitmask import SudokuBitmaskAlgorithm
+from sudoku_board import SudokuBoard
+
+
+class TestSudokuGenerator(unittest.TestCase):
+    """
+    Test cases for the SudokuGenerator class
+
+    The SudokuGenerator class is responsible for building new puzzles
+    with a unique solution and grading them by the solver's effort.
+
+    These tests ensure every generated puzzle is valid, unique and of
+    the difficulty asked for, and that seeds make runs repeatable.
+    """
+
+    def test_full_grid(self):
+        """
+        Test that full grids of every size are valid solved boards
+        """
+        for side in (4, 9, 16):
+            with self.subTest(side=side):
+                grid = SudokuGenerator(side, seed=1).full_grid()
+                SudokuBoard(grid)
+                self.assertTrue(all(n for row in grid for n in row))
+
+    def test_generate_unique(self):
+        """
+        Test that each difficulty gives a puzzle of that grade
+        with a unique solution matching the full grid
+        """
+        generator = SudokuGenerator(seed=2)
+        for difficulty in DIFFICULTIES:
+            with self.subTest(difficulty=difficulty):
+                puzzle = generator.generate(difficulty)
+                self.assertEqual(puzzle["difficulty"], difficulty)
+                self.assertEqual(
+                    SudokuGenerator.grade_effort(
+                        puzzle["guesses"], puzzle["propagation_depth"]
+                    ),
+                    difficulty,
+                )
+
+                board = [row[:] for row in puzzle["board"]]
+                solver = SudokuBitmaskAlgorithm(board)
+                self.assertEqual(solver.count_solutions(2), 1)
+                solver.solve()
+                self.assertEqual(solver.board, puzzle["solution"])
+                self.assertEqual(
+                    puzzle["clues"], 81 - puzzle["puzzle"].count("0")
+                )
+
+    def test_minimal_puzzle(self):
+        """
+        Test that removing any clue of a minimal
+        puzzle gives a second solution
+        """
+        generator = SudokuGenerator(seed=3)
+        board = generator.remove_clues(generator.full_grid())
+        solver = SudokuBitmaskAlgorithm(None)
+        for y in range(9):
+            for x in range(9):
+                if board[y][x]:
+                    removed = [row[:] for row in board]
+                    removed[y][x] = 0
+                    solver.load_board(removed)
+                    self.assertEqual(solver.count_solutions(2), 2)
+
+    def test_grade_effort(self):
+        """
+        Test that the effort of a solve maps to the
+        first difficulty whose limits it is within
+        """
+        self.assertEqual(SudokuGenerator.grade_effort(0, 2), "easy")
+        self.assertEqual(SudokuGenerator.grade_effort(0, 5), "medium")
+        self.assertEqual(SudokuGenerator.grade_effort(0, 9), "hard")
+        self.assertEqual(SudokuGenerator.grade_effort(2, 4), "hard")
+        self.assertEqual(SudokuGenerator.grade_effort(3, 4), "expert")
+
+    def test_seed_and_workers(self):
+        """
+        Test that a seed gives the same puzzles in the
+        same order whatever the number of workers
+        """
+        expected = [
+            puzzle["puzzle"]
+            for puzzle in SudokuGenerator(seed=4).generate_many(20, "easy")
+        ]
+        self.assertEqual(len(expected), 20)
+        self.assertEqual(len(set(expected)), 20)
+
+        puzzles = SudokuGenerator(seed=4).generate_many(20, "easy", workers=2)
+        self.assertEqual([puzzle["puzzle"] for puzzle in puzzles], expected)
+
+    def test_invalid_options(self):
+        """
+        Test that unknown difficulties and sizes are rejected
+        and a difficulty a size cannot reach gives up
+        """
+        with self.assertRaises(ValueError):
+            SudokuGenerator(seed=5).generate("impossible")
+        with self.assertRaises(ValueError):
+            list(SudokuGenerator(seed=5).generate_many(1, workers=0))
+        with self.assertRaises(ValueError):
+            SudokuGenerator(8)
+
+        generator = SudokuGenerator(4, seed=5)
+        self.assertEqual(generator.generate("easy")["difficulty"], "easy")
+        with self.assertRaises(RuntimeError):
+            generator.generate("expert")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+import sys
+import pickle
+import unittest
+import warnings
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_engines import ENGINES
+from sudoku_format import FORMATS, SudokuFormat
+from sudoku_grid import SudokuGrid
+
+
+class TestSudokuGrid(unittest.TestCase):
+    """
+    Test cases for the SudokuGrid class
+
+    The SudokuGrid class is responsible for holding a board as one
+    byte per cell that the reader, validator, solvers and formatter
+    accept in place of a list of lists.
+
+    These tests ensure a line read as a grid gives the same board or
+    error as the list of lists path, that copies and snapshots do not
+    share cells and that every engine fills in a grid it solves.
+    """
+
+    puzzle = (
+        "..3.2.6..9..3.5..1..18.64....81.29..7.......8..67.82....26.95..8"
+        "..2.3..9..5.1.3.."
+    )
+
+    def read(self, line):
+        """
+        Reads and validates a line as rows and as a grid, returning
+        the board or error of each
+        """
+        results = []
+        for parse in (
+            SudokuReader.parse_puzzle_line,
+            SudokuReader.parse_puzzle_grid,
+        ):
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    board = SudokuBoard(parse(line)).board
+                results.append((list(map(list, board)), None))
+            except ValueError as error:
+                results.append((None, str(error)))
+        return results
+
+    def test_same_as_rows(self):
+        """
+        Test that valid and invalid lines of every size give the
+        same board or error message as a grid and as rows
+        """
+        lines = [
+            self.puzzle,
+            "...31...41......",
+            "G" + "0" * 255,
+            "g" + "0" * 255,
+            "H" + "0" * 255,
+            " ".join(["25"] + ["0"] * 624),
+            # invalid characters, before or after a bad size
+            "x" + self.puzzle[1:],
+            "0" * 40 + "٣" + "0" * 40,
+            "0" * 40 + "é" + "0" * 40,
+            "G" + self.puzzle,
+            "0" * 80,
+            "123",
+            # numbers out of range and duplicates
+            "5" + "0" * 15,
+            "11" + "0" * 79,
+            "1" + "0" * 8 + "1" + "0" * 71,
+            "1" + "0" * 9 + "1" + "0" * 70,
+            " ".join(["-1"] + ["0"] * 80),
+            " ".join(["300"] + ["0"] * 80),
+        ]
+        for line in lines:
+            with self.subTest(line=line):
+                rows, grid = self.read(line)
+                self.assertEqual(grid, rows)
+
+    def test_copy_and_snapshot(self):
+        """
+        Test that copies and snapshots keep their cells when the
+        grid is changed through its rows
+        """
+        grid = SudokuReader.parse_puzzle_grid(self.puzzle)
+        copy = grid.copy()
+        snapshot = grid.snapshot()
+
+        grid[0][0] = 4
+        self.assertEqual(grid.cells[0], 4)
+        self.assertEqual(copy[0][0], 0)
+        self.assertNotEqual(grid, copy)
+
+        grid.restore(snapshot)
+        self.assertEqual(grid, copy)
+        self.assertEqual(grid.line(), self.puzzle.replace(".", "0"))
+        with self.assertRaises(ValueError):
+            grid.restore(snapshot[1:])
+
+    def test_list_of_lists(self):
+        """
+        Test that a grid reads like the list of lists it packs
+        """
+        rows = SudokuBoard(SudokuReader.parse_puzzle_line(self.puzzle)).board
+        grid = SudokuGrid.from_rows(rows)
+
+        self.assertEqual(len(grid), 9)
+        self.assertEqual(grid, rows)
+        self.assertEqual([list(row) for row in grid], rows)
+        self.assertEqual(list(grid[-1]), rows[-1])
+        self.assertEqual(grid.clues(), 32)
+        with self.assertRaises(IndexError):
+            grid[9]
+        with self.assertRaises(ValueError):
+            SudokuGrid(b"\0" * 80)
+        with self.assertRaises(ValueError):
+            SudokuGrid.from_rows(rows[:-1])
+
+    def test_compact(self):
+        """
+        Test that a grid takes less memory than a list of lists
+        and survives pickling for the worker processes
+        """
+        grid = SudokuReader.parse_puzzle_grid(self.puzzle)
+        rows = grid.to_rows()
+        self.assertLess(
+            sys.getsizeof(grid) + sys.getsizeof(grid.cells),
+            sys.getsizeof(rows) + sum(map(sys.getsizeof, rows)),
+        )
+        self.assertEqual(pickle.loads(pickle.dumps(grid)), grid)
+
+    def test_engines_fill_in(self):
+        """
+        Test that every engine solves a grid in place and leaves
+        an unsolvable grid as it was given
+        """
+        rows = SudokuReader("data/fast_unsolvable_board.txt").board
+        unsolvable = "".join(cell for row in rows for cell in row)
+        for engine, solver_class in ENGINES.items():
+            with self.subTest(engine=engine):
+                grid = SudokuReader.parse_puzzle_grid(self.puzzle)
+                expected = grid.to_rows()
+                ENGINES["bitmask"](expected).solve()
+
+                solver = solver_class(grid)
+                self.assertEqual(solver.count_solutions(2), 1)
+                self.assertTrue(solver.solve().solved)
+                self.assertEqual(grid, expected)
+                self.assertEqual(solver.board, expected)
+
+                grid = SudokuReader.parse_puzzle_grid(self.puzzle)
+                solver.load_board(grid)
+                self.assertTrue(solver.solve_unique())
+                self.assertEqual(grid, expected)
+
+                grid = SudokuReader.parse_puzzle_grid(unsolvable)
+                given = grid.copy()
+                solver.load_board(grid)
+                self.assertFalse(solver.solve().solved)
+                self.assertEqual(grid, given)
+
+    def test_formats(self):
+        """
+        Test that every output mode formats a grid as its rows
+        """
+        grid = SudokuReader.parse_puzzle_grid(self.puzzle)
+        for mode in FORMATS:
+            with self.subTest(mode=mode):
+                self.assertEqual(
+                    SudokuFormat(grid).format(mode),
+                    SudokuFormat(grid.to_rows()).format(mode),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import time
+import unittest
+from sudoku_jobs import SudokuJobs
+
+
+class TestSudokuJobs(unittest.TestCase):
+    """
+    Test cases for the SudokuJobs class
+
+    The SudokuJobs class is responsible for solving puzzles in a
+    bounded pool of worker threads while requests poll for progress.
+
+    These tests ensure jobs finish with a result, respect their
+    budgets, can be cancelled and that the queue is bounded.
+    """
+
+    puzzle = (
+        ".....7........95.4....5.169.8....3.5.75...29.4.6....8.762.8...."
+        "1.39........6....."
+    )
+
+    # hard puzzle from Arto Inkala that needs many guesses
+    hard_puzzle = (
+        "8..........36......7..9.2...5...7.......457.....1...3...1....68"
+        "..85...1..9....4.."
+    )
+
+    def setUp(self):
+        """
+        Creates a job queue that is shut down after each test
+        """
+        self.jobs = SudokuJobs(workers=1, max_pending=2)
+        self.addCleanup(self.jobs.shutdown)
+
+    def wait(self, job_id):
+        """
+        Polls a job until it finishes
+        """
+        for _ in range(500):
+            job = self.jobs.get(job_id)
+            if job["status"] not in ("queued", "running"):
+                return job
+            time.sleep(0.01)
+        self.fail("Job did not finish")
+
+    def test_job_solved(self):
+        """
+        Test that a submitted job returns at once and is later solved
+        """
+        job, status = self.jobs.submit({"puzzle": self.puzzle})
+
+        self.assertEqual(status, 202)
+        self.assertIn(job["status"], ("queued", "running", "solved"))
+
+        job = self.wait(job["id"])
+        self.assertEqual(job["status"], "solved")
+        self.assertEqual(len(job["solution"]), 81)
+        self.assertGreaterEqual(job["stats"]["nodes"], 1)
+
+    def test_node_budget(self):
+        """
+        Test that a job out of nodes stops with its statistics so far
+        """
+        job, _ = self.jobs.submit({"puzzle": self.hard_puzzle, "max_nodes": 3})
+        job = self.wait(job["id"])
+
+        self.assertEqual(job["status"], "budget_exceeded")
+        self.assertEqual(job["stats"]["nodes"], 3)
+        self.assertNotIn("solution", job)
+
+    def test_cancel_running_job(self):
+        """
+        Test that a running job stops once it is cancelled
+        """
+        job, _ = self.jobs.submit(
+            {"puzzle": self.hard_puzzle, "engine": "backtrack"}
+        )
+        while self.jobs.get(job["id"])["status"] == "queued":
+            time.sleep(0.01)
+
+        self.jobs.cancel(job["id"])
+        job = self.wait(job["id"])
+        self.assertEqual(job["status"], "cancelled")
+        self.assertIsNone(self.jobs.cancel("missing"))
+
+    def test_cancel_queued_job(self):
+        """
+        Test that a job cancelled while queued stays cancelled
+        when its worker picks it up
+        """
+        blocker, _ = self.jobs.submit(
+            {"puzzle": self.hard_puzzle, "engine": "backtrack"}
+        )
+        job, _ = self.jobs.submit({"puzzle": self.puzzle})
+        self.assertEqual(self.jobs.cancel(job["id"])["status"], "cancelled")
+
+        # a worker starting or finishing the job after the cancel
+        # leaves it as it is
+        self.jobs.run(self.jobs.jobs[job["id"]])
+        self.jobs.finish(self.jobs.jobs[job["id"]], "solved")
+        self.jobs.cancel(blocker["id"])
+        job = self.wait(job["id"])
+        self.assertEqual(job["status"], "cancelled")
+        self.assertNotIn("solution", job)
+        self.assertNotIn("elapsed", job)
+
+    def test_invalid_and_full_queue(self):
+        """
+        Test that invalid jobs are refused and the queue is bounded
+        """
+        _, status = self.jobs.submit({"puzzle": "123"})
+        self.assertEqual(status, 400)
+        _, status = self.jobs.submit({"puzzle": self.puzzle, "timeout": -1})
+        self.assertEqual(status, 400)
+
+        options = {"puzzle": self.hard_puzzle, "engine": "backtrack"}
+        first, _ = self.jobs.submit(options)
+        second, _ = self.jobs.submit(options)
+        response, status = self.jobs.submit(options)
+        self.assertEqual(status, 503)
+        self.assertIn("error", response)
+
+        self.jobs.cancel(first["id"])
+        self.jobs.cancel(second["id"])
+        self.assertIsNone(self.jobs.get("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
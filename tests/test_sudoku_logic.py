@@ -0,0 +1,221 @@
+import warnings
+import unittest
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_bitmask import SudokuBitmaskAlgorithm
+from sudoku_logic import SEARCH, TECHNIQUES, SudokuLogicAlgorithm
+
+
+class TestSudokuLogicAlgorithm(unittest.TestCase):
+    """
+    Test cases for the SudokuLogicAlgorithm class
+
+    The SudokuLogicAlgorithm class is responsible for solving the
+    board with the techniques a person would use and rating puzzles
+    by the hardest technique they need.
+
+    These tests ensure each technique removes only the candidates it
+    should, that solving and rating agree with the bitmask engine and
+    that the board is left as it was given when a search is abandoned.
+    """
+
+    def setUp(self):
+        """
+        Creates a solver of an empty board whose layout
+        is used to check the techniques on their own
+        """
+        self.solver = SudokuLogicAlgorithm([[0] * 9 for _ in range(9)])
+        self.cands = [0] * 81
+
+    def load_corpus(self, name):
+        """
+        Reads and validates the boards of a benchmark corpus
+        """
+        boards = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for _, line in SudokuReader.read_puzzles_from_file(
+                f"benchmarks/corpus/{name}.txt"
+            ):
+                rows = SudokuReader.parse_puzzle_line(line)
+                boards.append(SudokuBoard(rows).board)
+        return boards
+
+    def test_locked_candidates(self):
+        """
+        Test that a number confined to a row of a square
+        is removed from the rest of the row
+        """
+        self.cands[0] = self.cands[1] = self.cands[5] = 0b1
+        self.assertEqual(
+            self.solver.find_locked_candidates(self.cands),
+            ("locked_candidates", [0, 1], 0b1, [(5, 0b1)]),
+        )
+
+    def test_naked_pair(self):
+        """
+        Test that the numbers of two cells with the same two
+        candidates are removed from the rest of their unit
+        """
+        self.cands[:3] = [0b11, 0b11, 0b111]
+        self.assertEqual(
+            self.solver.find_naked_subset(self.cands, 2),
+            ("naked_pair", [0, 1], 0b11, [(2, 0b11)]),
+        )
+        self.assertIsNone(self.solver.find_naked_subset(self.cands, 3))
+
+    def test_hidden_pair(self):
+        """
+        Test that two numbers confined to the same two cells
+        remove the other candidates of those cells
+        """
+        self.cands[:3] = [0b1011, 0b1011, 0b1000]
+        self.assertEqual(
+            self.solver.find_hidden_subset(self.cands, 2),
+            ("hidden_pair", [0, 1], 0b11, [(0, 0b1000), (1, 0b1000)]),
+        )
+
+    def test_x_wing(self):
+        """
+        Test that a number in the same two columns of two rows
+        is removed from the rest of those columns
+        """
+        for i in (1, 6, 37, 42, 64):
+            self.cands[i] = 0b1
+        self.assertEqual(
+            self.solver.find_fish(self.cands, 2),
+            ("x_wing", [1, 6, 37, 42], 0b1, [(64, 0b1)]),
+        )
+
+    def test_swordfish(self):
+        """
+        Test that a number in the same three columns of three rows
+        is removed from the rest of those columns
+        """
+        for i in (0, 4, 31, 35, 54, 62, 72):
+            self.cands[i] = 0b1
+        self.assertIsNone(self.solver.find_fish(self.cands, 2))
+        self.assertEqual(
+            self.solver.find_fish(self.cands, 3),
+            ("swordfish", [0, 4, 31, 35, 54, 62], 0b1, [(72, 0b1)]),
+        )
+
+    def test_xy_wing(self):
+        """
+        Test that the number shared by both wings is removed
+        from the cells that see both of them
+        """
+        self.cands[0] = 0b11
+        self.cands[4] = 0b101
+        self.cands[36] = 0b110
+        self.cands[40] = 0b1100
+        self.assertEqual(
+            self.solver.find_xy_wing(self.cands),
+            ("xy_wing", [0, 4, 36], 0b111, [(40, 0b100)]),
+        )
+
+    def test_solves_like_bitmask(self):
+        """
+        Test that every corpus puzzle gets the bitmask solution and
+        that a solve without guesses is rated by its trace
+        """
+        for name in ("easy", "hard", "adversarial", "16x16"):
+            for board in self.load_corpus(name):
+                with self.subTest(name=name):
+                    expected = [row[:] for row in board]
+                    SudokuBitmaskAlgorithm(expected).solve()
+
+                    solver = SudokuLogicAlgorithm(board)
+                    self.assertTrue(solver.solve().solved)
+                    self.assertEqual(solver.board, expected)
+                    if solver.stats.guesses:
+                        self.assertEqual(solver.rating(), SEARCH)
+                    else:
+                        self.assertIn(solver.rating(), TECHNIQUES)
+
+    def test_rate_leaves_board(self):
+        """
+        Test that rating a puzzle does not change the board and
+        agrees with the rating of the full solve
+        """
+        for board in self.load_corpus("hard"):
+            given = [row[:] for row in board]
+            solver = SudokuLogicAlgorithm(board)
+            rating = solver.rate()
+            self.assertEqual(solver.board, given)
+            self.assertEqual(solver.eliminated, [0] * 81)
+
+            solver.solve()
+            self.assertEqual(rating, solver.rating())
+            self.assertEqual(solver.count_solutions(2), 1)
+
+    def test_trace(self):
+        """
+        Test that the trace holds the placements of a puzzle
+        solved by singles and is printed with its rating
+        """
+        reader = SudokuReader("data/valid_board.txt")
+        solver = SudokuLogicAlgorithm(SudokuBoard(reader.board).board)
+        solver.solve()
+
+        placements = [
+            step["placements"][0]
+            for step in solver.trace
+            if step["placements"]
+        ]
+        self.assertEqual(len(placements), solver.stats.forced_moves)
+        for x, y, n in placements:
+            self.assertEqual(solver.board[y][x], n)
+
+        trace = solver.format_trace()
+        self.assertTrue(trace.startswith("1. "))
+        self.assertTrue(trace.endswith(f"rating: {solver.rating()}\n"))
+
+    def test_next_steps(self):
+        """
+        Test that the next steps are the removals the solve made
+        before its first placement after them, and that finding
+        them leaves the board and trace unchanged
+        """
+        for board in self.load_corpus("hard"):
+            given = [row[:] for row in board]
+            solver = SudokuLogicAlgorithm(board)
+            solver.solve()
+            trace = solver.trace
+
+            solver.load_board([row[:] for row in given])
+            steps = solver.next_steps()
+            if not trace:
+                self.assertEqual(steps, [])
+            elif trace[0]["placements"]:
+                self.assertEqual(steps, trace[:1])
+            elif steps:
+                self.assertEqual(steps[:-1], trace[: len(steps) - 1])
+                self.assertTrue(steps[-1]["placements"])
+            self.assertEqual(solver.board, given)
+            self.assertEqual(solver.eliminated, [0] * 81)
+            self.assertIs(solver.trace, trace)
+
+        # a board with nothing left to place has no step
+        solver.load_board([row[:] for row in self.load_corpus("easy")[0]])
+        solver.solve()
+        self.assertEqual(solver.next_steps(), [])
+        self.assertTrue(solver.trace)
+
+    def test_unsolvable(self):
+        """
+        Test that an unsolvable board is not rated and is left
+        as it was given
+        """
+        reader = SudokuReader("data/fast_unsolvable_board.txt")
+        board = SudokuBoard(reader.board).board
+        given = [row[:] for row in board]
+
+        solver = SudokuLogicAlgorithm(board)
+        self.assertIsNone(solver.rate())
+        self.assertFalse(solver.solve().solved)
+        self.assertEqual(solver.board, given)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,12 @@
+import io
+import os
+import bz2
+import gzip
+import lzma
+import tempfile
 import unittest
-from src.sudoku_reader import SudokuReader
+from unittest import mock
+from sudoku_reader import SudokuReader
 
 
 class TestSudokuReader(unittest.TestCase):
@@ -37,6 +44,149 @@ class TestSudokuReader(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             SudokuReader("data/not_a_text_file.pdf")
 
+    def test_parse_puzzle_line(self):
+        """
+        Test that a one line puzzle is split into
+        rows with "." converted to blank squares
+        """
+        board = SudokuReader.parse_puzzle_line("12." + "0" * 78 + "\n")
+
+        self.assertEqual(len(board), 9)
+        self.assertEqual(board[0], ["1", "2", "0"] + ["0"] * 6)
+
+    def test_parse_board_text(self):
+        """
+        Test that grid text is parsed like the file it came from
+        """
+        with open("data/input.txt", "r") as file:
+            text = file.read()
+
+        self.assertEqual(
+            SudokuReader.parse_board_text(text),
+            SudokuReader("data/input.txt").board,
+        )
+        with self.assertRaises(ValueError):
+            SudokuReader.parse_board_text("")
+
+        # separated cells are read when every row is split into its side
+        text = "\n".join(
+            " ".join(row) for row in SudokuReader.parse_board_text(text)
+        )
+        self.assertEqual(
+            SudokuReader.parse_board_text(text),
+            SudokuReader("data/input.txt").board,
+        )
+
+        # a 9 x 9 board with stray spaces or commas is read a character
+        # per cell, so its first invalid character is reported
+        board = SudokuReader("data/invalid_board.txt").board
+        self.assertEqual(board[0][:3], ["H", "i", ","])
+
+    def test_read_puzzles_from_file(self):
+        """
+        Test that comments are skipped and each puzzle
+        line is yielded with its line number
+        """
+        puzzles = list(
+            SudokuReader.read_puzzles_from_file("data/batch_puzzles.txt")
+        )
+
+        self.assertEqual(len(puzzles), 7)
+        self.assertEqual(puzzles[0][0], 2)
+
+    def test_parse_puzzle_lines_formats(self):
+        """
+        Test that grid and one line puzzles are read from the same
+        lines and a grid cut short is still yielded
+        """
+        with open("data/input.txt", "r") as file:
+            grid = file.read().splitlines()
+        line = "".join(
+            "".join(row) for row in SudokuReader("data/input.txt").board
+        )
+
+        lines = ["# mixed formats", *grid, "", line, *grid[:3], "", *grid]
+        puzzles = list(SudokuReader.parse_puzzle_lines(lines))
+
+        self.assertEqual(
+            puzzles,
+            [(2, line), (14, line), (15, line[:27]), (19, line)],
+        )
+
+    def test_read_compressed_files(self):
+        """
+        Test that gzip, bz2 and xz files are decompressed
+        whatever their name
+        """
+        with open("data/batch_puzzles.txt", "rb") as file:
+            data = file.read()
+        expected = list(
+            SudokuReader.read_puzzles_from_file("data/batch_puzzles.txt")
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            for module in (gzip, bz2, lzma):
+                with self.subTest(module=module.__name__):
+                    filename = os.path.join(directory, module.__name__)
+                    with open(filename, "wb") as file:
+                        file.write(module.compress(data))
+
+                    puzzles = SudokuReader.read_puzzles_from_file(filename)
+                    self.assertEqual(list(puzzles), expected)
+
+    def test_read_stdin(self):
+        """
+        Test that "-" reads compressed puzzles from standard input
+        """
+        puzzle = "0" * 81 + "\n"
+        stdin = io.TextIOWrapper(io.BytesIO(gzip.compress(puzzle.encode())))
+        with mock.patch("sys.stdin", stdin):
+            puzzles = list(SudokuReader.read_puzzles_from_file("-"))
+
+        self.assertEqual(puzzles, [(1, "0" * 81)])
+        self.assertFalse(stdin.closed)
+
+    def test_read_puzzle_chunks(self):
+        """
+        Test that puzzles are read in chunks of the given size
+        """
+        chunks = list(
+            SudokuReader.read_puzzle_chunks("data/batch_puzzles.txt", 3)
+        )
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        with self.assertRaises(ValueError):
+            next(SudokuReader.read_puzzle_chunks("data/batch_puzzles.txt", 0))
+
+    def test_board_sizes(self):
+        """
+        Test that puzzles of every size are split into rows of their
+        side, with cells of more than one character separated
+        """
+        board = SudokuReader.parse_puzzle_line("12.4" + "0" * 12)
+        self.assertEqual(board, [["1", "2", "0", "4"]] + [["0"] * 4] * 3)
+
+        board = SudokuReader.parse_puzzle_line(" ".join(["16"] + ["."] * 255))
+        self.assertEqual(len(board), 16)
+        self.assertEqual(board[0][:2], ["16", "0"])
+
+        grid = SudokuReader("data/input_16x16.txt").board
+        self.assertEqual([len(row) for row in grid], [16] * 16)
+        self.assertEqual(grid[0][:4], ["0", "0", "5", "E"])
+
+        with open("data/input_4x4.txt", "r") as file:
+            small = file.read().splitlines()
+        with open("data/input_16x16.txt", "r") as file:
+            large = file.read().splitlines()
+        line = "".join("".join(row) for row in grid)
+        puzzles = list(
+            SudokuReader.parse_puzzle_lines([*small, *large, "", line])
+        )
+
+        self.assertEqual(
+            puzzles, [(1, "0003100041000000"), (6, line), (26, line)]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from sudoku_result import SudokuResult
+
+
+class TestSudokuResult(unittest.TestCase):
+    """
+    Test cases for the SudokuResult class
+
+    The SudokuResult class is responsible for describing the
+    outcome of a solve and why a board is unsolvable.
+    """
+
+    def test_solved_result(self):
+        """
+        Test that a solved result has no reason
+        """
+        result = SudokuResult(SudokuResult.SOLVED)
+
+        self.assertTrue(result.solved)
+        self.assertEqual(result.to_dict(), {"status": "solved"})
+
+    def test_empty_cell_result(self):
+        """
+        Test that an empty cell result names the row and column
+        """
+        result = SudokuResult.empty_cell(5, 3)
+
+        self.assertFalse(result.solved)
+        self.assertEqual(result.reason["kind"], "cell")
+        self.assertEqual(
+            (result.reason["row"], result.reason["column"]), (3, 5)
+        )
+        self.assertEqual(
+            result.message,
+            "Unsolvable sudoku: no candidates left for row 3, column 5",
+        )
+
+    def test_missing_digit_result(self):
+        """
+        Test that a missing digit result names the unit and digit
+        """
+        result = SudokuResult.missing_digit("square", 4, 7)
+
+        self.assertEqual(
+            result.to_dict()["reason"],
+            {
+                "kind": "square",
+                "index": 4,
+                "digit": 7,
+                "message": "digit 7 has no possible cell in square 4",
+            },
+        )
+
+    def test_budget_exceeded_result(self):
+        """
+        Test that a budget exceeded result names the budget
+        and keeps the statistics so far
+        """
+        stats = {"nodes": 10}
+        result = SudokuResult.budget_exceeded("nodes", 10, stats)
+
+        self.assertFalse(result.solved)
+        self.assertEqual(result.status, "budget_exceeded")
+        self.assertEqual(result.reason["budget"], "nodes")
+        self.assertEqual(result.to_dict()["stats"], stats)
+        self.assertEqual(
+            result.message,
+            "Search budget exceeded: search stopped after 10 nodes",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import time
+import unittest
+from sudoku_sessions import SudokuSession, SudokuSessions
+
+
+class TestSudokuSessions(unittest.TestCase):
+    """
+    Test cases for the SudokuSessions class
+
+    The SudokuSessions class is responsible for the interactive games
+    of the web application, applying single cell moves to a candidate
+    state kept per session.
+
+    These tests ensure moves update only the units of their cell,
+    conflicts come and go with the moves that cause them and idle
+    sessions expire so their number stays bounded.
+    """
+
+    puzzle = (
+        ".....7........95.4....5.169.8....3.5.75...29.4.6....8.762.8...."
+        "1.39........6....."
+    )
+
+    def setUp(self):
+        """
+        Creates an empty set of sessions and opens a game
+        """
+        self.sessions = SudokuSessions()
+        session, status = self.sessions.create({"puzzle": self.puzzle})
+        self.assertEqual(status, 201)
+        self.session = session
+
+    def move(self, x, y, value):
+        """
+        Applies a move to the open game
+        """
+        return self.sessions.move(
+            self.session["id"], {"x": x, "y": y, "value": value}
+        )
+
+    def test_create(self):
+        """
+        Test that a new session holds the puzzle and the
+        candidates of every cell
+        """
+        self.assertEqual(self.session["board"], self.puzzle.replace(".", "0"))
+        self.assertEqual(self.session["empty"], self.puzzle.count("."))
+        self.assertEqual(self.session["conflicts"], [])
+        self.assertEqual(self.session["candidates"][0][5], [])
+        self.assertEqual(self.session["candidates"][0][6], [8])
+
+        response, status = self.sessions.create({"puzzle": "123"})
+        self.assertEqual(status, 400)
+        self.assertEqual(response["status"], "invalid")
+
+    def test_move_updates_units(self):
+        """
+        Test that a move reports the candidates of the empty
+        cells of its row, column and square and no others
+        """
+        response, status = self.move(6, 0, 8)
+        self.assertEqual(status, 200)
+        self.assertEqual(response["moves"], 1)
+        self.assertEqual(response["empty"], self.session["empty"] - 1)
+
+        cells = {(c["x"], c["y"]) for c in response["candidates"]}
+        for x, y in cells:
+            self.assertTrue(y == 0 or x == 6 or (x > 5 and y < 3))
+        self.assertNotIn((6, 0), cells)
+        for cell in response["candidates"]:
+            self.assertNotIn(8, cell["candidates"])
+
+        # the new state matches a session built from the same board
+        state = self.sessions.get(self.session["id"])
+        board = state["board"]
+        fresh = SudokuSession(
+            [[int(n) for n in board[i : i + 9]] for i in range(0, 81, 9)]
+        )
+        self.assertEqual(state["candidates"], fresh.to_dict()["candidates"])
+
+    def test_conflicts(self):
+        """
+        Test that a repeated number marks every cell holding it in
+        the unit and that clearing the cell removes the conflict
+        """
+        response, _ = self.move(0, 0, 7)
+        self.assertEqual(
+            response["conflicts"],
+            [{"x": 0, "y": 0}, {"x": 5, "y": 0}, {"x": 0, "y": 6}],
+        )
+        self.assertFalse(response["solved"])
+
+        response, _ = self.move(0, 0, 0)
+        self.assertEqual(response["conflicts"], [])
+        self.assertEqual(response["empty"], self.session["empty"])
+
+    def test_invalid_moves(self):
+        """
+        Test that givens, cells off the board and numbers out
+        of range are rejected without changing the game
+        """
+        for x, y, value in ((5, 0, 1), (9, 0, 1), (0, 0, 10), (0, 0, "1")):
+            with self.subTest(x=x, y=y, value=value):
+                response, status = self.move(x, y, value)
+                self.assertEqual(status, 400)
+                self.assertIn("error", response)
+
+        response, status = self.sessions.move(self.session["id"], [0, 0, 1])
+        self.assertEqual(status, 400)
+        self.assertEqual(self.sessions.get(self.session["id"])["moves"], 0)
+        self.assertIsNone(self.sessions.move("missing", {}))
+
+    def test_hint_and_solve(self):
+        """
+        Test that following the hints solves the puzzle
+        """
+        for _ in range(self.session["empty"]):
+            hint = self.sessions.hint(self.session["id"])["hint"]
+            x, y, n = hint["placements"][0]
+            response, _ = self.move(x, y, n)
+        self.assertTrue(response["solved"])
+        self.assertIsNone(self.sessions.hint(self.session["id"])["hint"])
+
+        # no hint is given while the board has a conflict
+        self.sessions.close(self.session["id"])
+        self.setUp()
+        self.move(0, 0, 7)
+        hint = self.sessions.hint(self.session["id"])
+        self.assertIsNone(hint["hint"])
+
+    def test_hint_from_session_state(self):
+        """
+        Test that a hint starts from the candidates kept by the moves,
+        including a conflict that was undone, and leaves them unchanged
+        """
+        session = self.sessions.sessions[self.session["id"]]
+        logic = session.logic
+        self.move(6, 0, 8)
+        self.move(0, 0, 7)
+        self.move(1, 0, 7)
+        self.move(0, 0, 0)
+        self.move(1, 0, 0)
+
+        board = [row[:] for row in session.board]
+        masks = [masks[:] for masks in session.masks]
+        hint = self.sessions.hint(self.session["id"])
+        fresh = SudokuSession(board).hint()
+
+        self.assertEqual(hint, fresh)
+        self.assertIs(session.logic, logic)
+        self.assertEqual(session.board, board)
+        self.assertEqual([masks[:] for masks in session.masks], masks)
+        self.assertEqual(logic.eliminated, [0] * 81)
+
+    def test_idle_expiry(self):
+        """
+        Test that idle sessions expire, used ones are kept
+        and new sessions are refused once the limit is reached
+        """
+        sessions = SudokuSessions(idle_timeout=0.2, max_sessions=2)
+        first, _ = sessions.create(self.puzzle)
+        second, _ = sessions.create(self.puzzle)
+        _, status = sessions.create(self.puzzle)
+        self.assertEqual(status, 503)
+
+        time.sleep(0.12)
+        self.assertIsNotNone(sessions.get(first["id"]))
+        time.sleep(0.12)
+        self.assertIsNone(sessions.get(second["id"]))
+        self.assertEqual(len(sessions), 1)
+
+        _, status = sessions.create(self.puzzle)
+        self.assertEqual(status, 201)
+        self.assertTrue(sessions.close(first["id"]))
+        self.assertFalse(sessions.close(first["id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
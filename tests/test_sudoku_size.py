@@ -0,0 +1,82 @@
+import unittest
+from sudoku_size import SIZES, SudokuSize
+
+
+class TestSudokuSize(unittest.TestCase):
+    """
+    Test cases for the SudokuSize class
+
+    The SudokuSize class is responsible for the geometry of every
+    supported board side and the text of cells wider than a digit.
+
+    These tests ensure the tables of each size cover the board and
+    cells are split and joined the same way for every size.
+    """
+
+    def test_geometry(self):
+        """
+        Test that every cell belongs to one row, column and
+        square of each size and masks hold one bit per number
+        """
+        for side in SIZES:
+            with self.subTest(side=side):
+                size = SudokuSize.of(side)
+                self.assertEqual(size.box * size.box, side)
+                self.assertEqual(len(size.cells), side * side)
+                self.assertEqual(len(size.units), 3 * side)
+                for _, _, cells in size.units:
+                    self.assertEqual(len(cells), side)
+                self.assertEqual(size.popcount[size.full_mask], side)
+                self.assertEqual(size.popcount[0b1011], 3)
+
+        x, y, square = SudokuSize.of(16).cells[16 * 5 + 9]
+        self.assertEqual((x, y, square), (9, 5, 6))
+
+    def test_shared_sizes(self):
+        """
+        Test that the tables of a side are built once
+        and unsupported sides are rejected
+        """
+        self.assertIs(SudokuSize.of(16), SudokuSize.of(16))
+        self.assertIs(SudokuSize.of_board([[0] * 4] * 4), SudokuSize.of(4))
+        for side in (0, 1, 8, 10, 36):
+            with self.assertRaises(ValueError):
+                SudokuSize.of(side)
+
+    def test_side_of(self):
+        """
+        Test that a puzzle of the wrong length is read as 9 x 9
+        """
+        self.assertEqual(
+            [SudokuSize.side_of(count) for count in (16, 81, 256, 625)],
+            [4, 9, 16, 25],
+        )
+        for count in (0, 1, 3, 80, 82, 100):
+            self.assertEqual(SudokuSize.side_of(count), 9)
+
+    def test_split_and_join_cells(self):
+        """
+        Test that cells are single characters unless
+        spaces or commas separate them
+        """
+        self.assertEqual(SudokuSize.split_cells("1A0G"), ["1", "A", "0", "G"])
+        self.assertEqual(
+            SudokuSize.split_cells("10 0,3 ,  16"), ["10", "0", "3", "16"]
+        )
+        self.assertEqual(SudokuSize.join_cells(["1", "A", "0"]), "1A0")
+        self.assertEqual(SudokuSize.join_cells(["10", "0", "3"]), "10 0 3")
+
+    def test_symbol_value(self):
+        """
+        Test that letters are numbers only on boards wider than 9
+        """
+        self.assertEqual(SudokuSize.symbol_value("A", 16), 10)
+        self.assertEqual(SudokuSize.symbol_value("g", 16), 16)
+        self.assertEqual(SudokuSize.symbol_value("P", 25), 25)
+        self.assertIsNone(SudokuSize.symbol_value("A", 9))
+        self.assertIsNone(SudokuSize.symbol_value("Q", 25))
+        self.assertIsNone(SudokuSize.symbol_value("AB", 25))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from sudoku_reader import SudokuReader
+from sudoku_board import SudokuBoard
+from sudoku_engines import ENGINES
+from sudoku_stats import SudokuStats
+
+
+class TestSudokuStats(unittest.TestCase):
+    """
+    Test cases for the SudokuStats class
+
+    The SudokuStats class is responsible for the search counters
+    and phase timings reported after each solve.
+
+    These tests ensure every engine fills in its statistics and
+    that phases are only timed when profiling is requested.
+    """
+
+    def load_board(self):
+        """
+        Reads and validates the valid board from the data directory
+        """
+        reader = SudokuReader("data/valid_board.txt")
+        return SudokuBoard(reader.board).board
+
+    def test_counters_collected(self):
+        """
+        Test that every engine counts nodes and guesses
+        """
+        for engine, solver_class in ENGINES.items():
+            with self.subTest(engine=engine):
+                solver = solver_class(self.load_board())
+                solver.solve_sudoku()
+                stats = solver.stats
+
+                self.assertGreaterEqual(stats.nodes, 1)
+                self.assertEqual(stats.nodes, stats.guesses + 1)
+                self.assertGreater(stats.solve_time, 0)
+                self.assertEqual(stats.phase_times, {})
+
+    def test_profile_times_phases(self):
+        """
+        Test that a profiled solver records the time
+        spent in each of its phases
+        """
+        for engine, solver_class in ENGINES.items():
+            with self.subTest(engine=engine):
+                solver = solver_class(self.load_board(), profile=True)
+                solver.solve_sudoku()
+
+                self.assertEqual(
+                    set(solver.stats.phase_times), set(solver_class.PHASES)
+                )
+
+    def test_unprofiled_solver_not_wrapped(self):
+        """
+        Test that phases are plain methods when profiling is off
+        """
+        for engine, solver_class in ENGINES.items():
+            with self.subTest(engine=engine):
+                solver = solver_class(self.load_board())
+                for phase in solver_class.PHASES:
+                    self.assertNotIn(phase, vars(solver))
+
+    def test_to_dict(self):
+        """
+        Test that the dictionary holds every counter
+        """
+        stats = SudokuStats()
+        stats.nodes = 3
+
+        result = stats.to_dict()
+        self.assertEqual(result["nodes"], 3)
+        timers = {"solve_time", "phase_times"}
+        self.assertEqual(set(result), set(SudokuStats.COUNTERS) | timers)
+        self.assertIn("nodes: 3\n", stats.format_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
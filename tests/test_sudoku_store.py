@@ -0,0 +1,138 @@
+import os
+import tempfile
+import unittest
+from multiprocessing import Pool
+from sudoku_store import SudokuStore
+from sudoku_cache import SudokuCache
+from sudoku_batch import SudokuBatch
+
+
+def _store_solution(args):
+    """
+    Writes and reads back a solution from a separate process
+    """
+    directory, puzzle = args
+    store = SudokuStore(directory)
+    store.put(puzzle, puzzle[::-1])
+    return store.get(puzzle)
+
+
+class TestSudokuStore(unittest.TestCase):
+    """
+    Test cases for the SudokuStore class
+
+    The SudokuStore class is responsible for keeping solved puzzles
+    in an SQLite database shared between processes and runs.
+
+    These tests ensure solutions persist, are shared between
+    processes and can be loaded from the output of a batch run.
+    """
+
+    puzzle = (
+        "000007000000009504000050169080000305075000290406000080762080000"
+        "103900000000600000"
+    )
+
+    def setUp(self):
+        """
+        Creates a temporary store directory for each test
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_put_and_get(self):
+        """
+        Test that a stored solution is found by a new store
+        and the first solution of a puzzle is kept
+        """
+        store = SudokuStore(self.directory.name)
+        self.assertIsNone(store.get("1" * 81))
+
+        store.put("1" * 81, "2" * 81)
+        store.put("1" * 81, "3" * 81)
+
+        reopened = SudokuStore(self.directory.name)
+        self.assertEqual(reopened.get("1" * 81), "2" * 81)
+        self.assertEqual(len(reopened), 1)
+
+    def test_shared_between_processes(self):
+        """
+        Test that solutions written by worker processes are
+        visible to every other connection
+        """
+        puzzles = [str(n) * 81 for n in range(1, 9)]
+        with Pool(4) as pool:
+            results = pool.map(
+                _store_solution,
+                [(self.directory.name, puzzle) for puzzle in puzzles],
+            )
+
+        self.assertEqual(results, [puzzle[::-1] for puzzle in puzzles])
+        self.assertEqual(len(SudokuStore(self.directory.name)), 8)
+
+    def test_cache_backed_by_store(self):
+        """
+        Test that a new cache finds the solutions of an earlier run
+        """
+        batch = SudokuBatch(cache_dir=self.directory.name)
+        first = batch.solve_puzzle(self.puzzle)
+
+        batch = SudokuBatch(cache_dir=self.directory.name)
+        second = batch.solve_puzzle(self.puzzle)
+
+        self.assertFalse(first["cached"])
+        self.assertTrue(second["cached"])
+        self.assertEqual(first["solution"], second["solution"])
+        self.assertEqual(batch.cache.store_hits, 1)
+
+    def test_warm_start(self):
+        """
+        Test that solved lines of a batch output are loaded
+        """
+        result = SudokuBatch().solve_puzzle(self.puzzle)
+        filename = os.path.join(self.directory.name, "results.txt")
+        with open(filename, "w") as file:
+            file.write(SudokuBatch.format_result(result))
+            file.write("0" * 81 + "\tinvalid\tBoard is empty\n")
+
+        store = SudokuStore(self.directory.name)
+        cache = SudokuCache(store=store)
+        self.assertEqual(cache.warm_start(filename), 1)
+        self.assertEqual(len(store), 1)
+
+        board = [
+            [int(n) for n in self.puzzle[i : i + 9]] for i in range(0, 81, 9)
+        ]
+        solution = SudokuCache(store=store).get(board)
+        self.assertEqual(
+            "".join(str(n) for row in solution for n in row),
+            result["solution"],
+        )
+
+    def test_warm_start_skips_bad_lines(self):
+        """
+        Test that solved lines that do not parse or whose solution
+        is not valid for the puzzle are skipped
+        """
+        result = SudokuBatch().solve_puzzle(self.puzzle)
+        solution = result["solution"]
+        # the digits 1 and 2 swapped give a valid board without the clues
+        relabeled = solution.translate(str.maketrans("12", "21"))
+        repeated = solution[1] + solution[1:]
+        filename = os.path.join(self.directory.name, "results.txt")
+        with open(filename, "w") as file:
+            for line in ("x" * 81, relabeled, repeated, solution):
+                file.write(f"{self.puzzle}\tsolved\t{line}\n")
+            file.write(f"{'x' * 81}\tsolved\t{solution}\n")
+
+        cache = SudokuCache()
+        self.assertEqual(cache.warm_start(filename), 1)
+        self.assertEqual(cache.to_dict()["entries"], 1)
+
+        store = SudokuStore(self.directory.name)
+        self.assertEqual(SudokuCache(store=store).warm_start(filename), 1)
+        self.assertEqual(len(store), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()